@@ -6,24 +6,24 @@ Génère un tableau de bord HTML interactif à partir des métriques collectées
 
 import json
 import os
-import glob
 from datetime import datetime
 from pathlib import Path
 import sys
 
+# Index incrémental partagé avec compare_environments.py
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+from result_index import load_indexed
+
 def load_metrics_files(results_dir):
-    """Charge tous les fichiers de métriques JSON"""
-    metrics_files = glob.glob(os.path.join(results_dir, "*_metrics_*.json"))
+    """Charge tous les fichiers de métriques JSON (seuls les nouveaux fichiers sont relus)"""
+    entries, failed = load_indexed(results_dir, "*_metrics_*.json")
+    if failed:
+        print(f"Erreur: {failed} fichier(s) de métriques illisible(s)")
     
     all_metrics = []
-    for filepath in metrics_files:
-        try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-                data['_filepath'] = filepath
-                all_metrics.append(data)
-        except Exception as e:
-            print(f"Erreur lors de la lecture de {filepath}: {e}")
+    for filepath, data in entries:
+        data['_filepath'] = filepath
+        all_metrics.append(data)
     
     return all_metrics
 
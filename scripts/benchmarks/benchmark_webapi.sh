@@ -233,6 +233,29 @@ EOF
     log_success "Report generated: $report_file"
 }
 
+# =============================================================================
+# 5b. NATIVE PYTHON LOAD GENERATOR
+# =============================================================================
+run_native_benchmarks() {
+    local mode=${1:-closed}
+    log_step "Running native load generator (${mode}-loop)..."
+
+    local platforms=""
+    for platform in "${!PLATFORMS[@]}"; do
+        platforms+="${platform}=${PLATFORMS[$platform]} "
+    done
+
+    DURATION=$DURATION \
+    CONCURRENT_USERS=$CONCURRENT_USERS \
+    REQUESTS_PER_SECOND=$REQUESTS_PER_SECOND \
+    ENDPOINTS="${ENDPOINTS[*]}" \
+    PLATFORMS="$platforms" \
+    RESULTS_DIR="$RESULTS_DIR" \
+        python3 "$SCRIPT_DIR/loadgen.py" --mode "$mode"
+
+    log_success "Native benchmarks completed"
+}
+
 # =============================================================================
 # 6. SIMPLE QUICK TEST
 # =============================================================================
@@ -297,15 +320,23 @@ main() {
             collect_metrics
             generate_report
             ;;
+
+        native)
+            run_native_benchmarks "${2:-closed}"
+            collect_metrics
+            generate_report
+            log_success "Results saved to: $RESULTS_DIR"
+            ;;
         
         *)
-            echo "Usage: $0 {install|quick|full|stress}"
+            echo "Usage: $0 {install|quick|full|stress|native [closed|open]}"
             echo ""
             echo "Commands:"
             echo "  install - Install testing dependencies"
             echo "  quick   - Quick 10-second test per platform"
             echo "  full    - Full benchmark suite (60s per endpoint)"
             echo "  stress  - High-load stress test (30s)"
+            echo "  native  - Python asyncio load generator (closed: CONCURRENT_USERS, open: REQUESTS_PER_SECOND)"
             exit 1
             ;;
     esac
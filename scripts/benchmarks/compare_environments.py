@@ -3,17 +3,21 @@
 Script for comparing performance results between different virtualization environments.
 
 This script loads test results, compares them across environments, and generates
-both console output and an HTML report with performance metrics.
+both console output and an HTML report with performance metrics. Repeated runs
+are kept: each environment is summarized with bootstrap confidence intervals,
+and a winner is only declared when a Mann-Whitney U test finds the difference
+significant.
 """
 
-import json
 import logging
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 
+from comparison_stats import bootstrap_ci, mann_whitney_u, min_p_value
+from result_index import load_indexed
 
 # Configure logging
 logging.basicConfig(
@@ -22,16 +26,67 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Significance level for declaring a winner
+ALPHA = 0.05
 
-def load_test_results(directory: str) -> Dict[str, Dict[str, Any]]:
+# Compared metrics: (dotted path in the result, label, higher is better).
+# The first one present in the runs of a test decides the winner.
+METRICS: Tuple[Tuple[str, str, bool], ...] = (
+    ("requests_per_second", "Throughput (req/s)", True),
+    ("latency.p99_ms", "p99 (ms)", False),
+    ("duration_seconds", "Duration (s)", False),
+)
+
+# Latency columns shown per environment (means over the runs)
+LATENCY_KEYS = ('p50_ms', 'p99_ms', 'p99_9_ms', 'max_ms')
+
+
+def load_shape(data: Dict[str, Any]) -> str:
+    """
+    Load parameters of a run, e.g. "closed-u50" or "open-u50-r200".
+    
+    Runs are only pooled as repetitions when their load shape matches: a
+    closed-loop run is not a repetition of an open-loop one. Results without
+    a mode (not written by loadgen.py) have an empty shape.
+    """
+    mode = data.get('mode')
+    if mode is None:
+        return ""
+    parts = [str(mode)]
+    if data.get('concurrent_users') is not None:
+        parts.append(f"u{data['concurrent_users']}")
+    if data.get('target_requests_per_second') is not None:
+        parts.append(f"r{float(data['target_requests_per_second']):g}")
+    return "-".join(parts)
+
+
+def qualified_test(data: Dict[str, Any]) -> str:
+    """Test type qualified by its load shape, e.g. "api_light@open-u50-r200"."""
+    test_type = str(data.get('test', 'unknown'))
+    shape = load_shape(data)
+    return f"{test_type}@{shape}" if shape else test_type
+
+
+def load_test_results(
+    directory: str,
+    index_path: Optional[str] = None,
+    details: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
     """
     Load all test result files from the specified directory.
     
+    Files are read through an incremental index (see result_index.py), so
+    only new or modified files are parsed. Repeated runs of the same test on
+    the same environment are all kept.
+    
     Args:
         directory: Path to directory containing test result JSON files
+        index_path: Index file (default: .results_index.sqlite in directory)
+        details: Include bulky per-sample fields such as latency_histogram_us
         
     Returns:
-        Dictionary mapping test keys (environment_testtype) to result data
+        Dictionary mapping test keys (environment_testtype, plus the load
+        shape when known, see qualified_test) to the list of runs, oldest first
         
     Raises:
         ValueError: If directory does not exist
@@ -44,92 +99,204 @@ def load_test_results(directory: str) -> Dict[str, Dict[str, Any]]:
     if not dir_path.is_dir():
         raise ValueError(f"Path is not a directory: {directory}")
     
-    results = {}
+    results: Dict[str, List[Dict[str, Any]]] = {}
     files_processed = 0
-    files_failed = 0
+    entries, files_failed = load_indexed(str(dir_path), "test_*.json", index_path, details)
     
-    for file_path in dir_path.glob("test_*.json"):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            env = data.get('environment', 'unknown')
-            test_type = data.get('test', 'unknown')
-            key = f"{env}_{test_type}"
-            
-            results[key] = data
-            files_processed += 1
-            
-        except json.JSONDecodeError as e:
-            logger.warning(f"Invalid JSON in {file_path}: {e}")
-            files_failed += 1
-        except IOError as e:
-            logger.warning(f"Error reading {file_path}: {e}")
-            files_failed += 1
-        except Exception as e:
-            logger.error(f"Unexpected error processing {file_path}: {e}")
+    for file_path, data in entries:
+        if not isinstance(data, dict):
+            logger.warning(f"Unexpected content in {file_path}: not a JSON object")
             files_failed += 1
+            continue
+        
+        env = data.get('environment', 'unknown')
+        key = f"{env}_{qualified_test(data)}"
+        
+        results.setdefault(key, []).append(data)
+        files_processed += 1
+    
+    for runs in results.values():
+        runs.sort(key=lambda run: str(run.get('timestamp', '')))
     
     logger.info(f"Processed {files_processed} files successfully, {files_failed} failed")
     return results
 
 
-def compare_results(results: Dict[str, Dict[str, Any]]) -> None:
+def metric_value(data: Dict[str, Any], path: str) -> Optional[float]:
+    """Numeric value at a dotted path such as "latency.p99_ms", or None."""
+    value: Any = data
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def group_by_test(
+    results: Dict[str, List[Dict[str, Any]]]
+) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """Regroup runs as test name (type and load shape) -> environment -> runs."""
+    tests: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for runs in results.values():
+        for data in runs:
+            env = data.get('environment', 'unknown')
+            tests.setdefault(qualified_test(data), {}).setdefault(env, []).append(data)
+    return tests
+
+
+def summarize_test(
+    envs: Dict[str, List[Dict[str, Any]]],
+    alpha: float = ALPHA
+) -> Dict[str, Any]:
+    """
+    Aggregate the runs of one test type and decide whether there is a winner.
+    
+    Only completed runs feed the statistics. Each metric gets a bootstrap
+    confidence interval of its mean per environment. The best environment
+    on the primary metric wins only if a Mann-Whitney U test against every
+    other environment gives p < alpha. When the run counts cannot reach
+    p < alpha at all, the verdict says so instead of "no significant winner".
+    
+    Args:
+        envs: Runs per environment for one test type
+        alpha: Significance level
+        
+    Returns:
+        Dictionary with primary metric, per-environment summaries, winner
+        (None when not significant) and a human-readable verdict
+    """
+    completed = {
+        env: [run for run in runs if run.get('status') == 'completed']
+        for env, runs in envs.items()
+    }
+    
+    primary = next(
+        (metric for metric in METRICS
+         if any(metric_value(run, metric[0]) is not None
+                for runs in completed.values() for run in runs)),
+        None
+    )
+    
+    environments: Dict[str, Dict[str, Any]] = {}
+    samples: Dict[str, List[float]] = {}
+    for env, runs in envs.items():
+        summary: Dict[str, Any] = {
+            'runs': len(runs),
+            'passed': len(completed[env]),
+            'timestamp': str(runs[-1].get('timestamp', 'N/A')),
+            'metrics': {},
+        }
+        paths = [m[0] for m in METRICS] + [f"latency.{key}" for key in LATENCY_KEYS]
+        for path in dict.fromkeys(paths):
+            values = [v for v in (metric_value(run, path) for run in completed[env]) if v is not None]
+            if values:
+                summary['metrics'][path] = bootstrap_ci(values)
+                if primary and path == primary[0]:
+                    samples[env] = values
+        environments[env] = summary
+    
+    result: Dict[str, Any] = {
+        'metric': primary,
+        'environments': environments,
+        'winner': None,
+        'p_values': {},
+    }
+    
+    if primary is None:
+        result['verdict'] = "No comparable metric"
+        return result
+    path, label, higher_is_better = primary
+    if len(samples) < 2:
+        result['verdict'] = "Only one environment has results"
+        return result
+    
+    best = (max if higher_is_better else min)(
+        samples, key=lambda env: environments[env]['metrics'][path]['estimate']
+    )
+    untestable = [
+        env for env, values in samples.items()
+        if env != best and min_p_value(len(samples[best]), len(values)) >= alpha
+    ]
+    if untestable:
+        runs = ", ".join(f"{env}: {len(samples[env])}" for env in [best] + untestable)
+        result['verdict'] = (f"Best {label}: {best} (too few runs to test at p < {alpha}: "
+                             f"{runs} runs; repeat the benchmark)")
+        return result
+    
+    p_values = {
+        env: mann_whitney_u(samples[best], values)['p_value']
+        for env, values in samples.items() if env != best
+    }
+    result['p_values'] = p_values
+    worst_p = max(p_values.values())
+    if worst_p < alpha:
+        result['winner'] = best
+        result['verdict'] = f"Winner: {best} (best {label}, p = {worst_p:.3g} < {alpha})"
+    else:
+        result['verdict'] = (f"No significant winner (best {label}: {best}, "
+                             f"p = {worst_p:.3g} >= {alpha})")
+    return result
+
+
+def _format_ci(ci: Optional[Dict[str, float]]) -> str:
+    if not ci:
+        return "-"
+    if ci['n'] == 1:
+        return f"{ci['estimate']:.2f}"
+    return f"{ci['estimate']:.2f} [{ci['ci_low']:.2f}, {ci['ci_high']:.2f}]"
+
+
+def compare_results(results: Dict[str, List[Dict[str, Any]]]) -> None:
     """
     Print comparison of test results to console.
     
     Args:
-        results: Dictionary of test results indexed by environment_testtype
+        results: Runs indexed by environment_testtype
     """
     print("\n" + "=" * 80)
     print("Performance Comparison Report")
     print("=" * 80 + "\n")
     
-    # Group results by test type
-    tests: Dict[str, Dict[str, Dict[str, Any]]] = {}
-    for key, data in results.items():
-        test_type = data.get('test', 'unknown')
-        if test_type not in tests:
-            tests[test_type] = {}
-        env = data.get('environment', 'unknown')
-        tests[test_type][env] = data
-    
     # Compare each test type
-    for test_type, envs in tests.items():
+    for test_type, envs in group_by_test(results).items():
         print(f"\nTest: {test_type.upper()}")
         print("-" * 80)
         
-        for env, data in envs.items():
-            status = data.get('status', 'unknown')
-            status_icon = "PASS" if status == 'completed' else "FAIL"
-            duration = data.get('duration_seconds', 0.0)
-            timestamp = data.get('timestamp', 'N/A')
+        summary = summarize_test(envs)
+        for env, env_summary in summary['environments'].items():
+            status_icon = "PASS" if env_summary['passed'] == env_summary['runs'] else "FAIL"
+            metrics = env_summary['metrics']
             
-            print(f"[{status_icon}] {env:15s} | Duration: {duration:6.2f}s | {timestamp}")
+            line = (f"[{status_icon}] {env:15s} | Runs: {env_summary['passed']}/{env_summary['runs']}"
+                    f" | Duration: {_format_ci(metrics.get('duration_seconds'))} s")
+            if summary['metric'] and summary['metric'][0] != 'duration_seconds':
+                path, label, _ = summary['metric']
+                line += f" | {label}: {_format_ci(metrics.get(path))}"
+            if 'latency.p99_ms' in metrics:
+                line += " | " + " | ".join(
+                    f"{key[:-3].replace('_', '.')} {metrics[f'latency.{key}']['estimate']:.2f} ms"
+                    for key in LATENCY_KEYS if f'latency.{key}' in metrics
+                )
+            line += f" | {env_summary['timestamp']}"
+            print(line)
         
-        # Calculate winner
         if len(envs) > 1:
-            try:
-                fastest = min(
-                    envs.items(), 
-                    key=lambda x: x[1].get('duration_seconds', float('inf'))
-                )
-                print(f"   Winner: {fastest[0]} (fastest)")
-            except (ValueError, KeyError) as e:
-                logger.warning(f"Could not determine fastest for {test_type}: {e}")
+            print(f"   {summary['verdict']}")
     
     print("\n" + "=" * 80)
 
 
 def generate_html_report(
-    results: Dict[str, Dict[str, Any]], 
+    results: Dict[str, List[Dict[str, Any]]], 
     output_file: str
 ) -> None:
     """
     Generate an HTML report with performance comparison.
     
     Args:
-        results: Dictionary of test results
+        results: Runs indexed by environment_testtype
         output_file: Path to output HTML file
         
     Raises:
@@ -155,77 +322,77 @@ def generate_html_report(
         .status-ok {{ color: #27ae60; font-weight: bold; }}
         .status-fail {{ color: #e74c3c; font-weight: bold; }}
         .winner {{ background: #f0f8ff; font-weight: bold; }}
+        .verdict {{ color: #555; font-style: italic; }}
     </style>
 </head>
 <body>
     <div class="header">
         <h1>OptiVolt - Performance Comparison</h1>
         <p>Report generated: {timestamp}</p>
+        <p>Values are means over completed runs, with 95% bootstrap confidence intervals.</p>
     </div>
 """
     
-    # Group by test type
-    tests: Dict[str, Dict[str, Dict[str, Any]]] = {}
-    for key, data in results.items():
-        test_type = data.get('test', 'unknown')
-        if test_type not in tests:
-            tests[test_type] = {}
-        env = data.get('environment', 'unknown')
-        tests[test_type][env] = data
-    
+    tests = group_by_test(results)
     for test_type, envs in tests.items():
+        summary = summarize_test(envs)
+        metric_label = summary['metric'][1] if summary['metric'] else "Metric"
         html += f"""
     <div class="card">
         <h2>Test: {test_type.upper()}</h2>
         <table>
             <tr>
                 <th>Environment</th>
-                <th>Status</th>
+                <th>Runs</th>
+                <th>{metric_label}</th>
                 <th>Duration (s)</th>
-                <th>Timestamp</th>
+                <th>p50 (ms)</th>
+                <th>p99 (ms)</th>
+                <th>p99.9 (ms)</th>
+                <th>Max (ms)</th>
+                <th>Latest run</th>
             </tr>
 """
         
-        # Find fastest environment
-        fastest_env = None
-        if envs:
-            try:
-                fastest_env = min(
-                    envs.items(), 
-                    key=lambda x: x[1].get('duration_seconds', float('inf'))
-                )[0]
-            except (ValueError, KeyError):
-                logger.warning(f"Could not determine fastest for {test_type}")
-        
-        for env, data in sorted(envs.items()):
-            status = data.get('status', 'unknown')
-            status_class = 'status-ok' if status == 'completed' else 'status-fail'
-            duration = data.get('duration_seconds', 0.0)
-            timestamp = data.get('timestamp', 'N/A')[:19]
-            row_class = 'winner' if env == fastest_env else ''
-            winner_icon = 'Winner' if env == fastest_env else ''
+        winner_env = summary['winner']
+        for env, env_summary in sorted(summary['environments'].items()):
+            metrics = env_summary['metrics']
+            status_class = 'status-ok' if env_summary['passed'] == env_summary['runs'] else 'status-fail'
+            primary = _format_ci(metrics.get(summary['metric'][0])) if summary['metric'] else "-"
+            duration = metrics.get('duration_seconds')
+            percentiles = ''.join(
+                f"<td>{metrics[f'latency.{k}']['estimate']:.2f}</td>"
+                if f'latency.{k}' in metrics else "<td>-</td>"
+                for k in LATENCY_KEYS
+            )
+            row_class = 'winner' if env == winner_env else ''
+            winner_icon = 'Winner' if env == winner_env else ''
             
             html += f"""
             <tr class="{row_class}">
                 <td><strong>{env}</strong> {winner_icon}</td>
-                <td class="{status_class}">{status}</td>
-                <td>{duration:.2f}</td>
-                <td>{timestamp}</td>
+                <td class="{status_class}">{env_summary['passed']}/{env_summary['runs']}</td>
+                <td>{primary}</td>
+                <td>{f"{duration['estimate']:.2f}" if duration else "-"}</td>
+                {percentiles}
+                <td>{env_summary['timestamp'][:19]}</td>
             </tr>
 """
         
-        html += """
+        html += f"""
         </table>
+        <p class="verdict">{summary['verdict']}</p>
     </div>
 """
     
     # Summary section
-    unique_envs = len(set(r.get('environment', 'unknown') for r in results.values()))
+    total_runs = sum(len(runs) for runs in results.values())
+    unique_envs = len({env for envs in tests.values() for env in envs})
     html += f"""
     <div class="card">
         <h3>Summary</h3>
         <ul>
-            <li>Total tests: {len(results)}</li>
+            <li>Total runs: {total_runs}</li>
             <li>Environments tested: {unique_envs}</li>
             <li>Test types: {len(tests)}</li>
         </ul>
@@ -255,13 +422,14 @@ def main() -> int:
     
     try:
         logger.info(f"Loading results from: {results_dir}")
-        results = load_test_results(results_dir)
+        results = load_test_results(results_dir, details=False)
         
         if not results:
             logger.error("No test results found")
             return 1
         
-        logger.info(f"Loaded {len(results)} test results")
+        logger.info(f"Loaded {sum(len(runs) for runs in results.values())} runs "
+                    f"of {len(results)} environment/test pairs")
         
         # Display console comparison
         compare_results(results)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Statistics for comparing repeated benchmark runs between environments.
+
+Provides bootstrap confidence intervals (vectorized with NumPy when it is
+installed, pure Python otherwise) and the Mann-Whitney U test, so that a
+"winner" is only declared when the difference between environments is
+statistically significant rather than the result of a single lucky run.
+
+With a handful of runs even a complete separation of the two samples may
+not be significant (3 vs 3 runs cannot go below p = 0.1): check
+min_p_value() before reading a large p-value as "no difference".
+"""
+
+import math
+import random
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_RESAMPLES = 10_000
+# The pure-Python fallback is ~100x slower per resample
+FALLBACK_RESAMPLES = 2_000
+# Exact U distribution up to this many values per sample (without ties)
+EXACT_MAX_RUNS = 20
+
+
+def bootstrap_ci(
+    values: Sequence[float],
+    confidence: float = 0.95,
+    resamples: int = DEFAULT_RESAMPLES,
+    statistic: str = "mean",
+    seed: Optional[int] = 0
+) -> Dict[str, float]:
+    """
+    Percentile bootstrap confidence interval of the mean or median.
+
+    Args:
+        values: Observations (one per run)
+        confidence: Confidence level of the interval
+        resamples: Number of bootstrap resamples
+        statistic: "mean" or "median"
+        seed: Random seed, for reproducible reports
+
+    Returns:
+        Dictionary with n, estimate, ci_low and ci_high
+    """
+    n = len(values)
+    if n == 0:
+        raise ValueError("bootstrap_ci needs at least one value")
+    if statistic not in ("mean", "median"):
+        raise ValueError(f"Unknown statistic: {statistic}")
+    alpha = (1 - confidence) / 2
+
+    if np is not None:
+        data = np.asarray(values, dtype=float)
+        reduce = np.mean if statistic == "mean" else np.median
+        estimate = float(reduce(data))
+        if n == 1:
+            return {"n": 1, "estimate": estimate, "ci_low": estimate, "ci_high": estimate}
+        # All resamples at once: a (resamples, n) matrix of indices
+        rng = np.random.default_rng(seed)
+        samples = data[rng.integers(0, n, size=(resamples, n))]
+        stats = reduce(samples, axis=1)
+        low, high = np.quantile(stats, [alpha, 1 - alpha])
+        return {"n": n, "estimate": estimate, "ci_low": float(low), "ci_high": float(high)}
+
+    reduce_py: Callable[[List[float]], float] = _mean if statistic == "mean" else _median
+    data_py = list(values)
+    estimate = reduce_py(data_py)
+    if n == 1:
+        return {"n": 1, "estimate": estimate, "ci_low": estimate, "ci_high": estimate}
+    rng_py = random.Random(seed)
+    stats_py = sorted(
+        reduce_py(rng_py.choices(data_py, k=n))
+        for _ in range(min(resamples, FALLBACK_RESAMPLES))
+    )
+    return {
+        "n": n,
+        "estimate": estimate,
+        "ci_low": _quantile(stats_py, alpha),
+        "ci_high": _quantile(stats_py, 1 - alpha),
+    }
+
+
+def mann_whitney_u(a: Sequence[float], b: Sequence[float]) -> Dict[str, float]:
+    """
+    Two-sided Mann-Whitney U test.
+
+    The p-value comes from the exact distribution of U when both samples
+    have at most EXACT_MAX_RUNS values and no ties, and from the normal
+    approximation (tie and continuity corrected) otherwise.
+
+    Returns:
+        Dictionary with u (statistic of `a`), p_value and effect size
+        (probability that a value of `a` exceeds one of `b`)
+    """
+    n1, n2 = len(a), len(b)
+    if n1 == 0 or n2 == 0:
+        raise ValueError("mann_whitney_u needs two non-empty samples")
+
+    # Mid-ranks of the pooled sample
+    pooled = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    ranks_a = 0.0
+    tie_term = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        ranks_a += rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        i = j + 1
+
+    u = ranks_a - n1 * (n1 + 1) / 2
+    mean_u = n1 * n2 / 2
+    n = n1 + n2
+    if tie_term == 0 and max(n1, n2) <= EXACT_MAX_RUNS:
+        counts = _exact_u_counts(n1, n2)
+        tail = sum(counts[:int(min(u, n1 * n2 - u)) + 1])
+        p_value = min(1.0, 2 * tail / math.comb(n, n1))
+    else:
+        variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+        if variance <= 0:
+            p_value = 1.0
+        else:
+            z = (abs(u - mean_u) - 0.5) / math.sqrt(variance)
+            p_value = min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+    return {"u": u, "p_value": p_value, "effect_size": u / (n1 * n2)}
+
+
+def min_p_value(n1: int, n2: int) -> float:
+    """
+    Smallest p-value mann_whitney_u can return for samples of these sizes
+    (reached when they do not overlap at all).
+    """
+    if n1 == 0 or n2 == 0:
+        return 1.0
+    return mann_whitney_u(range(n1), range(n1, n1 + n2))["p_value"]
+
+
+def _exact_u_counts(n1: int, n2: int) -> List[int]:
+    """
+    Number of rank arrangements giving U = 0 .. n1 * n2 without ties: the
+    coefficients of the Gaussian binomial [n1 + n2 choose n1].
+    """
+    size = n1 * n2 + 1
+    counts = [1] + [0] * (size - 1)
+    for i in range(1, n1 + 1):
+        # Multiply by (1 - q^(n2 + i)), then divide by (1 - q^i)
+        shift = n2 + i
+        for k in range(size - 1, shift - 1, -1):
+            counts[k] -= counts[k - shift]
+        for k in range(i, size):
+            counts[k] += counts[k - i]
+    return counts
+
+
+def _mean(values: List[float]) -> float:
+    return math.fsum(values) / len(values)
+
+
+def _median(values: List[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    """Linear interpolation quantile of an already sorted list."""
+    rank = q * (len(ordered) - 1)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
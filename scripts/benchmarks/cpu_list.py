@@ -0,0 +1,20 @@
+"""CPU list parsing for the client-side tools (same syntax as taskset -c)."""
+
+from typing import List
+
+
+def parse_cpus(spec: str) -> List[int]:
+    """Parse a CPU list such as "0-3,6,8-9"."""
+    cpus = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    if not cpus:
+        raise ValueError(f"Empty CPU list: {spec!r}")
+    return cpus
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Compact HDR-style latency histogram.
+
+Values (integers, microseconds in the load generator) are counted in
+log-linear buckets with a fixed relative precision, following the
+HdrHistogram layout: memory is fixed at construction time regardless of how
+many values are recorded, and percentiles are accurate to the configured
+number of significant digits.
+"""
+
+import math
+from array import array
+from typing import Any, Dict, Iterator, Tuple
+
+
+class HdrHistogram:
+    """
+    Fixed-footprint histogram of positive integer values.
+
+    Args:
+        highest_trackable: Largest value recorded exactly; larger values are clamped
+        significant_figures: Relative precision (1-5 digits)
+    """
+
+    def __init__(self, highest_trackable: int = 3_600_000_000, significant_figures: int = 3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        if highest_trackable < 2:
+            raise ValueError("highest_trackable must be >= 2")
+
+        self.highest_trackable = highest_trackable
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        sub_bucket_count_magnitude = math.ceil(math.log2(largest_single_unit))
+        self.sub_bucket_half_count_magnitude = sub_bucket_count_magnitude - 1
+        self.sub_bucket_count = 1 << sub_bucket_count_magnitude
+        self.sub_bucket_half_count = self.sub_bucket_count // 2
+        self.sub_bucket_mask = self.sub_bucket_count - 1
+
+        bucket_count = 1
+        smallest_untrackable = self.sub_bucket_count
+        while smallest_untrackable <= highest_trackable:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+        self.counts = array('Q', bytes(8 * (bucket_count + 1) * self.sub_bucket_half_count))
+
+        self.total_count = 0
+        self.total_sum = 0
+        self.min_value = 0
+        self.max_value = 0
+
+    def _index(self, value: int) -> int:
+        bucket = (value | self.sub_bucket_mask).bit_length() - (self.sub_bucket_half_count_magnitude + 1)
+        sub_bucket = value >> bucket
+        return ((bucket + 1) << self.sub_bucket_half_count_magnitude) + sub_bucket - self.sub_bucket_half_count
+
+    def _value_range(self, index: int) -> Tuple[int, int]:
+        """Lowest and highest value counted at `index`."""
+        bucket = (index >> self.sub_bucket_half_count_magnitude) - 1
+        sub_bucket = (index & (self.sub_bucket_half_count - 1)) + self.sub_bucket_half_count
+        if bucket < 0:
+            sub_bucket -= self.sub_bucket_half_count
+            bucket = 0
+        low = sub_bucket << bucket
+        return low, low + (1 << bucket) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = min(max(int(value), 0), self.highest_trackable)
+        self.counts[self._index(value)] += count
+        if self.total_count == 0 or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+        self.total_count += count
+        self.total_sum += value * count
+
+    def merge(self, other: "HdrHistogram") -> None:
+        """Add all counts of `other` (same layout) into this histogram."""
+        if (other.significant_figures, other.highest_trackable) != (self.significant_figures, self.highest_trackable):
+            raise ValueError("Cannot merge histograms with different layouts")
+        if other.total_count == 0:
+            return
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        if self.total_count == 0 or other.min_value < self.min_value:
+            self.min_value = other.min_value
+        self.max_value = max(self.max_value, other.max_value)
+        self.total_count += other.total_count
+        self.total_sum += other.total_sum
+
+    def value_at_percentile(self, percentile: float) -> int:
+        if self.total_count == 0:
+            return 0
+        target = max(math.ceil(percentile / 100 * self.total_count), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._value_range(index)[1], self.max_value)
+        return self.max_value
+
+    def mean(self) -> float:
+        return self.total_sum / self.total_count if self.total_count else 0.0
+
+    def iter_recorded(self) -> Iterator[Tuple[int, int]]:
+        """Yield (bucket index, count) for non-empty buckets."""
+        for index, count in enumerate(self.counts):
+            if count:
+                yield index, count
+
+    def summary(self, scale: float = 1.0, suffix: str = "") -> Dict[str, float]:
+        """
+        Mean, min, p50/p90/p99/p99.9 and max, divided by `scale`.
+
+        Args:
+            scale: Divisor applied to values (1000 turns microseconds into ms)
+            suffix: Appended to every key, e.g. "_ms"
+        """
+        if self.total_count == 0:
+            return {}
+        summary = {
+            "count": self.total_count,
+            f"mean{suffix}": round(self.mean() / scale, 3),
+            f"min{suffix}": round(self.min_value / scale, 3),
+        }
+        for label, pct in (("p50", 50), ("p90", 90), ("p99", 99), ("p99_9", 99.9)):
+            summary[f"{label}{suffix}"] = round(self.value_at_percentile(pct) / scale, 3)
+        summary[f"max{suffix}"] = round(self.max_value / scale, 3)
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Sparse, JSON-friendly representation (see from_dict)."""
+        return {
+            "highest_trackable": self.highest_trackable,
+            "significant_figures": self.significant_figures,
+            "min": self.min_value,
+            "max": self.max_value,
+            "sum": self.total_sum,
+            "counts": [[index, count] for index, count in self.iter_recorded()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HdrHistogram":
+        histogram = cls(data["highest_trackable"], data["significant_figures"])
+        for index, count in data["counts"]:
+            histogram.counts[index] = count
+            histogram.total_count += count
+        histogram.min_value = data["min"]
+        histogram.max_value = data["max"]
+        histogram.total_sum = data["sum"]
+        return histogram
@@ -0,0 +1,675 @@
+#!/usr/bin/env python3
+"""
+Native asyncio load generator for the OptiVolt web API.
+
+Replaces the curl/hey loops of benchmark_webapi.sh with an in-process engine:
+a pool of keep-alive HTTP/1.1 connections driven either closed-loop
+(CONCURRENT_USERS users sending back-to-back requests) or open-loop (requests
+issued at a fixed REQUESTS_PER_SECOND arrival rate, independent of response
+times). Every latency is recorded in an HDR histogram, corrected for
+coordinated omission in open-loop mode. Load can be spread over several
+client processes (LOADGEN_PROCESSES), pinned away from the server's CPUs,
+whose histograms are merged losslessly. One result file per platform, endpoint and run is
+written as test_<platform>_<endpoint>_<YYYYmmdd-HHMMSS>.json, readable by
+compare_environments.py.
+
+During each run the host CPU usage is fed to an energy model
+(monitoring/energy_model.py, LOADGEN_ENERGY_MODEL) and the result records
+energy_joules and energy_per_request_joules, the metric regression_gate.py
+checks. The estimate covers the whole host, so it describes the system under
+test only when the server runs on the same machine.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from cpu_list import parse_cpus
+from hdr_histogram import HdrHistogram
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Energy models shared with the collector
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "monitoring"))
+from energy_model import EnergyMeter, EnergyModel, RaplModel, create_model
+
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(levelname)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+# Same defaults as benchmark_webapi.sh
+DEFAULT_DURATION = 60
+DEFAULT_CONCURRENT_USERS = 50
+DEFAULT_REQUESTS_PER_SECOND = 100
+
+DEFAULT_ENDPOINTS = [
+    "/",
+    "/api/light",
+    "/api/heavy",
+    "/api/slow",
+]
+
+DEFAULT_PLATFORMS = {
+    "standard": "http://localhost:8001",
+    "microvm": "http://localhost:8002",
+    "minimal": "http://localhost:8003",
+    "unikernel": "http://localhost:8004",
+}
+
+REQUEST_TIMEOUT = 30.0
+ENERGY_SAMPLE_INTERVAL = 0.5
+
+
+class HttpError(Exception):
+    """Raised when a response cannot be read or parsed."""
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client connection."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def request(self, raw_request: bytes) -> Tuple[int, int]:
+        """
+        Send a pre-encoded request and read the full response.
+
+        Returns:
+            Tuple of (status code, response body size in bytes)
+        """
+        reused = self.writer is not None
+        if not reused:
+            await self.connect()
+        self.writer.write(raw_request)
+        await self.writer.drain()
+
+        try:
+            head = await self.reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if reused and not e.partial:
+                # Server closed the idle keep-alive connection: retry once
+                self.close()
+                return await self.request(raw_request)
+            raise HttpError(f"Invalid response head: {e}") from e
+        except asyncio.LimitOverrunError as e:
+            raise HttpError(f"Invalid response head: {e}") from e
+
+        lines = head.split(b"\r\n")
+        try:
+            status = int(lines[0].split(b" ", 2)[1])
+        except (IndexError, ValueError) as e:
+            raise HttpError(f"Invalid status line: {lines[0]!r}") from e
+
+        headers = {}
+        for line in lines[1:]:
+            name, sep, value = line.partition(b":")
+            if sep:
+                headers[name.strip().lower()] = value.strip().lower()
+
+        if headers.get(b"transfer-encoding") == b"chunked":
+            size = await self._read_chunked()
+        elif b"content-length" in headers:
+            size = int(headers[b"content-length"])
+            await self.reader.readexactly(size)
+        elif status < 200 or status in (204, 304):
+            size = 0
+        else:
+            # Body delimited by the end of the connection: read until close,
+            # the connection cannot carry another request
+            size = len(await self.reader.read())
+            self.close()
+            return status, size
+
+        if headers.get(b"connection") == b"close":
+            self.close()
+        return status, size
+
+    async def _read_chunked(self) -> int:
+        total = 0
+        while True:
+            size_line = await self.reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0], 16)
+            await self.reader.readexactly(size + 2)
+            total += size
+            if size == 0:
+                return total
+
+
+class ConnectionPool:
+    """Fixed-size pool of keep-alive connections to one host."""
+
+    def __init__(self, host: str, port: int, size: int):
+        self.size = size
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._idle.put_nowait(HttpConnection(host, port))
+
+    async def acquire(self) -> HttpConnection:
+        return await self._idle.get()
+
+    def release(self, conn: HttpConnection) -> None:
+        self._idle.put_nowait(conn)
+
+    def close(self) -> None:
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+
+class RunStats:
+    """
+    Counters and latency histograms (microseconds) for one run.
+
+    `latency` is the response time seen by users: in open-loop mode it is
+    measured from the scheduled send time, so queueing behind a slow server
+    is not hidden (coordinated-omission correction). Requests that fail or
+    time out are counted in it too, up to the moment they were given up, and
+    also in `failed_latency`. `service_time` is measured from the actual send
+    for answered requests only and equals their `latency` in closed-loop mode.
+    """
+
+    def __init__(self):
+        self.latency = HdrHistogram()
+        self.service_time = HdrHistogram()
+        self.failed_latency = HdrHistogram()
+        self.errors = 0
+        self.status_counts: Dict[int, int] = {}
+        self.bytes_received = 0
+
+    @property
+    def completed(self) -> int:
+        """Requests that got a response (whatever its status)."""
+        return self.service_time.total_count
+
+    @property
+    def failed(self) -> int:
+        """Requests without a response: connection errors and timeouts."""
+        return self.failed_latency.total_count
+
+    def record_failure(self, latency_us: int) -> None:
+        self.latency.record(latency_us)
+        self.failed_latency.record(latency_us)
+        self.errors += 1
+
+    def record(self, latency_us: int, service_us: int, status: int, size: int) -> None:
+        self.latency.record(latency_us)
+        self.service_time.record(service_us)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self.bytes_received += size
+        if status >= 400:
+            self.errors += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Picklable/JSON form used to ship stats out of client processes."""
+        return {
+            "latency": self.latency.to_dict(),
+            "service_time": self.service_time.to_dict(),
+            "failed_latency": self.failed_latency.to_dict(),
+            "errors": self.errors,
+            "status_counts": self.status_counts,
+            "bytes_received": self.bytes_received,
+        }
+
+    def merge(self, data: Dict[str, Any]) -> None:
+        """Add the stats of another process (see to_dict); nothing is lost."""
+        self.latency.merge(HdrHistogram.from_dict(data["latency"]))
+        self.service_time.merge(HdrHistogram.from_dict(data["service_time"]))
+        self.failed_latency.merge(HdrHistogram.from_dict(data["failed_latency"]))
+        self.errors += data["errors"]
+        for status, count in data["status_counts"].items():
+            self.status_counts[int(status)] = self.status_counts.get(int(status), 0) + count
+        self.bytes_received += data["bytes_received"]
+
+
+def build_request(host: str, port: int, path: str) -> bytes:
+    return (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {host}:{port}\r\n"
+        f"User-Agent: optivolt-loadgen\r\n"
+        f"Accept: */*\r\n"
+        f"\r\n"
+    ).encode("latin-1")
+
+
+async def _send(pool: ConnectionPool, raw: bytes, stats: RunStats, intended: Optional[float] = None) -> None:
+    conn = await pool.acquire()
+    start = time.perf_counter()
+    latency_start = start if intended is None else intended
+    try:
+        status, size = await asyncio.wait_for(conn.request(raw), REQUEST_TIMEOUT)
+    except (OSError, HttpError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        # Connection state is unknown after a failure: start fresh next time
+        conn.close()
+        # Stalled requests are exactly what the latency tail must show
+        stats.record_failure(int((time.perf_counter() - latency_start) * 1e6))
+        return
+    finally:
+        pool.release(conn)
+    end = time.perf_counter()
+    stats.record(int((end - latency_start) * 1e6), int((end - start) * 1e6), status, size)
+
+
+async def run_closed_loop(
+    pool: ConnectionPool, raw: bytes, users: int, duration: float, stats: RunStats
+) -> None:
+    """Each user sends its next request as soon as the previous one completes."""
+    deadline = time.perf_counter() + duration
+
+    async def user() -> None:
+        while time.perf_counter() < deadline:
+            await _send(pool, raw, stats)
+
+    await asyncio.gather(*(user() for _ in range(users)))
+
+
+async def run_open_loop(
+    pool: ConnectionPool, raw: bytes, rate: float, duration: float, stats: RunStats, phase: float = 0.0
+) -> None:
+    """
+    Issue requests at a fixed arrival rate, regardless of response times.
+
+    `phase` (seconds) shifts the schedule so several client processes sharing
+    one target rate interleave their arrivals instead of sending in bursts.
+    """
+    interval = 1.0 / rate
+    start = time.perf_counter() + phase
+    total = int(duration * rate)
+    in_flight = set()
+
+    for i in range(total):
+        intended = start + i * interval
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(_send(pool, raw, stats, intended))
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+
+async def check_available(base_url: str) -> bool:
+    parts = urlsplit(base_url)
+    conn = HttpConnection(parts.hostname, parts.port or 80)
+    try:
+        status, _ = await asyncio.wait_for(conn.request(build_request(conn.host, conn.port, "/")), 5)
+        return status < 500
+    except (OSError, HttpError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+        return False
+    finally:
+        conn.close()
+
+
+async def generate_load(
+    base_url: str, endpoint: str, mode: str, duration: float, users: int, rate: float, phase: float = 0.0
+) -> RunStats:
+    """Run one load test from the current event loop."""
+    parts = urlsplit(base_url)
+    host, port = parts.hostname, parts.port or 80
+    raw = build_request(host, port, endpoint)
+    pool = ConnectionPool(host, port, users)
+    stats = RunStats()
+    try:
+        if mode == "open":
+            await run_open_loop(pool, raw, rate, duration, stats, phase)
+        else:
+            await run_closed_loop(pool, raw, users, duration, stats)
+    finally:
+        pool.close()
+    return stats
+
+
+def _client_process(
+    cpus: Optional[List[int]], start_at: float, base_url: str, endpoint: str,
+    mode: str, duration: float, users: int, rate: float, phase: float,
+) -> Dict[str, Any]:
+    """Entry point of one client process: own event loop, optional CPU pinning."""
+    if cpus:
+        os.sched_setaffinity(0, cpus)
+    # All client processes start together
+    time.sleep(max(start_at - time.time(), 0))
+    stats = asyncio.run(generate_load(base_url, endpoint, mode, duration, users, rate, phase))
+    return stats.to_dict()
+
+
+async def sample_power(
+    meter: EnergyMeter, stop: asyncio.Event, start_at: Optional[float] = None,
+    interval: float = ENERGY_SAMPLE_INTERVAL,
+) -> None:
+    """Feed `meter` with the host CPU usage every `interval` seconds until `stop` is set."""
+    if start_at is not None:
+        await asyncio.sleep(max(start_at - time.time(), 0))
+    model = meter.model
+    per_cpu = model.needs_per_cpu
+    per_cpu_freq = per_cpu and getattr(model, "max_freq_mhz", None)
+    # cpu_percent(interval=None) then measures since this call
+    psutil.cpu_percent(interval=None, percpu=per_cpu)
+    meter.start(time.monotonic())
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+        if per_cpu:
+            per_cpu_percent = psutil.cpu_percent(interval=None, percpu=True)
+            cpu_percent = sum(per_cpu_percent) / len(per_cpu_percent)
+        else:
+            per_cpu_percent = None
+            cpu_percent = psutil.cpu_percent(interval=None)
+        freqs = [f.current for f in psutil.cpu_freq(percpu=True)] if per_cpu_freq else None
+        meter.update(time.monotonic(), cpu_percent, per_cpu_percent, freqs)
+
+
+def energy_fields(meter: EnergyMeter, requests: int) -> Dict[str, Any]:
+    """Energy of one run, integrated from the start of sampling to its last sample."""
+    integrator = meter.integrator
+    if integrator.last_watts is None:
+        return {}
+    return {
+        "energy_model": meter.model.describe(),
+        "power_watts": round(integrator.average_watts, 2),
+        "energy_joules": round(integrator.joules, 3),
+        "energy_per_request_joules": integrator.joules / requests if requests else None,
+    }
+
+
+def split_evenly(total: int, parts: int) -> List[int]:
+    share, extra = divmod(total, parts)
+    return [share + (1 if i < extra else 0) for i in range(parts)]
+
+
+async def benchmark_endpoint(
+    platform: str,
+    base_url: str,
+    endpoint: str,
+    mode: str,
+    duration: float,
+    users: int,
+    rate: float,
+    executor: Optional[ProcessPoolExecutor] = None,
+    processes: int = 1,
+    client_cpus: Optional[List[int]] = None,
+    energy_model: Optional[EnergyModel] = None,
+) -> Dict[str, Any]:
+    """
+    Run one load test against `base_url + endpoint`.
+
+    With `executor`, the load is split over `processes` client processes
+    (users and arrival rate divided between them) and their histograms and
+    counters are merged. With `energy_model`, the host power is sampled
+    during the run (see sample_power).
+
+    Returns:
+        Result dictionary in the test_*.json format used by compare_environments.py
+    """
+    if processes > users:
+        raise ValueError(f"{processes} client processes need at least as many users (got {users})")
+    timestamp = datetime.now().isoformat()
+    meter = EnergyMeter(energy_model) if energy_model else None
+    stop_sampling = asyncio.Event()
+
+    if executor is None or processes <= 1:
+        sampler = asyncio.create_task(sample_power(meter, stop_sampling)) if meter else None
+        started = time.perf_counter()
+        stats = await generate_load(base_url, endpoint, mode, duration, users, rate)
+        elapsed = time.perf_counter() - started
+    else:
+        loop = asyncio.get_running_loop()
+        start_at = time.time() + 1.0
+        sampler = asyncio.create_task(sample_power(meter, stop_sampling, start_at)) if meter else None
+        process_rate = rate / processes
+        jobs = []
+        for i, process_users in enumerate(split_evenly(users, processes)):
+            cpus = [client_cpus[i % len(client_cpus)]] if client_cpus else None
+            jobs.append(loop.run_in_executor(
+                executor, _client_process, cpus, start_at, base_url, endpoint, mode,
+                duration, process_users, process_rate, i / rate if rate > 0 else 0.0,
+            ))
+        stats = RunStats()
+        for partial in await asyncio.gather(*jobs):
+            stats.merge(partial)
+        elapsed = time.time() - start_at
+
+    completed = stats.completed
+    energy = {}
+    if sampler is not None:
+        stop_sampling.set()
+        await sampler
+        energy = energy_fields(meter, completed)
+    return {
+        "environment": platform,
+        "test": endpoint_slug(endpoint),
+        "status": "completed" if completed else "failed",
+        "timestamp": timestamp,
+        "duration_seconds": round(elapsed, 3),
+        "url": base_url + endpoint,
+        "mode": mode,
+        "concurrent_users": users,
+        "client_processes": processes,
+        "client_cpus": client_cpus,
+        "target_requests_per_second": rate if mode == "open" else None,
+        "requests_total": completed,
+        "errors": stats.errors,
+        "failed_requests": stats.failed,
+        "requests_per_second": round(completed / elapsed, 2) if elapsed > 0 else 0.0,
+        "bytes_received": stats.bytes_received,
+        "status_codes": {str(k): v for k, v in sorted(stats.status_counts.items())},
+        "latency": stats.latency.summary(1000, "_ms"),
+        "service_time": stats.service_time.summary(1000, "_ms"),
+        "failed_latency": stats.failed_latency.summary(1000, "_ms"),
+        "latency_histogram_us": stats.latency.to_dict(),
+        **energy,
+    }
+
+
+def endpoint_slug(endpoint: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", endpoint).strip("_")
+    return slug or "root"
+
+
+def client_cpu_set(client_spec: Optional[str], exclude_spec: Optional[str]) -> Optional[List[int]]:
+    """
+    CPUs for client processes: `client_spec` if given, otherwise the current
+    affinity minus `exclude_spec`; None means no pinning.
+    """
+    if not client_spec and not exclude_spec:
+        return None
+    cpus = parse_cpus(client_spec) if client_spec else sorted(os.sched_getaffinity(0))
+    excluded = set(parse_cpus(exclude_spec)) if exclude_spec else set()
+    overlap = excluded.intersection(cpus) if client_spec else set()
+    if overlap:
+        raise ValueError(f"Client CPUs {sorted(overlap)} overlap with the system under test")
+    cpus = [cpu for cpu in cpus if cpu not in excluded]
+    if not cpus:
+        raise ValueError("No CPU left for client processes")
+    return cpus
+
+
+def parse_platforms(spec: str) -> Dict[str, str]:
+    """Parse "name=url name=url" (space or comma separated)."""
+    platforms = {}
+    for item in spec.replace(",", " ").split():
+        name, sep, url = item.partition("=")
+        if not sep or not url:
+            raise ValueError(f"Invalid platform spec: {item!r} (expected name=url)")
+        platforms[name] = url.rstrip("/")
+    return platforms
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OptiVolt web API load generator")
+    parser.add_argument("--mode", choices=["closed", "open"], default=os.getenv("LOADGEN_MODE", "closed"),
+                        help="closed: CONCURRENT_USERS back-to-back, open: fixed REQUESTS_PER_SECOND")
+    parser.add_argument("--duration", type=float,
+                        default=float(os.getenv("DURATION", DEFAULT_DURATION)))
+    parser.add_argument("--users", type=int,
+                        default=int(os.getenv("CONCURRENT_USERS", DEFAULT_CONCURRENT_USERS)),
+                        help="Concurrent users (closed) / max open connections (open)")
+    parser.add_argument("--rate", type=float,
+                        default=float(os.getenv("REQUESTS_PER_SECOND", DEFAULT_REQUESTS_PER_SECOND)),
+                        help="Arrival rate in open-loop mode")
+    parser.add_argument("--endpoints", default=os.getenv("ENDPOINTS"),
+                        help="Space separated endpoint paths")
+    parser.add_argument("--platforms", default=os.getenv("PLATFORMS"),
+                        help="Space separated name=url pairs")
+    parser.add_argument("--processes", type=int, default=int(os.getenv("LOADGEN_PROCESSES", "1")),
+                        help="Client processes, each with its own event loop")
+    parser.add_argument("--client-cpus", default=os.getenv("LOADGEN_CPUS"),
+                        help="CPUs to pin client processes to, e.g. '4-7'")
+    parser.add_argument("--exclude-cpus", default=os.getenv("SERVER_CPUS"),
+                        help="CPUs used by the system under test, never used by clients")
+    parser.add_argument("--energy-model", choices=["none", "auto", "rapl", "linear", "table"],
+                        default=os.getenv("LOADGEN_ENERGY_MODEL", "auto" if psutil else "none"),
+                        help="Host power model for energy per request (auto: RAPL, else table or linear)")
+    parser.add_argument("--calibration", default=os.getenv("ENERGY_CALIBRATION"),
+                        help="Calibration table for the table model (see energy_model.py)")
+    parser.add_argument("--tdp", type=float, default=float(os.getenv("TDP_WATTS", "65")),
+                        help="TDP (W) of the linear model")
+    parser.add_argument("--output-dir", default=os.getenv("RESULTS_DIR", "."))
+    args = parser.parse_args(argv)
+
+    args.endpoints = args.endpoints.split() if args.endpoints else DEFAULT_ENDPOINTS
+    args.platforms = parse_platforms(args.platforms) if args.platforms else DEFAULT_PLATFORMS
+    if args.users < 1:
+        parser.error("--users must be >= 1")
+    if args.processes < 1:
+        parser.error("--processes must be >= 1")
+    if args.processes > args.users:
+        # Each process runs at least one user (connection)
+        parser.error("--processes must not exceed --users")
+    try:
+        args.client_cpus = client_cpu_set(args.client_cpus, args.exclude_cpus)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.mode == "open" and args.rate <= 0:
+        parser.error("--rate must be > 0 in open-loop mode")
+    if args.energy_model != "none" and psutil is None:
+        parser.error("--energy-model needs psutil (pip install psutil) or 'none'")
+    return args
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+
+    energy_model = None
+    if args.energy_model != "none":
+        try:
+            energy_model = create_model(args.energy_model, args.calibration, tdp_watts=args.tdp)
+        except OSError as e:
+            raise ValueError(f"Energy model {args.energy_model!r} unavailable: {e}")
+        logger.info(f"Energy model: {energy_model.describe()['name']}")
+
+    executor = None
+    if args.processes > 1:
+        executor = ProcessPoolExecutor(args.processes, mp_context=multiprocessing.get_context("spawn"))
+    elif args.client_cpus:
+        os.sched_setaffinity(0, args.client_cpus)
+
+    try:
+        for platform, base_url in args.platforms.items():
+            results.extend(await run_platform(args, platform, base_url, output_dir, executor, energy_model))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if isinstance(energy_model, RaplModel):
+            energy_model.close()
+    return results
+
+
+async def run_platform(
+    args: argparse.Namespace,
+    platform: str,
+    base_url: str,
+    output_dir: Path,
+    executor: Optional[ProcessPoolExecutor],
+    energy_model: Optional[EnergyModel] = None,
+) -> List[Dict[str, Any]]:
+    results = []
+    if not await check_available(base_url):
+        logger.warning(f"{platform}: {base_url} not available, skipping")
+        return results
+
+    for endpoint in args.endpoints:
+        logger.info(f"{platform} {endpoint}: {args.mode}-loop for {args.duration}s "
+                    f"({args.processes} client process(es))")
+        result = await benchmark_endpoint(
+            platform, base_url, endpoint, args.mode, args.duration, args.users, args.rate,
+            executor, args.processes, args.client_cpus, energy_model,
+        )
+        # One file per run so that repetitions are kept for comparison
+        run_id = datetime.fromisoformat(result['timestamp']).strftime('%Y%m%d-%H%M%S')
+        output_file = output_dir / f"test_{platform}_{result['test']}_{run_id}.json"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+        latency = result["latency"]
+        logger.info(
+            f"{platform} {endpoint}: {result['requests_total']} req, "
+            f"{result['requests_per_second']} req/s, {result['errors']} errors, "
+            f"p50 {latency.get('p50_ms', 0)} ms, p99 {latency.get('p99_ms', 0)} ms, "
+            f"p99.9 {latency.get('p99_9_ms', 0)} ms, max {latency.get('max_ms', 0)} ms"
+            + (f", {result['energy_per_request_joules']:.3g} J/req"
+               if result.get('energy_per_request_joules') is not None else "")
+        )
+        results.append(result)
+
+    return results
+
+
+def main() -> int:
+    """
+    Main entry point for the load generator.
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    try:
+        args = parse_args()
+        results = asyncio.run(run(args))
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        return 1
+    except KeyboardInterrupt:
+        logger.warning("Interrupted")
+        return 1
+
+    if not results:
+        logger.error("No platform was available")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Baseline store and performance-regression gate for benchmark results.
+
+`save` records, for every environment/test pair found in a results
+directory, the per-run distribution of p99 latency, throughput and energy
+per request. `check` compares a new results directory against that
+baseline and exits non-zero when a metric regresses past its threshold.
+Pairs are keyed by their load shape too (mode, users, target rate): runs at
+another load are reported as new/missing, never compared.
+
+    python3 regression_gate.py save results/ --baseline baseline.json
+    python3 regression_gate.py check new_results/ --baseline baseline.json \
+        --p99-threshold 10 --throughput-threshold 5 --energy-threshold 10
+
+When both sides have enough runs for the test to reach p < --alpha (4 per
+side at 0.05, see comparison_stats.min_p_value), a regression must also be
+statistically significant (Mann-Whitney U), so run-to-run noise alone does
+not fail the gate. With fewer runs only the threshold applies.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from compare_environments import load_shape, load_test_results, metric_value
+from comparison_stats import bootstrap_ci, mann_whitney_u, min_p_value
+from hdr_histogram import HdrHistogram
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(levelname)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# 2: entries keyed and labelled by load shape
+BASELINE_VERSION = 2
+DEFAULT_BASELINE = os.getenv("BENCHMARK_BASELINE", "benchmark_baseline.json")
+
+# Exit codes
+EXIT_OK, EXIT_REGRESSION, EXIT_ERROR = 0, 1, 2
+
+
+def _p99_ms(data: Dict[str, Any]) -> Optional[float]:
+    value = metric_value(data, "latency.p99_ms")
+    if value is None and isinstance(data.get("latency_histogram_us"), dict):
+        histogram = HdrHistogram.from_dict(data["latency_histogram_us"])
+        value = histogram.value_at_percentile(99) / 1000 if histogram.total_count else None
+    return value
+
+
+# (name, label, unit, higher is better, extractor)
+GATE_METRICS: Tuple[Tuple[str, str, str, bool, Callable[[Dict[str, Any]], Optional[float]]], ...] = (
+    ("p99_ms", "p99 latency", "ms", False, _p99_ms),
+    ("requests_per_second", "throughput", "req/s", True,
+     lambda data: metric_value(data, "requests_per_second")),
+    # Written by loadgen.py when an energy model is enabled
+    ("energy_per_request_j", "energy/request", "J", False,
+     lambda data: metric_value(data, "energy_per_request_joules")),
+)
+
+
+def collect_distributions(results: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per environment/test/load-shape key, the list of per-run values of each
+    gate metric, with the load parameters of the runs.
+
+    Only completed runs are used; metrics missing from every run are left out.
+    """
+    entries = {}
+    for key, runs in results.items():
+        completed = [run for run in runs if run.get('status') == 'completed']
+        if not completed:
+            continue
+        metrics = {}
+        for name, _, _, _, extract in GATE_METRICS:
+            values = [v for v in (extract(run) for run in completed) if v is not None]
+            if values:
+                metrics[name] = values
+        if metrics:
+            first = completed[0]
+            entries[key] = {
+                "environment": first.get('environment', 'unknown'),
+                "test": first.get('test', 'unknown'),
+                "load_shape": load_shape(first),
+                "mode": first.get('mode'),
+                "concurrent_users": first.get('concurrent_users'),
+                "target_requests_per_second": first.get('target_requests_per_second'),
+                "runs": len(completed),
+                "metrics": metrics,
+            }
+    return entries
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """
+    Read a baseline file.
+
+    Raises:
+        ValueError: If the file is missing or has an unknown format
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"Baseline not found: {path} (create it with 'save')")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid baseline {path}: {e}")
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version in {path}: {baseline.get('version')} "
+                         f"(expected {BASELINE_VERSION}, re-create it with 'save --replace')")
+    return baseline
+
+
+def save_baseline(results_dir: str, path: str, replace: bool = False) -> int:
+    """
+    Store the distributions of `results_dir` in the baseline file.
+
+    Entries for environment/test pairs absent from `results_dir` are kept
+    unless `replace` is set.
+
+    Returns:
+        Number of environment/test pairs written
+    """
+    entries = collect_distributions(load_test_results(results_dir, details=True))
+    if not entries:
+        raise ValueError(f"No completed runs with gate metrics in {results_dir}")
+
+    baseline = {"version": BASELINE_VERSION, "entries": {}}
+    if not replace and os.path.exists(path):
+        baseline = load_baseline(path)
+
+    saved_at = datetime.now().isoformat()
+    for entry in entries.values():
+        entry["saved_at"] = saved_at
+        entry["source"] = os.path.abspath(results_dir)
+    baseline["entries"].update(entries)
+    baseline["updated_at"] = saved_at
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+    logger.info(f"Baseline saved: {path} ({len(entries)} environment/test pairs)")
+    return len(entries)
+
+
+def check_regressions(
+    baseline: Dict[str, Any],
+    current: Dict[str, Dict[str, Any]],
+    thresholds: Dict[str, float],
+    alpha: float = 0.05
+) -> List[Dict[str, Any]]:
+    """
+    Compare current distributions with the baseline.
+
+    A metric regresses when its mean moves in the bad direction by more than
+    its threshold (percent) and, if the run counts allow p < alpha at all,
+    the Mann-Whitney U test gives p < alpha.
+
+    Returns:
+        One finding per compared metric, with a "regression" flag
+    """
+    findings = []
+    for key, entry in sorted(current.items()):
+        reference = baseline["entries"].get(key)
+        if reference is None:
+            findings.append({"key": key, "status": "new"})
+            continue
+        for name, label, unit, higher_is_better, _ in GATE_METRICS:
+            before = reference["metrics"].get(name)
+            after = entry["metrics"].get(name)
+            if not before or not after:
+                continue
+            old = bootstrap_ci(before)
+            new = bootstrap_ci(after)
+            if old["estimate"] == 0:
+                continue
+            change = 100 * (new["estimate"] - old["estimate"]) / abs(old["estimate"])
+            worse = -change if higher_is_better else change
+            p_value = None
+            if min_p_value(len(before), len(after)) < alpha:
+                p_value = mann_whitney_u(before, after)["p_value"]
+            regression = worse > thresholds[name] and (p_value is None or p_value < alpha)
+            findings.append({
+                "key": key,
+                "status": "regression" if regression else "ok",
+                "metric": name,
+                "label": label,
+                "unit": unit,
+                "baseline": old,
+                "current": new,
+                "change_percent": change,
+                "threshold_percent": thresholds[name],
+                "p_value": p_value,
+            })
+    for key in sorted(set(baseline["entries"]) - set(current)):
+        findings.append({"key": key, "status": "missing"})
+    return findings
+
+
+def print_findings(findings: List[Dict[str, Any]]) -> None:
+    print("\n" + "=" * 80)
+    print("Performance Regression Check")
+    print("=" * 80)
+    for finding in findings:
+        if finding["status"] == "new":
+            print(f"[NEW]        {finding['key']}: not in baseline (new test or load shape)")
+        elif finding["status"] == "missing":
+            print(f"[MISSING]    {finding['key']}: in baseline, no current runs at this load shape")
+        else:
+            tag = "[REGRESSION]" if finding["status"] == "regression" else "[OK]        "
+            p_value = finding["p_value"]
+            significance = f", p = {p_value:.3g}" if p_value is not None else ", too few runs for a test"
+            print(
+                f"{tag} {finding['key']} {finding['label']}: "
+                f"{finding['baseline']['estimate']:.4g} -> {finding['current']['estimate']:.4g} "
+                f"{finding['unit']} ({finding['change_percent']:+.1f}%, "
+                f"threshold {finding['threshold_percent']:.0f}%{significance})"
+            )
+    print("=" * 80)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark baseline store and regression gate")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    save = subparsers.add_parser("save", help="Record results as the new baseline")
+    save.add_argument("results_dir", help="Directory with test_*.json results")
+    save.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file")
+    save.add_argument("--replace", action="store_true",
+                      help="Drop baseline entries absent from results_dir")
+
+    check = subparsers.add_parser("check", help="Fail when results regress against the baseline")
+    check.add_argument("results_dir", help="Directory with test_*.json results")
+    check.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file")
+    check.add_argument("--p99-threshold", type=float, default=10.0,
+                       help="Max p99 latency increase in percent (default: 10)")
+    check.add_argument("--throughput-threshold", type=float, default=5.0,
+                       help="Max throughput decrease in percent (default: 5)")
+    check.add_argument("--energy-threshold", type=float, default=10.0,
+                       help="Max energy per request increase in percent (default: 10)")
+    check.add_argument("--alpha", type=float, default=0.05,
+                       help="Significance level when both sides have enough runs (default: 0.05)")
+    check.add_argument("--json", metavar="FILE", help="Also write the findings as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Main entry point.
+
+    Returns:
+        0 when no regression, 1 on regression, 2 on configuration errors
+    """
+    args = parse_args(argv)
+    try:
+        if args.command == "save":
+            save_baseline(args.results_dir, args.baseline, args.replace)
+            return EXIT_OK
+
+        baseline = load_baseline(args.baseline)
+        current = collect_distributions(load_test_results(args.results_dir, details=True))
+        if not current:
+            logger.error(f"No completed runs with gate metrics in {args.results_dir}")
+            return EXIT_ERROR
+
+        thresholds = {
+            "p99_ms": args.p99_threshold,
+            "requests_per_second": args.throughput_threshold,
+            "energy_per_request_j": args.energy_threshold,
+        }
+        findings = check_regressions(baseline, current, thresholds, args.alpha)
+        print_findings(findings)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(findings, f, indent=2)
+
+        regressions = [f for f in findings if f["status"] == "regression"]
+        if regressions:
+            logger.error(f"{len(regressions)} regression(s) past threshold")
+            return EXIT_REGRESSION
+        logger.info("No regression past threshold")
+        return EXIT_OK
+
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        return EXIT_ERROR
+    except IOError as e:
+        logger.error(f"I/O error: {e}")
+        return EXIT_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
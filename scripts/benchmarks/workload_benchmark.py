@@ -5,76 +5,313 @@ Génère une charge CPU/mémoire mesurable pour comparer Docker/MicroVM/Unikerne
 """
 
 import time
-import hashlib
+import multiprocessing
 import sys
 import json
 import psutil
 import os
+import threading
+from array import array
 from datetime import datetime
+from multiprocessing.connection import wait
+
+# Modèles d'énergie et statistiques partagés avec le collecteur (scripts/monitoring).
+# Dépendance obligatoire: hors du dépôt (VM, unikernel), copier energy_model.py
+# et sample_stats.py à côté de ce script
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "monitoring"))
+try:
+    from energy_model import EnergyMeter, create_model
+    from sample_stats import SampleColumns, describe, round_summary
+except ImportError as e:
+    raise ImportError(
+        f"{e.name} introuvable: workload_benchmark.py requiert scripts/monitoring/"
+        "energy_model.py et sample_stats.py (à copier à côté du script hors du dépôt)"
+    ) from e
+from workload_kernels import KERNELS, create_kernel
+
+# Cases par worker dans le tableau de compteurs partagé: temps CPU en µs,
+# rapport cyclique courant, durée calibrée d'une itération et occupation CPU
+# du noyau à pleine charge (calibration), en ppm / ns / ppm
+(STAT_ITERATIONS, STAT_OPS, STAT_BYTES, STAT_CPU_US, STAT_DUTY_PPM, STAT_ITERATION_NS,
+ STAT_KERNEL_UTILIZATION_PPM) = range(7)
+STAT_FIELDS = 7
+
+CALIBRATION_SECONDS = 0.5
+# Attente maximale de la préparation des workers (allocations, calibration)
+SETUP_TIMEOUT = 120.0
+
+
+class UtilizationController:
+    """
+    PID sur le taux d'occupation CPU mesuré du worker (time.thread_time /
+    temps écoulé, par fenêtre de `window` secondes). La sortie est le rapport
+    cyclique appliqué à la boucle; `feedforward` (par défaut la cible) sert
+    de terme d'anticipation et de rapport cyclique initial.
+    """
+
+    def __init__(self, target, window=0.25, kp=0.5, ki=2.0, kd=0.02, feedforward=None):
+        self.target = target
+        self.window = window
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.integral = 0.0
+        self.last_error = None
+        self.feedforward = target if feedforward is None else feedforward
+        self.duty = min(max(self.feedforward, 0.01), 1.0)
+
+    @classmethod
+    def from_calibration(cls, target, iteration_seconds, kernel_utilization, min_window=0.25):
+        """
+        Régulateur amorcé par calibrate_kernel: un noyau qui n'occupe que
+        `kernel_utilization` du CPU à pleine charge (E/S, mémoire) part
+        d'un rapport cyclique target / kernel_utilization, et chaque fenêtre
+        de mesure couvre au moins quatre itérations.
+        """
+        return cls(target, window=max(min_window, 4 * iteration_seconds),
+                   feedforward=target / max(kernel_utilization, 0.01))
+
+    def update(self, measured, dt):
+        error = self.target - measured
+        derivative = (error - self.last_error) / dt if self.last_error is not None else 0.0
+        self.last_error = error
+        integral = self.integral + error * dt
+        duty = self.feedforward + self.kp * error + self.ki * integral + self.kd * derivative
+        # Anti-emballement: l'intégrale n'avance pas quand la sortie sature
+        if 0.01 <= duty <= 1.0:
+            self.integral = integral
+        self.duty = min(max(duty, 0.01), 1.0)
+        return self.duty
+
+
+def calibrate_kernel(kernel, seconds=CALIBRATION_SECONDS):
+    """
+    Noyau à pleine charge pendant `seconds`: (durée moyenne d'une itération
+    en s, fraction de ce temps passée sur le CPU)
+    """
+    iterations = 0
+    start, cpu_start = time.perf_counter(), time.thread_time()
+    while True:
+        kernel.run(iterations)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return elapsed / iterations, min((time.thread_time() - cpu_start) / elapsed, 1.0)
+
+
+def workload_worker(slot, counters, kernel_name, intensity, ready, duration, duty_cycle=1.0,
+                    target_utilization=None):
+    """
+    Boucle de charge: publie itérations, opérations, octets et temps CPU
+    dans counters[slot * STAT_FIELDS:].
+
+    Aucune E/S ni mesure ici (le Monitor échantillonne à part). Avec
+    duty_cycle < 1, chaque itération est suivie d'une pause proportionnelle
+    au temps de calcul: busy / (busy + pause) = duty_cycle. Avec
+    `target_utilization` (0-1), le noyau est d'abord calibré, ce qui amorce
+    le rapport cyclique, puis celui-ci est ajusté en continu par un
+    UtilizationController.
+
+    La préparation (noyau, calibration) précède `ready.wait()` (barrière
+    partagée avec le Monitor et les autres workers): la mesure de `duration`
+    secondes ne commence qu'une fois tout le monde prêt.
+    """
+    kernel = create_kernel(kernel_name, intensity)
+    base = slot * STAT_FIELDS
+    controller = None
+    try:
+        if target_utilization is not None:
+            iteration_seconds, kernel_utilization = calibrate_kernel(kernel)
+            counters[base + STAT_ITERATION_NS] = int(iteration_seconds * 1e9)
+            counters[base + STAT_KERNEL_UTILIZATION_PPM] = int(kernel_utilization * 1e6)
+            controller = UtilizationController.from_calibration(
+                target_utilization, iteration_seconds, kernel_utilization
+            )
+            duty_cycle = controller.duty
+        counters[base + STAT_DUTY_PPM] = int(duty_cycle * 1e6)
+        ready.wait(SETUP_TIMEOUT)
+    except BaseException:
+        kernel.close()
+        raise
+    stop_at = time.time() + duration
+    
+    idle_ratio = 1.0 / duty_cycle - 1.0
+    iteration = 0
+    cpu_start = window_cpu = time.thread_time()
+    window_start = time.perf_counter()
+    try:
+        while time.time() < stop_at:
+            busy_start = time.perf_counter()
+            ops, nbytes = kernel.run(iteration)
+            iteration += 1
+            cpu_now = time.thread_time()
+            # Un seul écrivain par case: pas de verrou nécessaire
+            counters[base + STAT_ITERATIONS] = iteration
+            counters[base + STAT_OPS] += ops
+            counters[base + STAT_BYTES] += nbytes
+            counters[base + STAT_CPU_US] = int((cpu_now - cpu_start) * 1e6)
+            
+            if controller is not None:
+                now = time.perf_counter()
+                if now - window_start >= controller.window:
+                    measured = (cpu_now - window_cpu) / (now - window_start)
+                    duty_cycle = controller.update(measured, now - window_start)
+                    idle_ratio = 1.0 / duty_cycle - 1.0
+                    counters[base + STAT_DUTY_PPM] = int(duty_cycle * 1e6)
+                    window_start, window_cpu = now, cpu_now
+            
+            if idle_ratio:
+                time.sleep((time.perf_counter() - busy_start) * idle_ratio)
+    finally:
+        kernel.close()
+
+
+def join_workers(processes, ready):
+    """
+    Attend la fin de tous les processus de charge, ensemble.
+
+    Dès qu'un worker sort en erreur (par exemple pendant la préparation de
+    son noyau), la barrière `ready` est rompue: les autres workers et le
+    Monitor n'attendent pas SETUP_TIMEOUT. Lève RuntimeError si un worker
+    a échoué.
+    """
+    pending = {process.sentinel: process for process in processes}
+    failed = []
+    while pending:
+        for sentinel in wait(list(pending)):
+            process = pending.pop(sentinel)
+            process.join()
+            if process.exitcode != 0:
+                failed.append(process)
+                ready.abort()
+    if failed:
+        raise RuntimeError("worker(s) en échec: " + ", ".join(
+            f"{process.name} (code {process.exitcode})" for process in failed
+        ))
+
+
+class Monitor(threading.Thread):
+    """Échantillonne CPU/mémoire/puissance à intervalle fixe, hors de la boucle de charge"""
+
+    def __init__(self, benchmark, ready, counters, interval):
+        super().__init__(name="workload-monitor", daemon=True)
+        self.benchmark = benchmark
+        self.ready = ready
+        self.start_at = None
+        self.counters = counters
+        self.interval = interval
+        self.stopping = threading.Event()
+
+    def run(self):
+        # Début de la mesure: quand les workers ont fini leur préparation
+        try:
+            self.ready.wait(SETUP_TIMEOUT)
+        except threading.BrokenBarrierError:
+            return  # worker en échec avant le départ
+        self.start_at = time.time()
+        # Amorce: les appels suivants mesurent depuis l'échantillon précédent
+        psutil.cpu_percent(interval=None)
+        self.benchmark._last_load = (time.monotonic(), 0)
+        self.benchmark.energy_meter.start(time.monotonic())
+        deadline = time.monotonic() + self.interval
+        while not self.stopping.wait(max(0.0, deadline - time.monotonic())):
+            self.benchmark._sample(self.start_at, self.counters)
+            deadline += self.interval
+        # Dernier échantillon pour couvrir la fin de la charge, sauf si la
+        # fenêtre est trop courte pour que cpu_percent soit significatif
+        if self.interval - (deadline - time.monotonic()) >= self.interval / 4:
+            self.benchmark._sample(self.start_at, self.counters)
+        self.benchmark.energy_meter.finish(time.monotonic())
+
+    def stop(self):
+        self.stopping.set()
+        self.join()
+
 
 class WorkloadBenchmark:
-    def __init__(self, duration_sec=30, intensity="medium"):
+    def __init__(self, duration_sec=30, intensity="medium", energy_model=None, workers=1,
+                 duty_cycle=1.0, sample_interval=1.0, workload_type="crypto",
+                 target_utilization=None):
+        if not 0 < duty_cycle <= 1:
+            raise ValueError("duty_cycle doit être dans ]0, 1]")
+        if target_utilization is not None and not 0 < target_utilization <= 100:
+            raise ValueError("target_utilization doit être dans ]0, 100] (%)")
+        if workload_type not in KERNELS:
+            raise ValueError(f"type de charge inconnu: {workload_type} (choix: {', '.join(KERNELS)})")
         self.duration = duration_sec
         self.intensity = intensity
+        self.workload_type = workload_type
+        self.workers = max(1, workers)
+        self.duty_cycle = duty_cycle
+        self.target_utilization = target_utilization
+        self.sample_interval = sample_interval
+        self._last_load = (time.monotonic(), 0)
+        self.energy_meter = EnergyMeter(energy_model or create_model("linear"))
+        # Échantillons en colonnes, résumés en une passe (sample_stats.describe)
+        self.cpu_samples = SampleColumns(
+            ("timestamp", "cpu_percent", "power_watts", "iterations", "achieved_load", "duty_cycle")
+        )
+        self.memory_samples = SampleColumns(("timestamp", "memory_mb", "memory_percent"))
         self.results = {
             "start_time": datetime.now().isoformat(),
             "duration_sec": duration_sec,
             "intensity": intensity,
+            "workload_type": workload_type,
+            "workers": self.workers,
+            "duty_cycle": duty_cycle,
+            "target_utilization": target_utilization,
+            "sample_interval_sec": sample_interval,
             "iterations": 0,
-            "cpu_samples": [],
-            "memory_samples": [],
+            "ops": 0,
+            "bytes": 0,
+            "cpu_samples": {},
+            "memory_samples": {},
             "metrics": {}
         }
         
     def run_crypto_workload(self):
         """Charge CPU intensive avec calculs cryptographiques"""
-        print(f"[WORKLOAD] Démarrage benchmark crypto (durée: {self.duration}s)")
+        self.workload_type = self.results["workload_type"] = "crypto"
+        return self.run_workload()
+    
+    def run_workload(self):
+        """Exécute le noyau `workload_type` (voir workload_kernels.KERNELS)"""
+        print(f"[WORKLOAD] Démarrage benchmark {self.workload_type} (durée: {self.duration}s)")
+        print(f"[WORKLOAD] {KERNELS[self.workload_type].description}")
         print(f"[WORKLOAD] Intensité: {self.intensity}")
+        if self.target_utilization is not None:
+            print(f"[WORKLOAD] Workers: {self.workers} | Charge cible: {self.target_utilization:.0f}% "
+                  f"(calibration {CALIBRATION_SECONDS}s puis régulation PID)")
+        else:
+            print(f"[WORKLOAD] Workers: {self.workers} | Duty cycle: {self.duty_cycle:.0%}")
         
-        start_time = time.time()
-        iteration = 0
-        
-        # Intensité détermine le nombre d'opérations
-        ops_per_iteration = {
-            "light": 5000,
-            "medium": 15000,
-            "heavy": 50000
-        }.get(self.intensity, 15000)
+        if self.workers > 1:
+            counters = self._run_parallel()
+        else:
+            counters = self._run_inline()
         
-        while (time.time() - start_time) < self.duration:
-            # Génération de données
-            data = f"optivolt-benchmark-{iteration}-{time.time()}".encode()
-            
-            # Calculs cryptographiques
-            for _ in range(ops_per_iteration):
-                hash_result = hashlib.sha256(data).hexdigest()
-                hash_result = hashlib.sha512(hash_result.encode()).hexdigest()
-            
-            iteration += 1
-            
-            # Collecte des métriques toutes les 2 secondes
-            if iteration % 10 == 0:
-                cpu_percent = psutil.cpu_percent(interval=0.1)
-                mem_info = psutil.virtual_memory()
-                
-                self.results["cpu_samples"].append({
-                    "timestamp": time.time() - start_time,
-                    "cpu_percent": cpu_percent
-                })
-                self.results["memory_samples"].append({
-                    "timestamp": time.time() - start_time,
-                    "memory_mb": mem_info.used / (1024 * 1024),
-                    "memory_percent": mem_info.percent
-                })
-                
-                print(f"[WORKLOAD] Iter {iteration} | CPU: {cpu_percent:.1f}% | "
-                      f"MEM: {mem_info.percent:.1f}% ({mem_info.used/(1024*1024):.0f}MB)")
-                sys.stdout.flush()
-            
-            # Petite pause pour éviter saturation totale
-            time.sleep(0.05)
-        
-        self.results["iterations"] = iteration
+        self.results["per_worker"] = []
+        for slot in range(self.workers):
+            iterations, ops, nbytes, cpu_us, duty_ppm, iteration_ns, kernel_utilization_ppm = (
+                counters[slot * STAT_FIELDS:(slot + 1) * STAT_FIELDS]
+            )
+            worker = {
+                "worker": slot,
+                "iterations": iterations,
+                "iterations_per_sec": iterations / self.duration,
+                "ops_per_sec": ops / self.duration,
+                "bytes_per_sec": nbytes / self.duration,
+                "achieved_utilization": 100 * cpu_us / 1e6 / self.duration,
+                "final_duty_cycle": duty_ppm / 1e6,
+            }
+            if iteration_ns:
+                worker["calibrated_iteration_ms"] = iteration_ns / 1e6
+                worker["calibrated_kernel_utilization"] = kernel_utilization_ppm / 1e4
+            self.results["per_worker"].append(worker)
+        self.results["iterations"] = sum(w["iterations"] for w in self.results["per_worker"])
+        self.results["ops"] = sum(counters[STAT_OPS::STAT_FIELDS])
+        self.results["bytes"] = sum(counters[STAT_BYTES::STAT_FIELDS])
+        self.results["achieved_utilization"] = (
+            sum(w["achieved_utilization"] for w in self.results["per_worker"]) / self.workers
+        )
         self.results["end_time"] = datetime.now().isoformat()
         
         # Calcul des statistiques
@@ -82,33 +319,162 @@ class WorkloadBenchmark:
         
         return self.results
     
+    def _sample(self, start_time, counters):
+        """Un échantillon CPU/mémoire/puissance (appelé par le Monitor)"""
+        cpu_percent = psutil.cpu_percent(interval=None)
+        iterations = sum(counters[STAT_ITERATIONS::STAT_FIELDS])
+        # Charge réellement produite par les workers depuis l'échantillon précédent
+        now, cpu_us = time.monotonic(), sum(counters[STAT_CPU_US::STAT_FIELDS])
+        last_time, last_cpu_us = self._last_load
+        self._last_load = (now, cpu_us)
+        achieved_load = (
+            100 * (cpu_us - last_cpu_us) / 1e6 / (now - last_time) / self.workers
+            if now > last_time else None
+        )
+        duty_cycle = sum(counters[STAT_DUTY_PPM::STAT_FIELDS]) / 1e6 / self.workers
+        mem_info = psutil.virtual_memory()
+        power_watts = self.energy_meter.update(time.monotonic(), cpu_percent)
+        
+        self.cpu_samples.append({
+            "timestamp": time.time() - start_time,
+            "cpu_percent": cpu_percent,
+            "power_watts": power_watts,
+            "iterations": iterations,
+            "achieved_load": achieved_load,
+            "duty_cycle": duty_cycle,
+        })
+        self.memory_samples.append({
+            "timestamp": time.time() - start_time,
+            "memory_mb": mem_info.used / (1024 * 1024),
+            "memory_percent": mem_info.percent
+        })
+        
+        print(f"[WORKLOAD] Iter {iterations} | CPU: {cpu_percent:.1f}% | "
+              f"Charge: {achieved_load or 0:.1f}% (duty {duty_cycle:.2f}) | "
+              f"MEM: {mem_info.percent:.1f}% ({mem_info.used/(1024*1024):.0f}MB)")
+        sys.stdout.flush()
+    
+    def _run_inline(self):
+        """Boucle de charge dans le processus courant (un seul cœur)"""
+        counters = array("q", bytes(8 * STAT_FIELDS))
+        ready = threading.Barrier(2)
+        monitor = Monitor(self, ready, counters, self.sample_interval)
+        monitor.start()
+        try:
+            workload_worker(0, counters, self.workload_type, self.intensity,
+                            ready, self.duration, self.duty_cycle, self._target_fraction())
+        finally:
+            ready.abort()
+            monitor.stop()
+        return list(counters)
+    
+    def _run_parallel(self):
+        """
+        N processus de charge; chacun publie ses itérations dans un compteur
+        en mémoire partagée, que le Monitor du processus parent échantillonne.
+        """
+        ctx = multiprocessing.get_context("spawn")
+        counters = ctx.Array("q", self.workers * STAT_FIELDS, lock=False)
+        # Démarrage synchronisé une fois tous les processus lancés et préparés
+        ready = ctx.Barrier(self.workers + 1)
+        processes = [
+            ctx.Process(
+                target=workload_worker,
+                args=(slot, counters, self.workload_type, self.intensity,
+                      ready, self.duration, self.duty_cycle, self._target_fraction()),
+                name=f"workload-{slot}",
+            )
+            for slot in range(self.workers)
+        ]
+        for process in processes:
+            process.start()
+        
+        monitor = Monitor(self, ready, counters, self.sample_interval)
+        monitor.start()
+        try:
+            join_workers(processes, ready)
+        finally:
+            # Libère le Monitor si un worker est mort avant la barrière
+            ready.abort()
+            monitor.stop()
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+        
+        return list(counters)
+    
+    def _target_fraction(self):
+        return self.target_utilization / 100 if self.target_utilization is not None else None
+    
     def _calculate_stats(self):
         """Calcule les statistiques finales"""
-        if self.results["cpu_samples"]:
-            cpu_values = [s["cpu_percent"] for s in self.results["cpu_samples"]]
-            self.results["metrics"]["cpu_avg"] = sum(cpu_values) / len(cpu_values)
-            self.results["metrics"]["cpu_max"] = max(cpu_values)
-            self.results["metrics"]["cpu_min"] = min(cpu_values)
+        metrics = self.results["metrics"]
+        if len(self.cpu_samples):
+            cpu = describe(self.cpu_samples["cpu_percent"], self.cpu_samples["timestamp"])
+            metrics["cpu_avg"] = cpu["mean"]
+            metrics["cpu_max"] = cpu["max"]
+            metrics["cpu_min"] = cpu["min"]
+            metrics["cpu_stats"] = round_summary(cpu)
+            load = describe(self.cpu_samples["achieved_load"], self.cpu_samples["timestamp"])
+            if load["count"]:
+                metrics["load_stats"] = round_summary(load)
+        
+        if len(self.memory_samples):
+            memory = describe(self.memory_samples["memory_mb"], self.memory_samples["timestamp"])
+            metrics["memory_avg_mb"] = memory["mean"]
+            metrics["memory_max_mb"] = memory["max"]
+            metrics["memory_stats"] = round_summary(memory)
         
-        if self.results["memory_samples"]:
-            mem_values = [s["memory_mb"] for s in self.results["memory_samples"]]
-            self.results["metrics"]["memory_avg_mb"] = sum(mem_values) / len(mem_values)
-            self.results["metrics"]["memory_max_mb"] = max(mem_values)
+        self.results["cpu_samples"] = self.cpu_samples.to_dict()
+        self.results["memory_samples"] = self.memory_samples.to_dict()
         
         # Throughput
         self.results["metrics"]["iterations_per_sec"] = (
             self.results["iterations"] / self.duration
         )
+        self.results["metrics"]["ops_per_sec"] = self.results["ops"] / self.duration
+        self.results["metrics"]["bytes_per_sec"] = self.results["bytes"] / self.duration
+        
+        # Charge obtenue, à comparer à la cible pour des mesures à charge égale
+        metrics["achieved_utilization"] = self.results["achieved_utilization"]
+        if self.target_utilization is not None:
+            metrics["target_utilization"] = self.target_utilization
+            metrics["utilization_error"] = self.results["achieved_utilization"] - self.target_utilization
+        
+        # Énergie intégrée sur les échantillons (trapèzes)
+        self.results["metrics"].update(self.energy_meter.summary())
+        if self.results["iterations"]:
+            self.results["metrics"]["joules_per_iteration"] = (
+                self.results["metrics"]["estimated_energy_joules"] / self.results["iterations"]
+            )
+        if self.results["ops"]:
+            self.results["metrics"]["joules_per_op"] = (
+                self.results["metrics"]["estimated_energy_joules"] / self.results["ops"]
+            )
         
         print("\n" + "="*50)
         print("[WORKLOAD] Résultats du benchmark")
         print("="*50)
         print(f"Itérations totales:     {self.results['iterations']}")
         print(f"Itérations/sec:         {self.results['metrics']['iterations_per_sec']:.2f}")
+        print(f"Opérations/sec:         {self.results['metrics']['ops_per_sec']:.2f}")
+        print(f"Débit:                  {self.results['metrics']['bytes_per_sec'] / (1024 * 1024):.1f} MB/s")
+        if self.workers > 1:
+            for worker in self.results["per_worker"]:
+                print(f"  worker {worker['worker']}:             {worker['iterations_per_sec']:.2f} it/s, "
+                      f"{worker['bytes_per_sec'] / (1024 * 1024):.1f} MB/s")
+        if self.target_utilization is not None:
+            print(f"Charge cible/obtenue:   {self.target_utilization:.0f}% / "
+                  f"{metrics['achieved_utilization']:.1f}%")
+        else:
+            print(f"Charge obtenue:         {metrics['achieved_utilization']:.1f}%")
         print(f"CPU moyen:              {self.results['metrics'].get('cpu_avg', 0):.1f}%")
         print(f"CPU max:                {self.results['metrics'].get('cpu_max', 0):.1f}%")
         print(f"Mémoire moyenne:        {self.results['metrics'].get('memory_avg_mb', 0):.0f} MB")
         print(f"Mémoire max:            {self.results['metrics'].get('memory_max_mb', 0):.0f} MB")
+        print(f"Puissance moyenne:      {self.results['metrics']['estimated_power_watts']:.2f} W "
+              f"({self.results['metrics']['energy_model']['name']})")
+        print(f"Énergie:                {self.results['metrics']['estimated_energy_joules']:.1f} J")
         print("="*50 + "\n")
     
     def save_results(self, output_file="/tmp/workload_results.json"):
@@ -122,14 +488,29 @@ def main():
     # Paramètres par défaut
     duration = int(os.getenv("WORKLOAD_DURATION", "30"))
     intensity = os.getenv("WORKLOAD_INTENSITY", "medium")
+    workload_type = os.getenv("WORKLOAD_TYPE", "crypto")
+    workers = int(os.getenv("WORKLOAD_WORKERS", "1"))
+    duty_cycle = float(os.getenv("WORKLOAD_DUTY_CYCLE", "1.0"))
+    target = os.getenv("WORKLOAD_TARGET_UTILIZATION")
+    target_utilization = float(target) if target else None
+    sample_interval = float(os.getenv("WORKLOAD_SAMPLE_INTERVAL", "1.0"))
     output_file = os.getenv("WORKLOAD_OUTPUT", "/tmp/workload_results.json")
+    energy_model = os.getenv("WORKLOAD_ENERGY_MODEL", "auto")
+    calibration = os.getenv("WORKLOAD_CALIBRATION")
     
     print("="*50)
     print("OptiVolt Workload Benchmark")
     print("="*50)
     print(f"Durée:      {duration}s")
+    print(f"Type:       {workload_type}")
     print(f"Intensité:  {intensity}")
+    print(f"Workers:    {workers}")
+    if target_utilization is not None:
+        print(f"Charge:     {target_utilization:.0f}% (régulée)")
+    else:
+        print(f"Duty cycle: {duty_cycle:.0%}")
     print(f"Output:     {output_file}")
+    print(f"Énergie:    {energy_model}")
     print("="*50 + "\n")
     
     # Informations système
@@ -139,10 +520,13 @@ def main():
     print(f"[INFO] Platform:    {sys.platform}\n")
     
     # Exécution du benchmark
-    benchmark = WorkloadBenchmark(duration_sec=duration, intensity=intensity)
-    
     try:
-        results = benchmark.run_crypto_workload()
+        model = create_model(energy_model, calibration)
+        benchmark = WorkloadBenchmark(duration_sec=duration, intensity=intensity, energy_model=model,
+                                      workers=workers, duty_cycle=duty_cycle,
+                                      sample_interval=sample_interval, workload_type=workload_type,
+                                      target_utilization=target_utilization)
+        results = benchmark.run_workload()
         benchmark.save_results(output_file)
         print("\n✅ [WORKLOAD] Benchmark terminé avec succès")
         return 0
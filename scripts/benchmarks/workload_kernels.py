@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Noyaux de charge pour workload_benchmark.py (WORKLOAD_TYPE)
+
+Chaque noyau prépare ses données dans __init__ (hors mesure) puis exécute
+une itération par appel à run(), qui renvoie (opérations, octets traités).
+Les différences entre plateformes apparaissent surtout sur la mémoire et
+les appels système, d'où les noyaux au-delà du hachage.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import uuid
+from array import array
+from datetime import datetime, timezone
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MB = 1024 * 1024
+
+
+class WorkloadKernel:
+    """Interface: run(iteration) -> (ops, bytes), close()"""
+
+    name = "base"
+    description = ""
+
+    def __init__(self, intensity="medium"):
+        self.intensity = intensity
+
+    def run(self, iteration):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def scale(intensity, light, medium, heavy):
+        return {"light": light, "medium": medium, "heavy": heavy}.get(intensity, medium)
+
+
+class CryptoKernel(WorkloadKernel):
+    name = "crypto"
+    description = "sha256 puis sha512 en chaîne"
+
+    def __init__(self, intensity="medium"):
+        super().__init__(intensity)
+        # Intensité détermine le nombre d'opérations
+        self.ops_per_iteration = self.scale(intensity, 5000, 15000, 50000)
+
+    def run(self, iteration):
+        # Génération de données
+        data = f"optivolt-benchmark-{iteration}-{time.time()}".encode()
+
+        # Calculs cryptographiques
+        for _ in range(self.ops_per_iteration):
+            hash_result = hashlib.sha256(data).hexdigest()
+            hash_result = hashlib.sha512(hash_result.encode()).hexdigest()
+        # sha256(data) puis sha512 de l'empreinte hexadécimale (64 octets)
+        return 2 * self.ops_per_iteration, self.ops_per_iteration * (len(data) + 64)
+
+
+class MemoryBandwidthKernel(WorkloadKernel):
+    name = "memory"
+    description = "copies de grands tampons (bande passante mémoire)"
+
+    def __init__(self, intensity="medium"):
+        super().__init__(intensity)
+        size = self.scale(intensity, 8, 32, 128) * MB
+        self.src = bytearray(os.urandom(MB)) * (size // MB)
+        self.dst = bytearray(size)
+        self.copies = 4
+
+    def run(self, iteration):
+        dst, src = memoryview(self.dst), memoryview(self.src)
+        for _ in range(self.copies):
+            dst[:] = src  # memcpy, sans objet intermédiaire
+        return self.copies, self.copies * len(self.src)
+
+
+class CacheThrashKernel(WorkloadKernel):
+    name = "cache"
+    description = "accès aléatoires dans une table plus grande que le cache"
+
+    def __init__(self, intensity="medium"):
+        super().__init__(intensity)
+        entries = self.scale(intensity, 16, 64, 256) * MB // 8
+        if np is not None:
+            self.table = np.arange(entries, dtype=np.int64)
+            self.rng = np.random.default_rng(0)
+            self.accesses = 1_000_000
+        else:
+            self.table = array("q", range(entries))
+            self.accesses = 100_000
+        self.entries = entries
+
+    def run(self, iteration):
+        if np is not None:
+            indices = self.rng.integers(0, self.entries, self.accesses)
+            int(self.table[indices].sum())
+        else:
+            table, entries = self.table, self.entries
+            index, total = iteration, 0
+            for _ in range(self.accesses):
+                # Générateur congruentiel: pas d'appel à random dans la boucle
+                index = (index * 6364136223846793005 + 1442695040888963407) % entries
+                total += table[index]
+        return self.accesses, self.accesses * 8
+
+
+class FileIOKernel(WorkloadKernel):
+    name = "fileio"
+    description = "petites écritures/lectures pwrite/pread (appels système)"
+
+    BLOCK_SIZE = 4096
+
+    def __init__(self, intensity="medium"):
+        super().__init__(intensity)
+        self.blocks = self.scale(intensity, 256, 1024, 4096)
+        self.fd, self.path = tempfile.mkstemp(prefix="optivolt-workload-")
+        self.block = os.urandom(self.BLOCK_SIZE)
+
+    def run(self, iteration):
+        fd, block, size = self.fd, self.block, self.BLOCK_SIZE
+        for i in range(self.blocks):
+            os.pwrite(fd, block, i * size)
+        for i in range(self.blocks):
+            os.pread(fd, size, i * size)
+        os.fstat(fd)
+        return 2 * self.blocks + 1, 2 * self.blocks * size
+
+    def close(self):
+        os.close(self.fd)
+        os.unlink(self.path)
+
+
+class JsonKernel(WorkloadKernel):
+    name = "json"
+    description = "sérialisation/désérialisation JSON (profil web_api)"
+
+    # web_api/app/helpers.py: PAYLOAD_BASE
+    PAYLOAD_BASE = ("You may say I'm a dreamer, But I'm not the only one, "
+                    "I hope someday you'll join us, And the world will be as one")
+
+    def __init__(self, intensity="medium"):
+        super().__init__(intensity)
+        self.documents = self.scale(intensity, 20, 50, 200)
+        self.size_kb = 8
+        self.payload = self.PAYLOAD_BASE * (self.size_kb * 1024 // len(self.PAYLOAD_BASE))
+
+    def run(self, iteration):
+        total = 0
+        for _ in range(self.documents):
+            # Même forme que la réponse de GET /simulate/heavy de web_api:
+            # journal generate_log (call_id, timestamp, type) + response.payload
+            document = {
+                "call_id": str(uuid.uuid4()),
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                "type": "GET",
+                "response_size_kb": self.size_kb,
+                "response": {"payload": self.payload},
+            }
+            encoded = json.dumps(document)
+            json.loads(encoded)
+            total += len(encoded)
+        return 2 * self.documents, 2 * total
+
+
+KERNELS = {
+    kernel.name: kernel
+    for kernel in (CryptoKernel, MemoryBandwidthKernel, CacheThrashKernel, FileIOKernel, JsonKernel)
+}
+
+
+def create_kernel(name, intensity="medium"):
+    try:
+        return KERNELS[name](intensity)
+    except KeyError:
+        raise ValueError(f"type de charge inconnu: {name} (choix: {', '.join(KERNELS)})") from None
@@ -4,47 +4,318 @@ Collecteur de métriques d'énergie et de performance
 Alternative à Scaphandre pour environnements sans RAPL
 """
 
+import argparse
 import json
+import math
+import os
 import psutil
 import time
 import sys
 from datetime import datetime
 
-def collect_metrics(duration=10, interval=1):
-    """Collecte les métriques pendant une durée donnée"""
+from energy_model import EnergyMeter, create_model
+from sample_stats import SampleColumns, describe, round_summary
+
+# Champs numériques des échantillons résumés dans summary["stats"]
+STAT_FIELDS = (
+    "cpu_percent",
+    "memory_percent",
+    "memory_used_mb",
+    "memory_available_mb",
+    "power_watts",
+)
+# Colonnes conservées en mémoire hors mode --stream
+COLUMN_FIELDS = ("elapsed_s", "cpu_count") + STAT_FIELDS + (
+    "disk_read_mb",
+    "disk_write_mb",
+    "net_sent_mb",
+    "net_recv_mb",
+)
+# Colonnes par cible (--pid / --cgroup), sous samples["targets"][nom]
+TARGET_FIELDS = ("cpu_percent", "memory_mb", "io_read_mb", "io_write_mb")
+
+
+class RunningStats:
+    """Min/max/moyenne/variance en O(1) mémoire (algorithme de Welford)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 4),
+            "stddev": round(math.sqrt(self.variance), 4),
+            "min": round(self.min, 4),
+            "max": round(self.max, 4),
+        }
+
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+MB = 1024 * 1024
+
+
+class _CachedFiles:
+    """Fichiers /proc ou /sys ouverts une fois, relus par pread à chaque tick"""
+
+    def __init__(self, directory, names):
+        self.fds = {}
+        for name in names:
+            try:
+                self.fds[name] = os.open(os.path.join(directory, name), os.O_RDONLY)
+            except OSError:
+                pass  # fichier absent ou non lisible (ex. /proc/<pid>/io)
+
+    def read(self, name):
+        fd = self.fds.get(name)
+        return os.pread(fd, 65536, 0) if fd is not None else None
+
+    def close(self):
+        for fd in self.fds.values():
+            os.close(fd)
+        self.fds.clear()
+
+
+class CgroupTarget:
+    """Conteneur / VM suivi via les fichiers cgroup v2 (cpu.stat, memory.current, io.stat)"""
+
+    def __init__(self, path):
+        if not os.path.isabs(path):
+            path = os.path.join(CGROUP_ROOT, path)
+        if not os.path.isfile(os.path.join(path, "cgroup.procs")):
+            raise ValueError(f"cgroup v2 introuvable: {path}")
+        self.name = f"cgroup:{path}"
+        self.files = _CachedFiles(path, ("cpu.stat", "memory.current", "io.stat"))
+
+    def read(self):
+        """(cpu_seconds, memory_bytes, io_read_bytes, io_write_bytes)"""
+        cpu_seconds = memory = read_bytes = write_bytes = None
+        data = self.files.read("cpu.stat")
+        if data:
+            for line in data.splitlines():
+                key, value = line.split()
+                if key == b"usage_usec":
+                    cpu_seconds = int(value) / 1e6
+                    break
+        data = self.files.read("memory.current")
+        if data:
+            memory = int(data)
+        data = self.files.read("io.stat")
+        if data is not None:
+            read_bytes = write_bytes = 0
+            # Une ligne par périphérique: "8:0 rbytes=... wbytes=... rios=..."
+            for line in data.splitlines():
+                for field in line.split()[1:]:
+                    key, _, value = field.partition(b"=")
+                    if key == b"rbytes":
+                        read_bytes += int(value)
+                    elif key == b"wbytes":
+                        write_bytes += int(value)
+        return cpu_seconds, memory, read_bytes, write_bytes
+
+    def close(self):
+        self.files.close()
+
+
+class PidTarget:
+    """Processus suivi via /proc/<pid>/stat, statm et io (ex. VMM Firecracker)"""
+
+    CLK_TCK = os.sysconf("SC_CLK_TCK")
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+    def __init__(self, pid):
+        directory = f"/proc/{int(pid)}"
+        if not os.path.isdir(directory):
+            raise ValueError(f"processus introuvable: {pid}")
+        self.name = f"pid:{pid}"
+        self.files = _CachedFiles(directory, ("stat", "statm", "io"))
+
+    def read(self):
+        """(cpu_seconds, memory_bytes, io_read_bytes, io_write_bytes)"""
+        cpu_seconds = memory = read_bytes = write_bytes = None
+        data = self.files.read("stat")
+        if data:
+            # Le nom du processus peut contenir des espaces: découper après ")"
+            fields = data.rsplit(b")", 1)[1].split()
+            cpu_seconds = (int(fields[11]) + int(fields[12])) / self.CLK_TCK
+        data = self.files.read("statm")
+        if data:
+            memory = int(data.split()[1]) * self.PAGE_SIZE
+        data = self.files.read("io")
+        if data:
+            for line in data.splitlines():
+                key, _, value = line.partition(b":")
+                if key == b"read_bytes":
+                    read_bytes = int(value)
+                elif key == b"write_bytes":
+                    write_bytes = int(value)
+        return cpu_seconds, memory, read_bytes, write_bytes
+
+    def close(self):
+        self.files.close()
+
+
+class TargetSampler:
+    """Métriques par cible: CPU (% d'un cœur), mémoire et IO cumulées depuis le début"""
+
+    def __init__(self, target):
+        self.target = target
+        self.alive = True
+        self.last_time = time.monotonic()
+        self.initial = self.target.read()
+        self.last_cpu = self.initial[0]
+        self.cpu_stats = RunningStats()
+        self.memory_stats = RunningStats()
+        self.last_sample = {}
+
+    def sample(self, now):
+        if not self.alive:
+            return None
+        try:
+            cpu_seconds, memory, read_bytes, write_bytes = self.target.read()
+        except (OSError, ValueError, IndexError):
+            # Processus terminé (ESRCH) ou cgroup supprimé
+            self.alive = False
+            self.target.close()
+            return None
+        sample = {}
+        if cpu_seconds is not None and self.last_cpu is not None and now > self.last_time:
+            sample["cpu_percent"] = 100 * (cpu_seconds - self.last_cpu) / (now - self.last_time)
+            self.cpu_stats.update(sample["cpu_percent"])
+        self.last_cpu, self.last_time = cpu_seconds, now
+        if memory is not None:
+            sample["memory_mb"] = memory / MB
+            self.memory_stats.update(sample["memory_mb"])
+        if read_bytes is not None and self.initial[2] is not None:
+            sample["io_read_mb"] = (read_bytes - self.initial[2]) / MB
+        if write_bytes is not None and self.initial[3] is not None:
+            sample["io_write_mb"] = (write_bytes - self.initial[3]) / MB
+        self.last_sample = sample
+        return sample
+
+    def summary(self):
+        summary = {
+            "alive": self.alive,
+            "cpu_percent": self.cpu_stats.to_dict(),
+            "memory_mb": self.memory_stats.to_dict(),
+        }
+        for key in ("io_read_mb", "io_write_mb"):
+            if key in self.last_sample:
+                summary[f"total_{key}"] = self.last_sample[key]
+        return summary
+
+    def close(self):
+        if self.alive:
+            self.target.close()
+
+
+def build_targets(pids=(), cgroups=()):
+    return [PidTarget(pid) for pid in pids] + [CgroupTarget(path) for path in cgroups]
+
+
+def collect_metrics(duration=10, interval=1, stream_file=None, targets=(), energy_model=None):
+    """Collecte les métriques pendant une durée donnée
+
+    Les échantillons sont gardés en colonnes (voir sample_stats.py) et
+    résumés en une passe vectorisée; samples contient une liste par champ
+    (timestamp ISO compris) et, par cible, une liste par champ de cible. Avec `stream_file`, chaque échantillon
+    est plutôt ajouté en NDJSON (une ligne JSON par échantillon) et résumé
+    au fil de l'eau: la mémoire reste constante quelle que soit la durée.
+
+    `targets` (PidTarget / CgroupTarget) ajoute à chaque échantillon les
+    métriques propres à chaque processus ou conteneur, sous "targets".
+
+    `energy_model` (voir energy_model.py, modèle linéaire par défaut) donne
+    la puissance de chaque échantillon; l'énergie est intégrée par trapèzes.
+    """
     
     print(f"📊 Collecte des métriques pendant {duration}s...")
     
     metrics = {
         "timestamp": datetime.now().isoformat(),
         "duration_seconds": duration,
-        "samples": [],
         "summary": {}
     }
+    if stream_file:
+        metrics["samples_file"] = stream_file
+    stream = open(stream_file, "a", encoding="utf-8") if stream_file else None
+    running = {field: RunningStats() for field in STAT_FIELDS} if stream else None
+    columns = None if stream else SampleColumns(COLUMN_FIELDS)
+    timestamps = []
+    last_sample = None
     
-    start_time = time.time()
     sample_count = 0
-    
-    # Métriques cumulatives
-    cpu_total = 0
-    memory_total = 0
-    disk_io_read = 0
-    disk_io_write = 0
-    net_io_sent = 0
-    net_io_recv = 0
+    missed_ticks = 0
+    cpu_count = psutil.cpu_count()
     
     # Métriques initiales pour le delta
     disk_io_initial = psutil.disk_io_counters()
     net_io_initial = psutil.net_io_counters()
+    samplers = [TargetSampler(target) for target in targets]
+    target_columns = None if stream else {
+        sampler.target.name: SampleColumns(TARGET_FIELDS) for sampler in samplers
+    }
+    meter = EnergyMeter(energy_model or create_model("linear"))
+    per_cpu = meter.model.needs_per_cpu
+    per_cpu_freq = per_cpu and getattr(meter.model, "max_freq_mhz", None)
+    # Amorce: cpu_percent(interval=None) mesure ensuite depuis l'appel précédent
+    psutil.cpu_percent(interval=None, percpu=per_cpu)
     
-    while time.time() - start_time < duration:
+    # Échéances absolues (start + n * interval) sur l'horloge monotone: le
+    # temps passé à lire les compteurs ne décale pas les ticks suivants
+    start_time = time.monotonic()
+    start_cpu = time.process_time()
+    meter.start(start_time)
+    end_time = start_time + duration
+    tick = 1
+    # Au moins un échantillon, pris en fin de collecte si duration < interval
+    deadline = start_time + min(interval, duration)
+    
+    while deadline <= end_time:
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        
+        now = time.monotonic()
+        memory = psutil.virtual_memory()
+        if per_cpu:
+            per_cpu_percent = psutil.cpu_percent(interval=None, percpu=True)
+            cpu_percent = sum(per_cpu_percent) / len(per_cpu_percent)
+        else:
+            per_cpu_percent = None
+            cpu_percent = psutil.cpu_percent(interval=None)
+        freqs = [f.current for f in psutil.cpu_freq(percpu=True)] if per_cpu_freq else None
+        power_watts = meter.update(now, cpu_percent, per_cpu_percent, freqs)
+        
         sample = {
             "timestamp": datetime.now().isoformat(),
-            "cpu_percent": psutil.cpu_percent(interval=interval),
-            "cpu_count": psutil.cpu_count(),
-            "memory_percent": psutil.virtual_memory().percent,
-            "memory_used_mb": psutil.virtual_memory().used / (1024 * 1024),
-            "memory_available_mb": psutil.virtual_memory().available / (1024 * 1024),
+            "elapsed_s": round(now - start_time, 6),
+            "cpu_percent": cpu_percent,
+            "cpu_count": cpu_count,
+            "memory_percent": memory.percent,
+            "memory_used_mb": memory.used / (1024 * 1024),
+            "memory_available_mb": memory.available / (1024 * 1024),
+            "power_watts": power_watts,
         }
         
         # IO stats
@@ -64,58 +335,149 @@ def collect_metrics(duration=10, interval=1):
             sample["net_sent_mb"] = 0
             sample["net_recv_mb"] = 0
         
-        metrics["samples"].append(sample)
+        if samplers:
+            now = time.monotonic()
+            sample["targets"] = {
+                sampler.target.name: sampler.sample(now) for sampler in samplers
+            }
         
-        # Cumul pour moyennes
-        cpu_total += sample["cpu_percent"]
-        memory_total += sample["memory_percent"]
+        if stream:
+            stream.write(json.dumps(sample) + "\n")
+            # Statistiques glissantes (pas de re-parcours des échantillons)
+            for field, field_stats in running.items():
+                if sample[field] is not None:
+                    field_stats.update(sample[field])
+        else:
+            columns.append(sample)
+            timestamps.append(sample["timestamp"])
+            for name, target_sample in sample.get("targets", {}).items():
+                # Cible terminée: None -> NaN, les colonnes restent alignées
+                target_columns[name].append(target_sample or {})
+        last_sample = sample
         sample_count += 1
         
-        time.sleep(max(0, interval - (time.time() - start_time) % interval))
+        # Prochaine échéance; si on est en retard, on saute les ticks manqués
+        # au lieu d'enchaîner des échantillons en rafale
+        tick += 1
+        now = time.monotonic()
+        if start_time + tick * interval < now:
+            behind = int((now - start_time) / interval) + 1
+            missed_ticks += behind - tick
+            tick = behind
+        deadline = start_time + tick * interval
+    
+    elapsed = time.monotonic() - start_time
+    for sampler in samplers:
+        sampler.close()
+    overhead_cpu = time.process_time() - start_cpu
+    metrics["sampler"] = {
+        "requested_interval_s": interval,
+        "requested_rate_hz": round(1 / interval, 3),
+        "achieved_rate_hz": round(sample_count / elapsed, 3) if elapsed > 0 else 0.0,
+        "missed_ticks": missed_ticks,
+        "overhead_cpu_seconds": round(overhead_cpu, 4),
+        "overhead_cpu_percent": round(100 * overhead_cpu / elapsed, 3) if elapsed > 0 else 0.0,
+    }
+    
+    if stream:
+        stream.close()
     
     # Calculer les résumés
     if sample_count > 0:
+        if stream:
+            stats = {field: field_stats.to_dict() for field, field_stats in running.items()}
+        else:
+            elapsed_column = columns["elapsed_s"]
+            stats = {
+                field: round_summary(describe(columns[field], elapsed_column))
+                for field in STAT_FIELDS
+            }
+            metrics["samples"] = {"timestamp": timestamps, **columns.to_dict()}
+            if samplers:
+                metrics["samples"]["targets"] = {
+                    name: target_series.to_dict() for name, target_series in target_columns.items()
+                }
         metrics["summary"] = {
-            "avg_cpu_percent": cpu_total / sample_count,
-            "avg_memory_percent": memory_total / sample_count,
-            "max_cpu_percent": max(s["cpu_percent"] for s in metrics["samples"]),
-            "max_memory_percent": max(s["memory_percent"] for s in metrics["samples"]),
-            "total_disk_read_mb": metrics["samples"][-1]["disk_read_mb"],
-            "total_disk_write_mb": metrics["samples"][-1]["disk_write_mb"],
-            "total_net_sent_mb": metrics["samples"][-1]["net_sent_mb"],
-            "total_net_recv_mb": metrics["samples"][-1]["net_recv_mb"],
+            "avg_cpu_percent": stats["cpu_percent"]["mean"],
+            "avg_memory_percent": stats["memory_percent"]["mean"],
+            "max_cpu_percent": stats["cpu_percent"]["max"],
+            "max_memory_percent": stats["memory_percent"]["max"],
+            "total_disk_read_mb": last_sample["disk_read_mb"],
+            "total_disk_write_mb": last_sample["disk_write_mb"],
+            "total_net_sent_mb": last_sample["net_sent_mb"],
+            "total_net_recv_mb": last_sample["net_recv_mb"],
             "sample_count": sample_count,
+            "stats": stats,
         }
+        if samplers:
+            metrics["summary"]["targets"] = {
+                sampler.target.name: sampler.summary() for sampler in samplers
+            }
         
-        # Estimation d'énergie basée sur le CPU (très approximatif)
-        # TDP moyen d'un CPU ~65W, utilisation proportionnelle
-        tdp_watts = 65
-        avg_cpu_fraction = metrics["summary"]["avg_cpu_percent"] / 100
-        estimated_power_watts = tdp_watts * avg_cpu_fraction
-        estimated_energy_joules = estimated_power_watts * duration
-        
-        metrics["summary"]["estimated_power_watts"] = round(estimated_power_watts, 2)
-        metrics["summary"]["estimated_energy_joules"] = round(estimated_energy_joules, 2)
-        metrics["summary"]["estimated_energy_wh"] = round(estimated_energy_joules / 3600, 4)
+        # Énergie intégrée échantillon par échantillon (trapèzes)
+        metrics["summary"].update(meter.summary())
     
     return metrics
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Collecteur de métriques OptiVolt")
+    parser.add_argument("duration", nargs="?", type=float, default=10, help="Durée en secondes")
+    parser.add_argument("output", nargs="?", default="metrics.json", help="Fichier JSON de sortie")
+    parser.add_argument("--interval", type=float, default=1,
+                        help="Intervalle d'échantillonnage en secondes (ex. 0.02 pour 50 Hz)")
+    parser.add_argument("--stream", metavar="SAMPLES.ndjson",
+                        help="Écrit les échantillons en NDJSON au fil de l'eau (mémoire constante)")
+    parser.add_argument("--pid", type=int, action="append", default=[],
+                        help="PID à suivre (ex. VMM Firecracker), répétable")
+    parser.add_argument("--cgroup", action="append", default=[],
+                        help="cgroup v2 à suivre, absolu ou relatif à /sys/fs/cgroup "
+                             "(ex. system.slice/docker-<id>.scope), répétable")
+    parser.add_argument("--energy-model", choices=("auto", "rapl", "linear", "table"), default="auto",
+                        help="Backend d'énergie (auto: RAPL si disponible, sinon table ou linéaire)")
+    parser.add_argument("--calibration", metavar="FILE.json",
+                        help="Table de calibration pour le modèle table (voir energy_model.py)")
+    parser.add_argument("--tdp", type=float, default=65, help="TDP (W) du modèle linéaire")
+    args = parser.parse_args(argv)
+    if args.interval <= 0:
+        parser.error("--interval doit être > 0")
+    if args.duration < 0:
+        parser.error("duration doit être >= 0")
+    return args
+
+
 def main():
-    duration = int(sys.argv[1]) if len(sys.argv) > 1 else 10
-    output_file = sys.argv[2] if len(sys.argv) > 2 else "metrics.json"
+    args = parse_args()
+    output_file = args.output
     
     try:
-        metrics = collect_metrics(duration)
+        targets = build_targets(args.pid, args.cgroup)
+        model = create_model(args.energy_model, args.calibration, tdp_watts=args.tdp)
+        metrics = collect_metrics(args.duration, args.interval, stream_file=args.stream,
+                                  targets=targets, energy_model=model)
         
         with open(output_file, 'w') as f:
-            json.dump(metrics, f, indent=2)
+            json.dump(metrics, f, indent=None if args.stream else 2)
         
         print(f"\n✅ Métriques sauvegardées: {output_file}")
+        if args.stream:
+            print(f"   Échantillons: {args.stream}")
         print(f"\n📊 Résumé:")
         print(f"   CPU moyen: {metrics['summary']['avg_cpu_percent']:.1f}%")
         print(f"   Mémoire moyenne: {metrics['summary']['avg_memory_percent']:.1f}%")
-        print(f"   Puissance estimée: {metrics['summary']['estimated_power_watts']:.2f}W")
+        print(f"   Puissance estimée: {metrics['summary']['estimated_power_watts']:.2f}W "
+              f"(pic {metrics['summary']['peak_power_watts']:.2f}W, "
+              f"modèle {metrics['summary']['energy_model']['name']})")
         print(f"   Énergie estimée: {metrics['summary']['estimated_energy_wh']:.4f} Wh")
+        sampler = metrics["sampler"]
+        print(f"   Échantillonnage: {sampler['achieved_rate_hz']:.1f} Hz "
+              f"(demandé {sampler['requested_rate_hz']:.1f} Hz, "
+              f"{sampler['missed_ticks']} ticks manqués, "
+              f"surcoût CPU {sampler['overhead_cpu_percent']:.2f}%)")
+        for name, target in metrics["summary"].get("targets", {}).items():
+            cpu = target["cpu_percent"].get("mean", 0.0)
+            memory = target["memory_mb"].get("max", 0.0)
+            print(f"   {name}: CPU moyen {cpu:.1f}%, mémoire max {memory:.1f} MB"
+                  + ("" if target["alive"] else " (terminé)"))
         
         return 0
     except KeyboardInterrupt:
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Modèles d'énergie OptiVolt
+Remplace l'estimation fixe "65 W x CPU moyen" par des backends interchangeables:
+
+- rapl:   compteurs matériels /sys/class/powercap (Intel/AMD), mesure réelle
+- linear: modèle linéaire par cœur, utilisation pondérée par la fréquence
+- table:  table (utilisation % -> watts) calibrée à vide et en pleine charge
+
+Chaque échantillon donne une puissance instantanée; l'énergie est intégrée
+échantillon par échantillon (méthode des trapèzes), pas sur la moyenne.
+EnergyMeter.start() ancre l'intégration au début de la mesure: l'intervalle
+avant le premier échantillon est compté avec la première puissance lue.
+
+Calibration d'une table sur une machine avec RAPL:
+    python3 energy_model.py calibrate calibration.json
+"""
+
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+POWERCAP_ROOT = "/sys/class/powercap"
+
+# Valeurs par défaut du modèle linéaire (ancienne estimation: TDP 65 W)
+DEFAULT_TDP_WATTS = 65.0
+DEFAULT_IDLE_FRACTION = 0.1
+
+
+class EnergyIntegrator:
+    """Intègre des échantillons (t, watts) par la méthode des trapèzes"""
+
+    def __init__(self):
+        self.joules = 0.0
+        self.peak_watts = 0.0
+        self.start_time = None
+        self.first_time = None
+        self.last_time = None
+        self.last_watts = None
+
+    def start(self, t):
+        """Début de la mesure, antérieur au premier échantillon"""
+        self.start_time = t
+
+    def add(self, t, watts):
+        if self.last_time is not None:
+            self.joules += (t - self.last_time) * (watts + self.last_watts) / 2
+        elif self.start_time is not None and t > self.start_time:
+            # Premier échantillon: il couvre l'intervalle depuis start()
+            self.joules += (t - self.start_time) * watts
+            self.first_time = self.start_time
+        else:
+            self.first_time = t
+        self.last_time, self.last_watts = t, watts
+        self.peak_watts = max(self.peak_watts, watts)
+
+    def finish(self, t):
+        """Prolonge la dernière puissance lue jusqu'à la fin de la mesure"""
+        if self.last_time is not None and t > self.last_time:
+            self.joules += (t - self.last_time) * self.last_watts
+            self.last_time = t
+
+    @property
+    def elapsed(self):
+        return self.last_time - self.first_time if self.last_time is not None else 0.0
+
+    @property
+    def average_watts(self):
+        return self.joules / self.elapsed if self.elapsed > 0 else (self.last_watts or 0.0)
+
+
+class EnergyModel:
+    """Interface commune: power(t, cpu_percent, per_cpu, freqs) -> watts ou None"""
+
+    name = "base"
+    # Le modèle a-t-il besoin de l'utilisation et de la fréquence par cœur ?
+    needs_per_cpu = False
+
+    def power(self, t, cpu_percent, per_cpu_percent=None, per_cpu_freq_mhz=None):
+        raise NotImplementedError
+
+    def prime(self, t):
+        """Lecture de départ pour les modèles à compteurs (RAPL); rien par défaut"""
+
+    def describe(self):
+        return {"name": self.name}
+
+
+class RaplModel(EnergyModel):
+    """Compteurs RAPL (energy_uj) des domaines package, avec gestion du débordement"""
+
+    name = "rapl"
+
+    def __init__(self, root=POWERCAP_ROOT):
+        # Domaines de premier niveau seulement ("intel-rapl:0", pas
+        # "intel-rapl:0:0") pour ne pas compter deux fois core/dram
+        self.zones = []
+        for zone in sorted(glob.glob(os.path.join(root, "intel-rapl:*"))):
+            if os.path.basename(zone).count(":") != 1:
+                continue
+            try:
+                with open(os.path.join(zone, "max_energy_range_uj")) as f:
+                    max_range = int(f.read())
+                fd = os.open(os.path.join(zone, "energy_uj"), os.O_RDONLY)
+            except (OSError, ValueError):
+                continue  # energy_uj est souvent réservé à root
+            self.zones.append((fd, max_range))
+        if not self.zones:
+            raise OSError(f"aucun domaine RAPL lisible sous {root}")
+        self.last_time = None
+        self.last_counters = None
+
+    @classmethod
+    def available(cls, root=POWERCAP_ROOT):
+        try:
+            cls(root).close()
+            return True
+        except OSError:
+            return False
+
+    def _read_counters(self):
+        return [int(os.pread(fd, 64, 0)) for fd, _ in self.zones]
+
+    def power(self, t, cpu_percent=None, per_cpu_percent=None, per_cpu_freq_mhz=None):
+        counters = self._read_counters()
+        watts = None
+        if self.last_counters is not None and t > self.last_time:
+            microjoules = 0
+            for (_, max_range), now, before in zip(self.zones, counters, self.last_counters):
+                delta = now - before
+                if delta < 0:  # le compteur a débordé
+                    delta += max_range
+                microjoules += delta
+            watts = microjoules / 1e6 / (t - self.last_time)
+        self.last_time, self.last_counters = t, counters
+        return watts
+
+    def prime(self, t):
+        self.power(t)
+
+    def describe(self):
+        return {"name": self.name, "zones": len(self.zones)}
+
+    def close(self):
+        for fd, _ in self.zones:
+            os.close(fd)
+        self.zones = []
+
+
+class LinearCoreModel(EnergyModel):
+    """P = Σ cœurs [idle + (max - idle) x utilisation x fréquence / fréquence max]"""
+
+    name = "linear"
+    needs_per_cpu = True
+
+    def __init__(self, tdp_watts=DEFAULT_TDP_WATTS, idle_fraction=DEFAULT_IDLE_FRACTION,
+                 cpu_count=None, max_freq_mhz=None):
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.core_max_watts = tdp_watts / self.cpu_count
+        self.core_idle_watts = self.core_max_watts * idle_fraction
+        self.max_freq_mhz = max_freq_mhz
+        self.tdp_watts = tdp_watts
+
+    def power(self, t, cpu_percent, per_cpu_percent=None, per_cpu_freq_mhz=None):
+        if not per_cpu_percent:
+            per_cpu_percent = [cpu_percent] * self.cpu_count
+        dynamic = self.core_max_watts - self.core_idle_watts
+        watts = self.core_idle_watts * len(per_cpu_percent)
+        for i, percent in enumerate(per_cpu_percent):
+            scale = 1.0
+            if per_cpu_freq_mhz and self.max_freq_mhz:
+                freq = per_cpu_freq_mhz[min(i, len(per_cpu_freq_mhz) - 1)]
+                scale = min(freq / self.max_freq_mhz, 1.0)
+            watts += dynamic * percent / 100 * scale
+        return watts
+
+    def describe(self):
+        return {
+            "name": self.name,
+            "tdp_watts": self.tdp_watts,
+            "core_idle_watts": round(self.core_idle_watts, 3),
+            "max_freq_mhz": self.max_freq_mhz,
+        }
+
+
+class TableModel(EnergyModel):
+    """Interpolation linéaire dans une table (utilisation % -> watts)"""
+
+    name = "table"
+
+    def __init__(self, points):
+        self.points = sorted((float(u), float(w)) for u, w in points)
+        if len(self.points) < 2:
+            raise ValueError("la table doit contenir au moins 2 points (ex. 0% et 100%)")
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            return cls(json.load(f)["points"])
+
+    def power(self, t, cpu_percent, per_cpu_percent=None, per_cpu_freq_mhz=None):
+        points = self.points
+        if cpu_percent <= points[0][0]:
+            return points[0][1]
+        for (u0, w0), (u1, w1) in zip(points, points[1:]):
+            if cpu_percent <= u1:
+                return w0 + (w1 - w0) * (cpu_percent - u0) / (u1 - u0)
+        return points[-1][1]
+
+    def describe(self):
+        return {"name": self.name, "points": self.points}
+
+
+def create_model(kind="auto", calibration=None, tdp_watts=DEFAULT_TDP_WATTS):
+    """
+    Instancie un modèle: "rapl", "linear", "table" ou "auto"
+    (RAPL si lisible, sinon la table si un fichier de calibration est fourni,
+    sinon le modèle linéaire).
+    """
+    if kind == "auto":
+        if RaplModel.available():
+            return RaplModel()
+        kind = "table" if calibration else "linear"
+    if kind == "rapl":
+        return RaplModel()
+    if kind == "table":
+        if not calibration:
+            raise ValueError("le modèle table nécessite un fichier de calibration")
+        return TableModel.from_file(calibration)
+    if kind == "linear":
+        return LinearCoreModel(tdp_watts=tdp_watts, max_freq_mhz=_max_freq_mhz())
+    raise ValueError(f"modèle d'énergie inconnu: {kind}")
+
+
+def _max_freq_mhz():
+    try:
+        import psutil
+        freq = psutil.cpu_freq()
+        return freq.max if freq and freq.max else None
+    except (ImportError, NotImplementedError, OSError):
+        return None
+
+
+class EnergyMeter:
+    """Associe un modèle et un intégrateur: update() à chaque échantillon"""
+
+    def __init__(self, model):
+        self.model = model
+        self.integrator = EnergyIntegrator()
+
+    def start(self, t):
+        """À appeler au début de la mesure: amorce le modèle et ancre l'intégration"""
+        self.model.prime(t)
+        self.integrator.start(t)
+
+    def finish(self, t):
+        """À appeler à la fin de la mesure si le dernier échantillon la précède"""
+        self.integrator.finish(t)
+
+    def update(self, t, cpu_percent, per_cpu_percent=None, per_cpu_freq_mhz=None):
+        """Ajoute un échantillon; renvoie la puissance estimée (W) ou None"""
+        watts = self.model.power(t, cpu_percent, per_cpu_percent, per_cpu_freq_mhz)
+        if watts is not None:
+            self.integrator.add(t, watts)
+        return watts
+
+    def summary(self):
+        integrator = self.integrator
+        return {
+            "energy_model": self.model.describe(),
+            "estimated_power_watts": round(integrator.average_watts, 2),
+            "peak_power_watts": round(integrator.peak_watts, 2),
+            "estimated_energy_joules": round(integrator.joules, 2),
+            "estimated_energy_wh": round(integrator.joules / 3600, 4),
+        }
+
+
+def _spin(stop_at):
+    while time.time() < stop_at:
+        pass
+
+
+def _measure_rapl(rapl, seconds):
+    rapl.prime(time.monotonic())
+    time.sleep(seconds)
+    return rapl.power(time.monotonic())
+
+
+def calibrate(output_file, seconds=5):
+    """Mesure la puissance RAPL à vide puis en pleine charge et écrit la table"""
+    rapl = RaplModel()
+    print(f"⏳ Mesure à vide ({seconds}s)...")
+    idle = _measure_rapl(rapl, seconds)
+
+    print(f"⏳ Mesure en pleine charge ({seconds}s, {os.cpu_count()} processus)...")
+    ctx = multiprocessing.get_context("spawn")
+    stop_at = time.time() + seconds + 1
+    workers = [ctx.Process(target=_spin, args=(stop_at,)) for _ in range(os.cpu_count() or 1)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.5)  # laisser les processus démarrer
+    full = _measure_rapl(rapl, seconds)
+    for worker in workers:
+        worker.join()
+    rapl.close()
+
+    table = {"points": [[0, round(idle, 3)], [100, round(full, 3)]]}
+    with open(output_file, "w") as f:
+        json.dump(table, f, indent=2)
+    print(f"✅ Calibration: {idle:.1f} W à vide, {full:.1f} W en charge -> {output_file}")
+    return table
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] != "calibrate":
+        print("Usage: energy_model.py calibrate <calibration.json> [secondes]")
+        return 1
+    try:
+        calibrate(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 5)
+        return 0
+    except OSError as e:
+        print(f"❌ Erreur: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Statistiques vectorisées sur des échantillons en colonnes
+Partagé par collect_system_metrics.py et workload_benchmark.py
+
+Les échantillons sont stockés par colonne (tableaux NumPy préalloués, ou
+array('d') si NumPy est absent) plutôt qu'en listes de dictionnaires: les
+résumés (moyenne, écart-type, percentiles, min/max, tendance) se calculent
+en quelques opérations vectorisées, même sur des heures de mesures à 10 Hz.
+"""
+
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # repli sans dépendance
+    np = None
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+
+class SampleColumns:
+    """Colonnes numériques de même longueur; les valeurs manquantes sont NaN"""
+
+    def __init__(self, names, capacity=1024):
+        self.names = tuple(names)
+        self.size = 0
+        if np is not None:
+            self._data = {name: np.empty(capacity) for name in self.names}
+        else:
+            self._data = {name: array("d") for name in self.names}
+
+    def append(self, row):
+        """Ajoute une ligne (dict); les colonnes absentes ou None valent NaN"""
+        if np is not None:
+            if self.size == len(self._data[self.names[0]]):
+                for name, column in self._data.items():
+                    grown = np.empty(max(2 * len(column), 16))
+                    grown[:self.size] = column[:self.size]
+                    self._data[name] = grown
+            for name in self.names:
+                value = row.get(name)
+                self._data[name][self.size] = math.nan if value is None else value
+        else:
+            for name in self.names:
+                value = row.get(name)
+                self._data[name].append(math.nan if value is None else value)
+        self.size += 1
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, name):
+        """Vue sur la colonne (sans copie)"""
+        column = self._data[name]
+        return column[:self.size] if np is not None else column
+
+    def to_dict(self):
+        """Colonnes en listes JSON (NaN -> None)"""
+        return {
+            name: [None if v != v else v for v in self[name].tolist()]
+            for name in self.names
+        }
+
+
+def describe(values, times=None, percentiles=DEFAULT_PERCENTILES):
+    """
+    Résumé d'une colonne: count, mean, stddev (échantillon), min, max,
+    percentiles (pXX) et trend (pente des moindres carrés par unité de
+    `times`, ou par échantillon si `times` est absent). NaN est ignoré.
+    """
+    if np is not None:
+        return _describe_numpy(values, times, percentiles)
+    return _describe_python(values, times, percentiles)
+
+
+def _describe_numpy(values, times, percentiles):
+    values = np.asarray(values, dtype=float)
+    x = np.arange(len(values), dtype=float) if times is None else np.asarray(times, dtype=float)
+    valid = ~np.isnan(values)
+    if not valid.all():
+        values, x = values[valid], x[valid]
+    count = len(values)
+    if count == 0:
+        return {"count": 0}
+
+    mean = values.mean()
+    centered = values - mean
+    summary = {
+        "count": count,
+        "mean": float(mean),
+        "stddev": float(np.sqrt(centered @ centered / (count - 1))) if count > 1 else 0.0,
+        "min": float(values.min()),
+        "max": float(values.max()),
+    }
+    for pct, value in zip(percentiles, np.percentile(values, percentiles)):
+        summary[f"p{pct}"] = float(value)
+
+    x_centered = x - x.mean()
+    denominator = x_centered @ x_centered
+    summary["trend"] = float(x_centered @ centered / denominator) if denominator > 0 else 0.0
+    return summary
+
+
+def _describe_python(values, times, percentiles):
+    pairs = [
+        (i if times is None else times[i], v)
+        for i, v in enumerate(values) if v == v
+    ]
+    count = len(pairs)
+    if count == 0:
+        return {"count": 0}
+
+    ordered = sorted(v for _, v in pairs)
+    mean = math.fsum(ordered) / count
+    variance = math.fsum((v - mean) ** 2 for v in ordered) / (count - 1) if count > 1 else 0.0
+    summary = {
+        "count": count,
+        "mean": mean,
+        "stddev": math.sqrt(variance),
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+    # Interpolation linéaire, comme numpy.percentile par défaut
+    for pct in percentiles:
+        rank = pct / 100 * (count - 1)
+        low = int(rank)
+        high = min(low + 1, count - 1)
+        summary[f"p{pct}"] = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    x_mean = math.fsum(x for x, _ in pairs) / count
+    denominator = math.fsum((x - x_mean) ** 2 for x, _ in pairs)
+    numerator = math.fsum((x - x_mean) * (v - mean) for x, v in pairs)
+    summary["trend"] = numerator / denominator if denominator > 0 else 0.0
+    return summary
+
+
+def round_summary(summary, digits=4):
+    return {key: value if key == "count" else round(value, digits) for key, value in summary.items()}
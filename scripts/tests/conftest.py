@@ -0,0 +1,6 @@
+import sys
+import os
+
+# The scripts are run directly and import their neighbours by module name
+for directory in ("benchmarks", "monitoring"):
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", directory)))
@@ -0,0 +1,81 @@
+import json
+import os
+import statistics
+
+import pytest
+
+pytest.importorskip("psutil")
+
+from collect_system_metrics import STAT_FIELDS, RunningStats, build_targets, collect_metrics
+
+
+@pytest.mark.parametrize("duration", [0, 0.05])
+def test_duration_shorter_than_interval_takes_one_sample(duration):
+    metrics = collect_metrics(duration=duration, interval=1)
+    assert metrics["summary"]["sample_count"] == 1
+    assert "avg_cpu_percent" in metrics["summary"]
+    assert "estimated_energy_joules" in metrics["summary"]
+
+
+def test_columnar_samples_keep_every_streamed_field(tmp_path):
+    stream_file = tmp_path / "samples.ndjson"
+    collect_metrics(0.1, 0.02, stream_file=str(stream_file), targets=build_targets([os.getpid()]))
+    streamed = json.loads(stream_file.read_text().splitlines()[-1])
+
+    metrics = collect_metrics(0.1, 0.02, targets=build_targets([os.getpid()]))
+    samples = metrics["samples"]
+    count = metrics["summary"]["sample_count"]
+    for field in streamed:
+        if field != "targets":
+            assert len(samples[field]) == count, field
+    assert streamed["targets"]
+    for name, target_sample in streamed["targets"].items():
+        assert target_sample
+        for field in target_sample:
+            assert len(samples["targets"][name][field]) == count, (name, field)
+    assert all(isinstance(ts, str) for ts in samples["timestamp"])
+
+
+def test_running_stats_match_a_full_pass():
+    values = [3.5, -1.0, 12.25, 7.0, 7.0, 0.5]
+    running = RunningStats()
+    for value in values:
+        running.update(value)
+    assert running.to_dict() == {
+        "count": 6,
+        "mean": round(statistics.fmean(values), 4),
+        "stddev": round(statistics.stdev(values), 4),
+        "min": -1.0,
+        "max": 12.25,
+    }
+
+
+def test_running_stats_empty_and_single_value():
+    assert RunningStats().to_dict() == {"count": 0}
+    running = RunningStats()
+    running.update(42.0)
+    assert running.to_dict() == {"count": 1, "mean": 42.0, "stddev": 0.0, "min": 42.0, "max": 42.0}
+
+
+def test_stream_writes_one_line_per_sample_and_summarizes_them(tmp_path):
+    stream_file = tmp_path / "samples.ndjson"
+    stream_file.write_text(json.dumps({"previous": "run"}) + "\n")
+    metrics = collect_metrics(0.1, 0.02, stream_file=str(stream_file))
+
+    assert metrics["samples_file"] == str(stream_file)
+    assert "samples" not in metrics
+    lines = stream_file.read_text().splitlines()
+    # Appended after the existing content, one JSON object per sample
+    assert json.loads(lines[0]) == {"previous": "run"}
+    samples = [json.loads(line) for line in lines[1:]]
+    summary = metrics["summary"]
+    assert len(samples) == summary["sample_count"]
+    assert [sample["elapsed_s"] for sample in samples] == sorted(sample["elapsed_s"] for sample in samples)
+    for field in STAT_FIELDS:
+        values = [sample[field] for sample in samples]
+        stats = summary["stats"][field]
+        assert stats["count"] == len(values)
+        assert stats["mean"] == pytest.approx(statistics.fmean(values), abs=1e-4)
+        assert stats["min"] == pytest.approx(min(values), abs=1e-4)
+        assert stats["max"] == pytest.approx(max(values), abs=1e-4)
+    assert summary["total_net_sent_mb"] == samples[-1]["net_sent_mb"]
@@ -0,0 +1,58 @@
+import json
+
+from compare_environments import group_by_test, load_shape, load_test_results, summarize_test
+
+
+def _runs(*throughputs):
+    return [{"status": "completed", "requests_per_second": value} for value in throughputs]
+
+
+def test_winner_when_separation_is_significant():
+    summary = summarize_test({"docker": _runs(100, 101, 102, 103), "microvm": _runs(90, 91, 92, 93)})
+    assert summary["winner"] == "docker"
+    assert summary["p_values"]["microvm"] < 0.05
+    assert summary["verdict"].startswith("Winner: docker")
+
+
+def test_too_few_runs_is_not_reported_as_no_difference():
+    summary = summarize_test({"docker": _runs(100, 101, 102), "microvm": _runs(10, 11, 12)})
+    assert summary["winner"] is None
+    assert summary["p_values"] == {}
+    assert "too few runs to test" in summary["verdict"]
+    assert "docker: 3, microvm: 3" in summary["verdict"]
+
+
+def test_no_significant_winner_with_overlapping_runs():
+    summary = summarize_test({"docker": _runs(100, 90, 102, 95), "microvm": _runs(98, 101, 92, 96)})
+    assert summary["winner"] is None
+    assert summary["verdict"].startswith("No significant winner")
+
+
+def test_runs_with_different_load_shapes_are_not_pooled(tmp_path):
+    runs = [
+        ("closed", 50, None, 947.0),
+        ("closed", 50, None, 951.0),
+        ("open", 50, 200, 200.0),
+        ("closed", 100, None, 1020.0),
+    ]
+    for i, (mode, users, rate, throughput) in enumerate(runs):
+        result = {
+            "environment": "docker", "test": "api_light", "status": "completed",
+            "timestamp": f"2026-01-01T00:00:0{i}", "mode": mode, "concurrent_users": users,
+            "target_requests_per_second": rate, "requests_per_second": throughput,
+        }
+        (tmp_path / f"test_docker_api_light_{i}.json").write_text(json.dumps(result))
+    # Legacy results without load parameters keep their plain key
+    (tmp_path / "test_docker_cpu.json").write_text(json.dumps(
+        {"environment": "docker", "test": "cpu", "status": "completed", "duration_seconds": 3.0}))
+
+    results = load_test_results(str(tmp_path), index_path=str(tmp_path / "index.sqlite"))
+    assert {key: len(runs) for key, runs in results.items()} == {
+        "docker_api_light@closed-u50": 2,
+        "docker_api_light@open-u50-r200": 1,
+        "docker_api_light@closed-u100": 1,
+        "docker_cpu": 1,
+    }
+    tests = group_by_test(results)
+    assert [run["requests_per_second"] for run in tests["api_light@closed-u50"]["docker"]] == [947.0, 951.0]
+    assert load_shape({"mode": "open", "concurrent_users": 8, "target_requests_per_second": 12.5}) == "open-u8-r12.5"
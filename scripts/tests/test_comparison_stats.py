@@ -0,0 +1,111 @@
+import math
+import random
+import statistics
+
+import pytest
+
+import comparison_stats
+from comparison_stats import bootstrap_ci, mann_whitney_u, min_p_value
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(comparison_stats, "np", None)
+    return request.param
+
+
+def test_bootstrap_single_value_has_a_point_interval(backend):
+    assert bootstrap_ci([4.2]) == {"n": 1, "estimate": 4.2, "ci_low": 4.2, "ci_high": 4.2}
+
+
+@pytest.mark.parametrize("statistic, reduce", [("mean", statistics.fmean), ("median", statistics.median)])
+def test_bootstrap_interval_contains_the_estimate(backend, statistic, reduce):
+    rng = random.Random(1)
+    values = [rng.gauss(100, 10) for _ in range(12)]
+    ci = bootstrap_ci(values, statistic=statistic)
+    assert ci["n"] == 12
+    assert ci["estimate"] == pytest.approx(reduce(values))
+    assert min(values) <= ci["ci_low"] < ci["estimate"] < ci["ci_high"] <= max(values)
+
+
+def test_bootstrap_is_reproducible_and_narrows_with_confidence(backend):
+    values = [3.0, 5.0, 4.0, 6.0, 5.5, 4.5]
+    assert bootstrap_ci(values, seed=7) == bootstrap_ci(values, seed=7)
+    wide = bootstrap_ci(values, confidence=0.99)
+    narrow = bootstrap_ci(values, confidence=0.5)
+    assert wide["ci_low"] <= narrow["ci_low"] <= narrow["ci_high"] <= wide["ci_high"]
+
+
+def test_bootstrap_backends_agree():
+    pytest.importorskip("numpy")
+    rng = random.Random(2)
+    values = [rng.expovariate(1 / 50) for _ in range(20)]
+    vectorized = bootstrap_ci(values)
+    saved = comparison_stats.np
+    try:
+        comparison_stats.np = None
+        fallback = bootstrap_ci(values)
+    finally:
+        comparison_stats.np = saved
+    assert fallback["estimate"] == pytest.approx(vectorized["estimate"])
+    width = vectorized["ci_high"] - vectorized["ci_low"]
+    assert fallback["ci_low"] == pytest.approx(vectorized["ci_low"], abs=0.1 * width)
+    assert fallback["ci_high"] == pytest.approx(vectorized["ci_high"], abs=0.1 * width)
+
+
+def test_bootstrap_rejects_bad_input(backend):
+    with pytest.raises(ValueError):
+        bootstrap_ci([])
+    with pytest.raises(ValueError):
+        bootstrap_ci([1.0, 2.0], statistic="mode")
+
+
+def test_mann_whitney_exact_known_value():
+    # scipy.stats.mannwhitneyu(x, y, method="exact") example: U = 17, p = 1/9
+    result = mann_whitney_u([19, 22, 16, 29, 24], [20, 11, 17, 12])
+    assert result["u"] == 17
+    assert result["p_value"] == pytest.approx(1 / 9)
+    assert result["effect_size"] == pytest.approx(17 / 20)
+
+
+@pytest.mark.parametrize("n, expected", [(2, 1 / 3), (3, 0.1), (4, 2 / 70), (5, 2 / 252)])
+def test_mann_whitney_separated_samples(n, expected):
+    low, high = list(range(n)), list(range(100, 100 + n))
+    assert mann_whitney_u(low, high)["p_value"] == pytest.approx(expected)
+    assert mann_whitney_u(high, low)["p_value"] == pytest.approx(expected)
+    assert mann_whitney_u(high, low)["effect_size"] == 1.0
+    assert min_p_value(n, n) == pytest.approx(expected)
+
+
+def test_mann_whitney_ties_use_corrected_normal_approximation():
+    # Mid-ranks 1, 2, 4, 4 -> U = 1; variance 16/12 * (9 - 24/56), continuity 0.5
+    result = mann_whitney_u([1, 2, 3, 3], [3, 4, 5, 6])
+    assert result["u"] == 1
+    z = 6.5 / math.sqrt(16 / 12 * (9 - 24 / 56))
+    assert result["p_value"] == pytest.approx(math.erfc(z / math.sqrt(2)))
+    assert result["p_value"] == pytest.approx(0.0545, abs=1e-4)
+
+
+def test_mann_whitney_all_tied_is_not_significant():
+    result = mann_whitney_u([5.0] * 4, [5.0] * 3)
+    assert result["p_value"] == 1.0
+    assert result["effect_size"] == 0.5
+
+
+def test_mann_whitney_large_samples_use_normal_approximation():
+    a = list(range(30))
+    b = [value + 0.5 for value in range(5, 35)]
+    result = mann_whitney_u(a, b)
+    z = (abs(result["u"] - 450) - 0.5) / math.sqrt(900 * 61 / 12)
+    assert result["p_value"] == pytest.approx(math.erfc(z / math.sqrt(2)))
+
+
+def test_min_p_value_needs_four_runs_per_side_at_five_percent():
+    assert min_p_value(1, 10) == pytest.approx(2 / 11)
+    assert min_p_value(3, 3) >= 0.05
+    assert min_p_value(3, 5) < 0.05
+    assert min_p_value(4, 4) < 0.05
+    assert min_p_value(0, 4) == 1.0
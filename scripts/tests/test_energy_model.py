@@ -0,0 +1,90 @@
+import pytest
+
+from energy_model import EnergyIntegrator, EnergyMeter, EnergyModel, LinearCoreModel, RaplModel, TableModel
+
+
+class ConstantModel(EnergyModel):
+    name = "constant"
+
+    def __init__(self, watts):
+        self.watts = watts
+
+    def power(self, t, cpu_percent, per_cpu_percent=None, per_cpu_freq_mhz=None):
+        return self.watts
+
+
+def test_trapezoid_integration():
+    integrator = EnergyIntegrator()
+    for t, watts in ((0.0, 10.0), (1.0, 30.0), (3.0, 30.0)):
+        integrator.add(t, watts)
+    assert integrator.joules == pytest.approx(20.0 + 60.0)
+    assert integrator.elapsed == 3.0
+    assert integrator.average_watts == pytest.approx(80.0 / 3)
+    assert integrator.peak_watts == 30.0
+
+
+def test_interval_before_the_first_sample_is_counted():
+    # 3 s at 65 W sampled every second: 195 J, not the 130 J between samples
+    meter = EnergyMeter(ConstantModel(65.0))
+    meter.start(100.0)
+    for t in (101.0, 102.0, 103.0):
+        meter.update(t, 50.0)
+    summary = meter.summary()
+    assert summary["estimated_energy_joules"] == pytest.approx(195.0)
+    assert summary["estimated_power_watts"] == pytest.approx(65.0)
+
+
+def test_finish_extends_the_last_reading():
+    meter = EnergyMeter(ConstantModel(10.0))
+    meter.start(0.0)
+    meter.update(1.0, 0.0)
+    meter.finish(1.5)
+    meter.finish(1.2)
+    assert meter.integrator.joules == pytest.approx(15.0)
+
+
+def _powercap(root, energy_uj, max_range=1000):
+    zone = root / "intel-rapl:0"
+    zone.mkdir(exist_ok=True)
+    (zone / "max_energy_range_uj").write_text(str(max_range))
+    (zone / "energy_uj").write_text(str(energy_uj))
+
+
+def test_rapl_counter_wraparound(tmp_path):
+    _powercap(tmp_path, 900)
+    # Sub-zones are not counted twice
+    (tmp_path / "intel-rapl:0:0").mkdir()
+    model = RaplModel(root=str(tmp_path))
+    try:
+        assert len(model.zones) == 1
+        meter = EnergyMeter(model)
+        meter.start(0.0)
+        _powercap(tmp_path, 300)
+        # 900 -> 1000 (max range) -> 300: 400 uJ in 2 s
+        assert meter.update(2.0, None) == pytest.approx(400e-6 / 2)
+        assert meter.integrator.joules == pytest.approx(400e-6)
+    finally:
+        model.close()
+
+
+def test_rapl_unavailable(tmp_path):
+    assert not RaplModel.available(root=str(tmp_path))
+    with pytest.raises(OSError):
+        RaplModel(root=str(tmp_path))
+
+
+def test_table_model_interpolates_and_clamps():
+    model = TableModel([(100, 80.0), (0, 20.0), (50, 40.0)])
+    assert model.power(0, 25.0) == pytest.approx(30.0)
+    assert model.power(0, 75.0) == pytest.approx(60.0)
+    assert model.power(0, -5.0) == 20.0
+    assert model.power(0, 120.0) == 80.0
+    with pytest.raises(ValueError):
+        TableModel([(0, 10.0)])
+
+
+def test_linear_model_scales_with_utilization_and_frequency():
+    model = LinearCoreModel(tdp_watts=40, idle_fraction=0.25, cpu_count=2, max_freq_mhz=2000)
+    assert model.power(0, 0.0) == pytest.approx(10.0)
+    assert model.power(0, 100.0) == pytest.approx(40.0)
+    assert model.power(0, None, [100.0, 0.0], [1000.0, 1000.0]) == pytest.approx(10.0 + 7.5)
@@ -0,0 +1,80 @@
+import json
+import math
+import random
+
+import pytest
+
+from hdr_histogram import HdrHistogram
+
+
+def _exact_percentile(ordered, percentile):
+    return ordered[max(math.ceil(percentile / 100 * len(ordered)), 1) - 1]
+
+
+@pytest.mark.parametrize("significant_figures", [2, 3, 4])
+def test_percentiles_within_relative_precision(significant_figures):
+    rng = random.Random(0)
+    values = [int(rng.lognormvariate(8, 1.5)) + 1 for _ in range(20_000)]
+    histogram = HdrHistogram(significant_figures=significant_figures)
+    for value in values:
+        histogram.record(value)
+
+    ordered = sorted(values)
+    for percentile in (1, 25, 50, 90, 99, 99.9, 100):
+        exact = _exact_percentile(ordered, percentile)
+        reported = histogram.value_at_percentile(percentile)
+        assert reported >= exact
+        assert (reported - exact) / exact <= 10 ** -significant_figures
+
+    assert histogram.total_count == len(values)
+    assert histogram.min_value == ordered[0]
+    assert histogram.max_value == ordered[-1]
+    assert histogram.mean() == pytest.approx(sum(values) / len(values))
+
+
+def test_small_values_are_exact():
+    histogram = HdrHistogram()
+    for value in range(1, 1001):
+        histogram.record(value)
+    assert [histogram.value_at_percentile(p) for p in (10, 50, 100)] == [100, 500, 1000]
+
+
+def test_values_are_clamped_to_trackable_range():
+    histogram = HdrHistogram(highest_trackable=1000)
+    histogram.record(-5)
+    histogram.record(10_000)
+    assert histogram.min_value == 0
+    assert histogram.max_value == 1000
+    assert histogram.value_at_percentile(100) == 1000
+
+
+def test_merge_is_lossless():
+    rng = random.Random(1)
+    values = [rng.randrange(1, 5_000_000) for _ in range(10_000)]
+    whole, first, second = HdrHistogram(), HdrHistogram(), HdrHistogram()
+    for i, value in enumerate(values):
+        whole.record(value)
+        (first if i % 3 else second).record(value)
+
+    first.merge(second)
+    first.merge(HdrHistogram())
+    assert first.counts == whole.counts
+    assert first.summary(1000, "_ms") == whole.summary(1000, "_ms")
+    assert (first.total_sum, first.min_value, first.max_value) == (whole.total_sum, whole.min_value, whole.max_value)
+
+
+def test_merge_rejects_other_layouts():
+    with pytest.raises(ValueError):
+        HdrHistogram(significant_figures=3).merge(HdrHistogram(significant_figures=2))
+
+
+def test_dict_round_trip_through_json():
+    histogram = HdrHistogram()
+    for value in (3, 150, 150, 42_000, 9_999_999):
+        histogram.record(value)
+
+    restored = HdrHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+    assert restored.counts == histogram.counts
+    assert restored.total_count == histogram.total_count
+    assert restored.summary() == histogram.summary()
+    assert HdrHistogram.from_dict(HdrHistogram().to_dict()).summary() == {}
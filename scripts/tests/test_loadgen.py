@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from cpu_list import parse_cpus
+from energy_model import EnergyModel
+import loadgen
+from loadgen import (
+    HttpConnection, RunStats, benchmark_endpoint, build_request, client_cpu_set, generate_load, parse_args,
+    split_evenly,
+)
+
+
+async def _exchange(responses):
+    """Serve `responses` one per request on a single connection, then close it."""
+    async def handle(reader, writer):
+        for response in responses:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(response)
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    conn = HttpConnection("127.0.0.1", port)
+    raw = build_request("127.0.0.1", port, "/")
+    try:
+        return [await conn.request(raw) for _ in responses], conn
+    finally:
+        conn.close()
+        server.close()
+        await server.wait_closed()
+
+
+def test_content_length_and_chunked_bodies_keep_connection():
+    results, _ = asyncio.run(_exchange([
+        b"HTTP/1.1 200 OK\r\nContent-Length: 5\r\n\r\nhello",
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n3\r\nabc\r\n2\r\nde\r\n0\r\n\r\n",
+        b"HTTP/1.1 204 No Content\r\n\r\n",
+    ]))
+    assert results == [(200, 5), (200, 5), (204, 0)]
+
+
+def test_body_without_length_is_read_until_close():
+    results, conn = asyncio.run(_exchange([b"HTTP/1.1 200 OK\r\n\r\nbody until close"]))
+    assert results == [(200, len(b"body until close"))]
+    assert conn.writer is None
+
+
+def test_users_are_split_without_exceeding_the_requested_total():
+    assert split_evenly(10, 4) == [3, 3, 2, 2]
+    assert sum(split_evenly(3, 3)) == 3
+    with pytest.raises(SystemExit):
+        parse_args(["--users", "2", "--processes", "4"])
+
+
+def test_client_cpu_set_parses_cpu_lists():
+    assert parse_cpus(" 0-2, 5,,7-8") == [0, 1, 2, 5, 7, 8]
+    with pytest.raises(ValueError):
+        parse_cpus(",")
+    assert client_cpu_set("0-3,6", "5") == [0, 1, 2, 3, 6]
+    assert client_cpu_set(None, None) is None
+    with pytest.raises(ValueError):
+        client_cpu_set("0-3", "2")
+
+
+class ConstantModel(EnergyModel):
+    name = "constant"
+
+    def power(self, t, cpu_percent, per_cpu_percent=None, per_cpu_freq_mhz=None):
+        return 20.0
+
+
+async def _benchmark_with_energy():
+    async def handle(reader, writer):
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await benchmark_endpoint(
+            "local", f"http://127.0.0.1:{port}", "/", "closed", 0.3, 2, 0.0, energy_model=ConstantModel(),
+        )
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_energy_per_request_is_recorded_for_the_regression_gate():
+    pytest.importorskip("psutil")
+    result = asyncio.run(_benchmark_with_energy())
+    assert result["status"] == "completed"
+    assert result["energy_model"] == {"name": "constant"}
+    assert result["power_watts"] == 20.0
+    assert result["energy_joules"] == pytest.approx(20.0 * result["duration_seconds"], rel=0.05)
+    assert result["energy_per_request_joules"] == pytest.approx(
+        result["energy_joules"] / result["requests_total"], rel=0.01)
+
+
+async def _load_against_silent_server(mode):
+    """Server that accepts connections but never answers."""
+    async def handle(reader, writer):
+        await reader.read()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await generate_load(f"http://127.0.0.1:{port}", "/", mode, 0.25, 4, 20.0)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+@pytest.mark.parametrize("mode", ["closed", "open"])
+def test_timed_out_requests_are_in_the_latency_tail(monkeypatch, mode):
+    monkeypatch.setattr(loadgen, "REQUEST_TIMEOUT", 0.2)
+    stats = asyncio.run(_load_against_silent_server(mode))
+    assert stats.completed == 0
+    assert stats.failed > 0
+    assert stats.errors == stats.failed
+    assert stats.latency.total_count == stats.failed
+    assert stats.latency.max_value >= 200_000
+    assert stats.failed_latency.min_value >= 200_000
+
+    merged = RunStats()
+    merged.merge(stats.to_dict())
+    assert merged.failed == stats.failed
+    assert merged.latency.total_count == stats.latency.total_count
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from regression_gate import BASELINE_VERSION, EXIT_OK, EXIT_REGRESSION, check_regressions, main
+
+THRESHOLDS = {"p99_ms": 10.0, "requests_per_second": 5.0, "energy_per_request_j": 10.0}
+
+
+def _entry(**metrics):
+    return {"environment": "docker", "test": "api_light", "runs": 5, "metrics": metrics}
+
+
+def _baseline(**entries):
+    return {"version": BASELINE_VERSION, "entries": entries}
+
+
+def _by_metric(findings):
+    return {finding["metric"]: finding for finding in findings if "metric" in finding}
+
+
+def test_significant_regression_past_threshold():
+    baseline = _baseline(docker_api=_entry(
+        p99_ms=[10.0, 10.2, 9.9, 10.1, 10.0],
+        requests_per_second=[1000, 1010, 990, 1005, 995],
+        energy_per_request_j=[0.010, 0.011, 0.010, 0.011, 0.010],
+    ))
+    current = {"docker_api": _entry(
+        p99_ms=[13.0, 13.1, 12.9, 13.2, 13.0],
+        requests_per_second=[800, 810, 790, 805, 795],
+        energy_per_request_j=[0.013, 0.014, 0.013, 0.014, 0.013],
+    )}
+    findings = _by_metric(check_regressions(baseline, current, THRESHOLDS))
+    assert {name: f["status"] for name, f in findings.items()} == {
+        "p99_ms": "regression", "requests_per_second": "regression", "energy_per_request_j": "regression",
+    }
+    assert findings["p99_ms"]["change_percent"] == pytest.approx(30.0, abs=1.0)
+    assert findings["requests_per_second"]["change_percent"] == pytest.approx(-20.0, abs=1.0)
+    assert findings["p99_ms"]["p_value"] < 0.05
+
+
+def test_no_change_and_improvement_pass():
+    runs = [10.0, 10.2, 9.9, 10.1, 10.0]
+    baseline = _baseline(docker_api=_entry(p99_ms=runs, requests_per_second=[1000] * 5))
+    current = {"docker_api": _entry(p99_ms=list(runs), requests_per_second=[1200] * 5)}
+    findings = _by_metric(check_regressions(baseline, current, THRESHOLDS))
+    assert findings["p99_ms"]["status"] == "ok"
+    assert findings["p99_ms"]["change_percent"] == pytest.approx(0.0)
+    assert findings["requests_per_second"]["status"] == "ok"
+    assert "energy_per_request_j" not in findings
+
+
+def test_threshold_alone_applies_when_runs_are_too_few_to_test():
+    baseline = _baseline(docker_api=_entry(p99_ms=[10.0, 10.0]))
+    current = {"docker_api": _entry(p99_ms=[12.0, 12.0])}
+    [finding] = check_regressions(baseline, current, THRESHOLDS)
+    assert finding["status"] == "regression"
+    assert finding["p_value"] is None
+
+
+def test_noise_past_threshold_is_not_a_regression():
+    baseline = _baseline(docker_api=_entry(p99_ms=[10.0, 14.0, 9.0, 13.0, 10.0]))
+    current = {"docker_api": _entry(p99_ms=[14.0, 9.5, 14.5, 10.5, 13.5])}
+    [finding] = check_regressions(baseline, current, THRESHOLDS)
+    assert finding["change_percent"] > THRESHOLDS["p99_ms"]
+    assert finding["p_value"] >= 0.05
+    assert finding["status"] == "ok"
+
+
+def test_new_and_missing_pairs():
+    baseline = _baseline(docker_api=_entry(p99_ms=[10.0]), microvm_api=_entry(p99_ms=[12.0]))
+    current = {"docker_api": _entry(p99_ms=[10.0]), "unikernel_api": _entry(p99_ms=[8.0])}
+    statuses = [(f["key"], f["status"]) for f in check_regressions(baseline, current, THRESHOLDS)]
+    assert statuses == [("docker_api", "ok"), ("unikernel_api", "new"), ("microvm_api", "missing")]
+
+
+def _write_runs(directory, mode, rate, throughputs):
+    directory.mkdir(exist_ok=True)
+    for i, throughput in enumerate(throughputs):
+        result = {
+            "environment": "docker", "test": "api_light", "status": "completed",
+            "timestamp": f"2026-01-01T00:00:0{i}", "mode": mode, "concurrent_users": 50,
+            "target_requests_per_second": rate, "requests_per_second": throughput,
+        }
+        (directory / f"test_docker_api_light_{mode}_{i}.json").write_text(json.dumps(result))
+
+
+def test_other_load_shape_is_new_and_missing_not_a_regression(tmp_path, capsys):
+    baseline = str(tmp_path / "baseline.json")
+    _write_runs(tmp_path / "closed", "closed", None, [950, 948, 952, 951])
+    assert main(["save", str(tmp_path / "closed"), "--baseline", baseline]) == EXIT_OK
+    [entry] = json.loads(open(baseline).read())["entries"].values()
+    assert (entry["mode"], entry["concurrent_users"], entry["load_shape"]) == ("closed", 50, "closed-u50")
+
+    _write_runs(tmp_path / "open", "open", 200, [200, 199, 200, 201])
+    assert main(["check", str(tmp_path / "open"), "--baseline", baseline]) == EXIT_OK
+    output = capsys.readouterr().out
+    assert "[NEW]        docker_api_light@open-u50-r200" in output
+    assert "[MISSING]    docker_api_light@closed-u50" in output
+    assert "[REGRESSION]" not in output
+
+    _write_runs(tmp_path / "slower", "closed", None, [800, 805, 798, 802])
+    assert main(["check", str(tmp_path / "slower"), "--baseline", baseline]) == EXIT_REGRESSION
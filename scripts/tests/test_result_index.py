@@ -0,0 +1,62 @@
+import gc
+import json
+import os
+
+import result_index
+from result_index import ResultIndex, load_indexed
+
+
+def _write(directory, name, data):
+    path = directory / name
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_index_tracks_new_changed_removed_and_invalid_files(tmp_path):
+    results = tmp_path / "results"
+    results.mkdir()
+    index_path = str(tmp_path / "index.sqlite")
+    _write(results, "test_a.json", {"run": "a", "latency_histogram_us": {"counts": [[1, 2]]}})
+    _write(results, "test_b.json", {"run": "b"})
+    (results / "test_bad.json").write_text("{not json")
+
+    loaded, failed = load_indexed(str(results), "test_*.json", index_path)
+    assert [data["run"] for _, data in loaded] == ["a", "b"]
+    assert failed == 1
+    assert loaded[0][1]["latency_histogram_us"] == {"counts": [[1, 2]]}
+
+    summary_only, _ = load_indexed(str(results), "test_*.json", index_path, details=False)
+    assert "latency_histogram_us" not in summary_only[0][1]
+
+    path = _write(results, "test_b.json", {"run": "b2", "extra": True})
+    os.utime(path, ns=(1, 1))
+    (results / "test_a.json").unlink()
+    loaded, failed = load_indexed(str(results), "test_*.json", index_path)
+    assert [data["run"] for _, data in loaded] == ["b2"]
+    assert failed == 1
+
+
+def test_load_restores_garbage_collector_state(tmp_path):
+    _write(tmp_path, "test_a.json", {"run": "a"})
+    assert gc.isenabled()
+    load_indexed(str(tmp_path), "test_*.json", str(tmp_path / "index.sqlite"))
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        load_indexed(str(tmp_path), "test_*.json", str(tmp_path / "index.sqlite"))
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
+
+
+def test_process_pool_parse_matches_inline(tmp_path, monkeypatch):
+    for i in range(20):
+        _write(tmp_path, f"test_{i:02d}.json", {"run": i, "samples": {"cpu_percent": [i, i + 1]}})
+    inline, _ = ResultIndex(str(tmp_path), "test_*.json", str(tmp_path / "inline.sqlite")).load()
+
+    monkeypatch.setattr(result_index, "MIN_FILES_FOR_POOL", 1)
+    pooled, failed = ResultIndex(str(tmp_path), "test_*.json", str(tmp_path / "pool.sqlite"),
+                                 max_workers=2).load()
+    assert failed == 0
+    assert pooled == inline
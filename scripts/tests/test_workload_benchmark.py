@@ -0,0 +1,181 @@
+import multiprocessing
+import threading
+import time
+from array import array
+
+import pytest
+
+pytest.importorskip("psutil")
+
+from energy_model import EnergyModel
+from workload_benchmark import (
+    STAT_CPU_US,
+    STAT_DUTY_PPM,
+    STAT_FIELDS,
+    STAT_ITERATION_NS,
+    STAT_ITERATIONS,
+    STAT_KERNEL_UTILIZATION_PPM,
+    Monitor,
+    UtilizationController,
+    WorkloadBenchmark,
+    calibrate_kernel,
+    join_workers,
+    workload_worker,
+)
+
+
+class ConstantModel(EnergyModel):
+    name = "constant"
+
+    def __init__(self, watts):
+        self.watts = watts
+
+    def power(self, t, cpu_percent, per_cpu_percent=None, per_cpu_freq_mhz=None):
+        return self.watts
+
+
+class HalfBusyKernel:
+    """Spins 2 ms then sleeps 2 ms: about 50% CPU at full duty."""
+
+    def run(self, iteration):
+        end = time.perf_counter() + 0.002
+        while time.perf_counter() < end:
+            pass
+        time.sleep(0.002)
+        return 1, 0
+
+
+def test_calibration_measures_iteration_time_and_kernel_utilization():
+    iteration_seconds, utilization = calibrate_kernel(HalfBusyKernel(), seconds=0.3)
+    assert 0.003 < iteration_seconds < 0.02
+    assert 0.3 < utilization < 0.7
+
+
+def test_controller_is_seeded_from_calibration():
+    controller = UtilizationController.from_calibration(0.4, iteration_seconds=0.2, kernel_utilization=0.5)
+    assert controller.duty == pytest.approx(0.8)
+    assert controller.window == pytest.approx(0.8)
+
+    full = UtilizationController.from_calibration(0.9, iteration_seconds=0.001, kernel_utilization=0.5)
+    assert full.duty == 1.0
+    assert full.window == 0.25
+
+
+def test_controller_converges_on_a_linear_plant():
+    # Utilization = 0.6 * duty: the feed-forward alone would undershoot
+    controller = UtilizationController(0.3, window=0.25)
+    measured = 0.0
+    for _ in range(80):
+        measured = 0.6 * controller.update(measured, 0.25)
+    assert measured == pytest.approx(0.3, abs=0.01)
+
+
+def test_worker_holds_target_after_setup():
+    counters = [0] * STAT_FIELDS
+    ready = threading.Barrier(1)
+    duration = 2.0
+    workload_worker(0, counters, "json", "light", ready, duration, target_utilization=0.5)
+    assert counters[STAT_ITERATION_NS] > 0
+    assert counters[STAT_KERNEL_UTILIZATION_PPM] > 0
+    assert counters[STAT_CPU_US] / 1e6 / duration == pytest.approx(0.5, abs=0.1)
+
+
+def test_failed_worker_setup_releases_the_others():
+    ctx = multiprocessing.get_context("spawn")
+    counters = ctx.Array("q", 2 * STAT_FIELDS, lock=False)
+    ready = ctx.Barrier(3)
+    # Slot 1's kernel setup raises (unknown kernel) while slot 0 waits at the barrier
+    processes = [
+        ctx.Process(target=workload_worker, args=(slot, counters, kernel, "light", ready, 0.5),
+                    name=f"workload-{slot}")
+        for slot, kernel in enumerate(("json", "broken"))
+    ]
+    for process in processes:
+        process.start()
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="workload-1"):
+        join_workers(processes, ready)
+    assert time.monotonic() - started < 30
+    assert ready.broken
+    assert all(process.exitcode != 0 for process in processes)
+
+
+def test_per_worker_counters_are_merged(monkeypatch):
+    benchmark = WorkloadBenchmark(duration_sec=2, workers=2, workload_type="json",
+                                  energy_model=ConstantModel(10.0))
+    # iterations, ops, bytes, cpu_us, duty_ppm, iteration_ns, kernel_utilization_ppm
+    counters = [100, 300, 4096, 1_000_000, 500_000, 0, 0,
+                50, 150, 2048, 2_000_000, 1_000_000, 3_000_000, 900_000]
+    monkeypatch.setattr(benchmark, "_run_parallel", lambda: counters)
+    results = benchmark.run_workload()
+
+    assert results["iterations"] == 150
+    assert results["ops"] == 450
+    assert results["bytes"] == 6144
+    first, second = results["per_worker"]
+    assert first["iterations_per_sec"] == 50
+    assert first["achieved_utilization"] == pytest.approx(50)
+    assert first["final_duty_cycle"] == 0.5
+    assert "calibrated_iteration_ms" not in first
+    assert second["achieved_utilization"] == pytest.approx(100)
+    assert second["calibrated_iteration_ms"] == 3.0
+    assert second["calibrated_kernel_utilization"] == 90.0
+    assert results["achieved_utilization"] == pytest.approx(75)
+    assert results["metrics"]["ops_per_sec"] == 225
+
+
+def test_parallel_workers_publish_their_own_counters():
+    benchmark = WorkloadBenchmark(duration_sec=0.5, intensity="light", workers=2, workload_type="json",
+                                  sample_interval=0.1, energy_model=ConstantModel(10.0))
+    results = benchmark.run_workload()
+
+    assert [worker["worker"] for worker in results["per_worker"]] == [0, 1]
+    assert all(worker["iterations"] > 0 for worker in results["per_worker"])
+    assert results["iterations"] == sum(worker["iterations"] for worker in results["per_worker"])
+    assert results["ops"] > 0 and results["bytes"] > 0
+    # The Monitor sampled the sum of both workers' counters
+    assert 0 < max(results["cpu_samples"]["iterations"]) <= results["iterations"]
+
+
+def test_monitor_samples_from_the_barrier_until_stopped():
+    benchmark = WorkloadBenchmark(duration_sec=1, workers=2, energy_model=ConstantModel(10.0))
+    counters = array("q", bytes(8 * 2 * STAT_FIELDS))
+    ready = threading.Barrier(2)
+    monitor = Monitor(benchmark, ready, counters, interval=0.05)
+    monitor.start()
+    time.sleep(0.1)
+    # Nothing is measured while the workers are still preparing
+    assert monitor.start_at is None
+    assert len(benchmark.cpu_samples) == 0
+
+    counters[STAT_ITERATIONS] = 7
+    counters[STAT_FIELDS + STAT_ITERATIONS] = 5
+    counters[STAT_DUTY_PPM] = counters[STAT_FIELDS + STAT_DUTY_PPM] = 500_000
+    ready.wait()
+    started = time.monotonic()
+    time.sleep(0.3)
+    monitor.stop()
+    elapsed = time.monotonic() - started
+
+    assert monitor.start_at is not None
+    samples = benchmark.cpu_samples.to_dict()
+    assert 4 <= len(samples["iterations"]) <= 8
+    assert set(samples["iterations"]) == {12}
+    assert set(samples["duty_cycle"]) == {0.5}
+    assert samples["timestamp"] == sorted(samples["timestamp"])
+    assert len(benchmark.memory_samples) == len(samples["iterations"])
+    # Energy covers the whole window, from the barrier to stop()
+    assert benchmark.energy_meter.integrator.elapsed == pytest.approx(elapsed, abs=0.05)
+    assert benchmark.energy_meter.summary()["estimated_energy_joules"] == pytest.approx(10 * elapsed, abs=0.5)
+
+
+def test_monitor_exits_without_samples_when_the_barrier_is_broken():
+    benchmark = WorkloadBenchmark(duration_sec=1, energy_model=ConstantModel(10.0))
+    ready = threading.Barrier(2)
+    monitor = Monitor(benchmark, ready, array("q", bytes(8 * STAT_FIELDS)), interval=0.05)
+    monitor.start()
+    ready.abort()
+    monitor.join(5)
+    assert not monitor.is_alive()
+    assert monitor.start_at is None
+    assert len(benchmark.cpu_samples) == 0
@@ -0,0 +1,95 @@
+import json
+import os
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import workload_kernels
+from workload_kernels import KERNELS, MB, CacheThrashKernel, FileIOKernel, JsonKernel, create_kernel
+
+
+@pytest.mark.parametrize("name", sorted(KERNELS))
+def test_every_kernel_reports_work(name):
+    kernel = create_kernel(name, "light")
+    try:
+        for iteration in range(2):
+            ops, nbytes = kernel.run(iteration)
+            assert isinstance(ops, int) and ops > 0
+            assert isinstance(nbytes, int) and nbytes > 0
+    finally:
+        kernel.close()
+
+
+def test_unknown_kernel_is_rejected():
+    with pytest.raises(ValueError, match="crypto"):
+        create_kernel("gpu")
+
+
+def test_crypto_counts_both_hashes():
+    kernel = create_kernel("crypto", "light")
+    ops, nbytes = kernel.run(3)
+    assert ops == 2 * 5000
+    # Input bytes plus the 64-byte hex digest fed to sha512, per operation pair
+    assert nbytes % 5000 == 0
+    assert nbytes // 5000 > 64 + len("optivolt-benchmark-3-")
+
+
+def test_memory_copies_the_whole_buffer():
+    kernel = create_kernel("memory", "light")
+    assert len(kernel.src) == len(kernel.dst) == 8 * MB
+    assert kernel.run(0) == (4, 4 * 8 * MB)
+    assert kernel.dst == kernel.src
+
+
+@pytest.mark.parametrize("backend", ["numpy", "python"])
+def test_cache_counts_eight_bytes_per_access(backend, monkeypatch):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(workload_kernels, "np", None)
+    kernel = CacheThrashKernel("light")
+    assert kernel.entries == 16 * MB // 8
+    assert len(kernel.table) == kernel.entries
+    accesses = 1_000_000 if backend == "numpy" else 100_000
+    assert kernel.run(0) == (accesses, accesses * 8)
+
+
+def test_fileio_writes_then_reads_every_block_and_cleans_up():
+    kernel = FileIOKernel("light")
+    path = kernel.path
+    try:
+        assert kernel.run(0) == (2 * 256 + 1, 2 * 256 * FileIOKernel.BLOCK_SIZE)
+        assert os.path.getsize(path) == 256 * FileIOKernel.BLOCK_SIZE
+        with open(path, "rb") as f:
+            assert f.read(FileIOKernel.BLOCK_SIZE) == kernel.block
+    finally:
+        kernel.close()
+    assert not os.path.exists(path)
+
+
+def test_json_documents_match_the_simulate_heavy_response(monkeypatch):
+    documents = []
+
+    def dumps(document):
+        documents.append(document)
+        return json.dumps(document)
+
+    monkeypatch.setattr(workload_kernels, "json", SimpleNamespace(dumps=dumps, loads=json.loads))
+    kernel = JsonKernel("light")
+    ops, nbytes = kernel.run(0)
+
+    assert len(documents) == 20
+    assert ops == 2 * 20
+    assert nbytes == 2 * sum(len(json.dumps(document)) for document in documents)
+    document = documents[0]
+    assert set(document) == {"call_id", "timestamp", "type", "response_size_kb", "response"}
+    assert uuid.UUID(document["call_id"]).version == 4
+    assert len({document["call_id"] for document in documents}) == 20
+    assert datetime.fromisoformat(document["timestamp"]).utcoffset().total_seconds() == 0
+    assert document["type"] == "GET"
+    assert document["response_size_kb"] == 8
+    payload = document["response"]["payload"]
+    assert payload.startswith(JsonKernel.PAYLOAD_BASE)
+    assert 8 * 1024 - len(JsonKernel.PAYLOAD_BASE) < len(payload) <= 8 * 1024
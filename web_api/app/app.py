@@ -1,13 +1,44 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from starlette.responses import Response
+
+from app import config
+from app.helpers import shutdown_cpu_pool
+from app.metrics import MetricsMiddleware, MetricsRegistry, route_keys
+from app.responses import get_json_response_class
 from app.routes import simulation_routes
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_cpu_pool()
+
+
+def create_app(json_encoder: str = config.JSON_ENCODER) -> FastAPI:
+    app = FastAPI(
+        default_response_class=get_json_response_class(json_encoder),
+        lifespan=lifespan,
+    )
+
+    @app.get("/")
+    def read_root():
+        return {"message": "Welcome to fake API"}
+
+    app.include_router(simulation_routes.router)
+
+    if config.METRICS_ENABLED:
+        @app.get("/metrics", include_in_schema=False)
+        def metrics():
+            return Response(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
 
+        # Fixed table of every route (including /metrics), see MetricsRegistry
+        registry = MetricsRegistry(route_keys(app))
+        app.state.metrics = registry
+        app.add_middleware(MetricsMiddleware, registry=registry)
 
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to fake API"}
+    return app
 
 
-app.include_router(simulation_routes.router)
+app = create_app()
@@ -0,0 +1,67 @@
+import os
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    return os.getenv(name, "1" if default else "0").lower() in ("1", "true", "yes", "on")
+
+
+# Runtime switches, read from the environment so each platform variant
+# (Docker, microVM, unikernel) can be tuned without rebuilding the image.
+
+# How simulated delays are served:
+#   "sync"  -> time.sleep in Starlette's thread pool (one thread per request)
+#   "async" -> asyncio.sleep on the event loop (no thread held while waiting)
+DELAY_MODE = os.getenv("DELAY_MODE", "sync").lower()
+
+if DELAY_MODE not in ("sync", "async"):
+    raise ValueError(f"DELAY_MODE must be 'sync' or 'async', got {DELAY_MODE!r}")
+
+# Upper bound (bytes) for prebuilt payloads kept by helpers.payload_cache.
+# Payloads larger than the cap are built per request and never cached.
+PAYLOAD_CACHE_MAX_BYTES = int(os.getenv("PAYLOAD_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# Serve /simulate/heavy from cached, already-serialized JSON bytes instead of
+# running the 500 KB payload through jsonable_encoder + json.dumps per request.
+PRESERIALIZED_RESPONSES = _env_flag("PRESERIALIZED_RESPONSES", True)
+
+# Default chunk size (bytes) for GET /simulate/heavy?stream=true.
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", str(64 * 1024)))
+# Upper bound of the per-request `chunk_size` override
+STREAM_CHUNK_MAX_SIZE = int(os.getenv("STREAM_CHUNK_MAX_SIZE", str(8 * 1024 * 1024)))
+
+# Encoder behind the app's default response class:
+#   "auto"   -> orjson when installed, stdlib json otherwise
+#   "orjson" -> orjson (falls back to stdlib with a warning if missing)
+#   "stdlib" -> Starlette's JSONResponse (json.dumps)
+JSON_ENCODER = os.getenv("JSON_ENCODER", "auto").lower()
+
+if JSON_ENCODER not in ("auto", "orjson", "stdlib"):
+    raise ValueError(f"JSON_ENCODER must be 'auto', 'orjson' or 'stdlib', got {JSON_ENCODER!r}")
+
+# How generate_log builds call_id:
+#   "uuid"    -> uuid4() per call
+#   "pool"    -> uuid4-formatted ids cut from a batch of os.urandom bytes
+#   "counter" -> "<pid>-<start>-<n>" monotonic, process-unique counter
+LOG_ID_MODE = os.getenv("LOG_ID_MODE", "pool").lower()
+
+if LOG_ID_MODE not in ("uuid", "pool", "counter"):
+    raise ValueError(f"LOG_ID_MODE must be 'uuid', 'pool' or 'counter', got {LOG_ID_MODE!r}")
+
+# Reuse the formatted timestamp within the same millisecond (ms precision)
+# instead of calling datetime.now().isoformat() per request.
+LOG_TIMESTAMP_CACHE = _env_flag("LOG_TIMESTAMP_CACHE", True)
+
+# Processes in the pool shared by /simulate/cpu (created on first use).
+# The launcher defaults it to its CPU count divided by the number of workers.
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", str(os.cpu_count() or 1)))
+
+# CPUs the pool processes run on, e.g. "0-3" (empty: inherit the worker's).
+# The launcher sets it to its whole CPU set: workers are pinned to one CPU
+# each and spawned pool processes would otherwise share that single CPU.
+CPU_POOL_CPUS = os.getenv("CPU_POOL_CPUS", "")
+
+# Largest allocation (MB) accepted by /simulate/memory.
+MEMORY_SIM_MAX_MB = int(os.getenv("MEMORY_SIM_MAX_MB", "1024"))
+
+# Per-route latency histograms and byte counters, served at /metrics.
+METRICS_ENABLED = _env_flag("METRICS_ENABLED", True)
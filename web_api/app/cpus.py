@@ -0,0 +1,24 @@
+"""CPU list helpers shared by the launcher and the /simulate/cpu pool."""
+from typing import Iterable
+
+
+def parse_cpus(spec: str) -> list[int]:
+    """Parse a CPU list such as "0-3,6,8-9"."""
+    cpus = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            cpus.extend(range(int(start), int(end) + 1))
+        else:
+            cpus.append(int(part))
+    if not cpus:
+        raise ValueError(f"Empty CPU list: {spec!r}")
+    return cpus
+
+
+def format_cpus(cpus: Iterable[int]) -> str:
+    """Inverse of parse_cpus (plain comma list)."""
+    return ",".join(str(cpu) for cpu in sorted(cpus))
@@ -1,21 +1,264 @@
+import asyncio
+import hashlib
+import mmap
+import multiprocessing
+import os
+import resource
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from threading import Lock
+from typing import Iterator
 from uuid import uuid4
 from datetime import datetime, UTC
 
+from starlette.concurrency import run_in_threadpool
+
+from app import config
+from app.cpus import parse_cpus
+
+
+PAYLOAD_BASE = "You may say I'm a dreamer, " \
+    "But I'm not the only one, " \
+    "I hope someday you'll join us, " \
+    "And the world will be as one"
+PAYLOAD_BASE_BYTES = PAYLOAD_BASE.encode("ascii")
+
+
+def _repetitions(size_kb: int) -> int:
+    return max((size_kb * 1024) // len(PAYLOAD_BASE_BYTES), 0)
+
+
+# Size in bytes of the payload for `size_kb`, without building it
+def payload_size(size_kb: int) -> int:
+    return _repetitions(size_kb) * len(PAYLOAD_BASE_BYTES)
+
+
+class PayloadCache:
+    """Bounded LRU of prebuilt payloads, keyed by size_kb.
+
+    Payloads are stored as immutable bytes so they can be shared across
+    requests and threads without copying; `max_bytes` caps the total size.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: OrderedDict[int, bytes] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, size_kb: int) -> bytes:
+        with self._lock:
+            payload = self._entries.get(size_kb)
+            if payload is not None:
+                self._entries.move_to_end(size_kb)
+                return payload
+
+        payload = PAYLOAD_BASE_BYTES * _repetitions(size_kb)
+        if len(payload) > self.max_bytes:
+            return payload
+
+        with self._lock:
+            if size_kb not in self._entries:
+                self._entries[size_kb] = payload
+                self.current_bytes += len(payload)
+                while self.current_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.current_bytes -= len(evicted)
+        return payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+payload_cache = PayloadCache(config.PAYLOAD_CACHE_MAX_BYTES)
+
+
+# Utility to generate a big payload as bytes (cached, do not mutate)
+def generate_big_payload(size_kb: int) -> bytes:
+    return payload_cache.get(size_kb)
+
+
+# Utility to yield the payload for `size_kb` in chunks of about `chunk_size`
+# bytes. Only one chunk-sized buffer is built (never larger than the payload
+# itself); every chunk is a view of it, so memory stays flat regardless of size_kb.
+def iter_big_payload(size_kb: int, chunk_size: int) -> Iterator[memoryview]:
+    remaining = payload_size(size_kb)
+    reps_per_chunk = max(min(chunk_size, remaining) // len(PAYLOAD_BASE_BYTES), 1)
+    buffer = memoryview(PAYLOAD_BASE_BYTES * reps_per_chunk)
+    while remaining > 0:
+        n = min(remaining, len(buffer))
+        yield buffer[:n]
+        remaining -= n
+
 
 # Utility to generate a big payload string
 def generate_big_string(size_kb: int):
-    base = "You may say I'm a dreamer, " \
-        "But I'm not the only one, " \
-        "I hope someday you'll join us, " \
-        "And the world will be as one"
-    repetitions = (size_kb * 1024) // len(base)
-    return base * repetitions
+    return generate_big_payload(size_kb).decode("ascii")
+
+
+class CallIdPool:
+    """uuid4-formatted ids cut from one os.urandom() batch per `batch_size` calls."""
+
+    def __init__(self, batch_size: int = 4096):
+        self.batch_size = batch_size
+        self._ids: list[str] = []
+        self._lock = Lock()
+
+    def _refill(self) -> None:
+        raw = os.urandom(16 * self.batch_size).hex()
+        ids = []
+        for i in range(0, len(raw), 32):
+            h = raw[i:i + 32]
+            # Set the version (4) and RFC 4122 variant nibbles like uuid4()
+            variant = "89ab"[int(h[16], 16) & 3]
+            ids.append(f"{h[:8]}-{h[8:12]}-4{h[13:16]}-{variant}{h[17:20]}-{h[20:]}")
+        self._ids = ids
+
+    def next(self) -> str:
+        try:
+            return self._ids.pop()
+        except IndexError:
+            with self._lock:
+                if not self._ids:
+                    self._refill()
+                return self._ids.pop()
+
+    def clear(self) -> None:
+        self._ids = []
+
+
+class CallIdCounter:
+    """Monotonic ids, unique per process: "<pid>-<start ns>-<n>" in hex."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._prefix = f"{os.getpid():x}-{time.time_ns():x}-"
+        self._counter = count()
+
+    def next(self) -> str:
+        return self._prefix + format(next(self._counter), "x")
+
+
+call_id_pool = CallIdPool()
+call_id_counter = CallIdCounter()
+
+# Forked workers must not hand out the parent's pre-drawn ids or counter
+os.register_at_fork(after_in_child=lambda: (call_id_pool.clear(), call_id_counter.reset()))
+
+
+def next_call_id() -> str:
+    if config.LOG_ID_MODE == "pool":
+        return call_id_pool.next()
+    if config.LOG_ID_MODE == "counter":
+        return call_id_counter.next()
+    return str(uuid4())
+
+
+_timestamp_cache: tuple[int, str] = (-1, "")
+
+
+def current_timestamp() -> str:
+    global _timestamp_cache
+    if not config.LOG_TIMESTAMP_CACHE:
+        return datetime.now(UTC).isoformat()
+    ms = time.time_ns() // 1_000_000
+    cached_ms, text = _timestamp_cache
+    if cached_ms != ms:
+        text = datetime.fromtimestamp(ms / 1000, UTC).isoformat(timespec="milliseconds")
+        _timestamp_cache = (ms, text)
+    return text
 
 
 # Utility to generate a basic log to include in responses
 def generate_log(metadata: dict[str, str]) -> dict[str, str]:
     return {
-        "call_id": str(uuid4()),
-        "timestamp": datetime.now(UTC).isoformat(),
+        "call_id": next_call_id(),
+        "timestamp": current_timestamp(),
         **metadata
     }
+
+
+# CPU-bound kernel for /simulate/cpu: the sha256 -> sha512 chain of
+# WorkloadBenchmark.run_crypto_workload, each round feeding the next.
+def crypto_chain(seed: str, iterations: int) -> str:
+    data = seed.encode()
+    for _ in range(iterations):
+        digest = hashlib.sha256(data).hexdigest()
+        data = hashlib.sha512(digest.encode()).hexdigest().encode()
+    return data.decode()
+
+
+_cpu_pool: ProcessPoolExecutor | None = None
+_cpu_pool_lock = Lock()
+
+
+def _set_pool_affinity(cpus: list[int]) -> None:
+    os.sched_setaffinity(0, cpus)
+
+
+# Process pool shared by the whole app, so CPU work is not capped by the GIL
+def get_cpu_pool() -> ProcessPoolExecutor:
+    global _cpu_pool
+    with _cpu_pool_lock:
+        if _cpu_pool is None:
+            cpus = parse_cpus(config.CPU_POOL_CPUS) if config.CPU_POOL_CPUS else None
+            _cpu_pool = ProcessPoolExecutor(
+                max_workers=config.CPU_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_set_pool_affinity if cpus else None,
+                initargs=(cpus,) if cpus else (),
+            )
+        return _cpu_pool
+
+
+def shutdown_cpu_pool() -> None:
+    global _cpu_pool
+    with _cpu_pool_lock:
+        if _cpu_pool is not None:
+            _cpu_pool.shutdown(cancel_futures=True)
+            _cpu_pool = None
+
+
+# Resident set size of this process, from /proc/self/statm when available
+def current_rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * mmap.PAGESIZE
+    except (OSError, IndexError, ValueError):
+        # Peak RSS only (KB on Linux), better than nothing
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def minor_page_faults() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+
+
+# Write one byte per page so the kernel actually backs the buffer
+def touch_pages(buffer: bytearray | mmap.mmap) -> None:
+    view = memoryview(buffer)
+    pages = len(range(0, len(view), mmap.PAGESIZE))
+    view[::mmap.PAGESIZE] = b"\x01" * pages
+    view.release()
+
+
+# Many short-lived allocations, `window` of them alive at any time
+def churn_allocations(count: int, size: int, window: int = 1024) -> None:
+    live: list[bytearray | None] = [None] * window
+    for i in range(count):
+        live[i % window] = bytearray(size)
+
+
+# Utility to simulate a delay according to config.DELAY_MODE
+async def simulate_delay(ms: int) -> None:
+    seconds = max(ms, 0) / 1000
+    if config.DELAY_MODE == "async":
+        await asyncio.sleep(seconds)
+    else:
+        # Same cost model as a plain `def` handler: one pool thread per request
+        await run_in_threadpool(time.sleep, seconds)
@@ -0,0 +1,253 @@
+"""
+Multi-worker launcher for the simulation API.
+
+Starts N uvicorn workers, each pinned to one CPU, either sharing a single
+listening socket or binding their own with SO_REUSEPORT (kernel-level load
+balancing). Per-worker counters live in a shared array and can be read as
+JSON from an optional stats port. The /metrics counters of every worker live
+in a second shared array, so any worker answering a scrape reports them all.
+
+    python -m app.launcher --workers 4 --cpus 0-3 --reuse-port --stats-port 9100
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+from app.cpus import format_cpus, parse_cpus
+
+# Per-worker slots in the shared stats array
+STAT_REQUESTS, STAT_ACTIVE, STAT_ERRORS = range(3)
+STAT_FIELDS = 3
+
+
+class WorkerStatsMiddleware:
+    """Counts requests for one worker in its own slot of a shared array.
+
+    Each slot is written by a single process from its event loop thread, so no
+    lock is needed; the launcher only reads.
+    """
+
+    def __init__(self, app, stats, slot: int):
+        self.app = app
+        self.stats = stats
+        self.base = slot * STAT_FIELDS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats, base = self.stats, self.base
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] >= 500:
+                stats[base + STAT_ERRORS] += 1
+            await send(message)
+
+        stats[base + STAT_ACTIVE] += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stats[base + STAT_ACTIVE] -= 1
+            stats[base + STAT_REQUESTS] += 1
+
+
+def bind_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    # Explicit IPPROTO_TCP: asyncio only enables TCP_NODELAY on accepted
+    # sockets whose proto says TCP, otherwise responses stall on Nagle
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def read_cpu_seconds(pid: int) -> float | None:
+    """utime + stime of `pid` from /proc, None when unavailable."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            fields = f.read().rsplit(b")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def metrics_registry(app):
+    """The app's MetricsRegistry (see app.app.create_app), None when disabled."""
+    return getattr(getattr(app, "state", None), "metrics", None)
+
+
+def run_worker(args: argparse.Namespace, slot: int, cpu: int | None, stats, sock: socket.socket | None,
+               metrics=None):
+    if cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    if sock is None:
+        sock = bind_socket(args.host, args.port, reuse_port=True)
+
+    asgi_app = import_from_string(args.app)
+    registry = metrics_registry(asgi_app)
+    if metrics is not None and registry is not None:
+        registry.share(metrics, slot, args.workers)
+    app = WorkerStatsMiddleware(asgi_app, stats, slot)
+    config = uvicorn.Config(app, log_level=args.log_level, access_log=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+class Launcher:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.ctx = multiprocessing.get_context("spawn")
+        self.stats = self.ctx.Array("q", args.workers * STAT_FIELDS, lock=False)
+        # Same route table as the workers build: they import the same app
+        registry = metrics_registry(import_from_string(args.app))
+        self.metrics = None if registry is None else self.ctx.Array(
+            "q", args.workers * registry.block_size, lock=False
+        )
+        available = sorted(os.sched_getaffinity(0))
+        self.cpus = parse_cpus(args.cpus) if args.cpus else available
+        self.processes: list[multiprocessing.Process] = []
+        self.worker_cpus: list[int | None] = []
+        self.started_at = time.time()
+        self.sock = None if args.reuse_port else bind_socket(args.host, args.port, reuse_port=False)
+
+    def pool_env(self) -> dict[str, str]:
+        """/simulate/cpu pool settings inherited by the workers.
+
+        Pools run on all launcher CPUs rather than the worker's pinned one, and
+        together hold about one process per CPU instead of one per CPU per
+        worker. Values already set in the environment win.
+        """
+        env = {"CPU_POOL_WORKERS": str(max(1, len(self.cpus) // self.args.workers))}
+        if not self.args.no_pin:
+            env["CPU_POOL_CPUS"] = format_cpus(self.cpus)
+        return {name: os.environ.get(name, value) for name, value in env.items()}
+
+    def start(self) -> None:
+        os.environ.update(self.pool_env())
+        for slot in range(self.args.workers):
+            cpu = None if self.args.no_pin else self.cpus[slot % len(self.cpus)]
+            process = self.ctx.Process(
+                target=run_worker,
+                args=(self.args, slot, cpu, self.stats, self.sock, self.metrics),
+                name=f"webapi-worker-{slot}",
+            )
+            process.start()
+            self.processes.append(process)
+            self.worker_cpus.append(cpu)
+
+    def snapshot(self) -> dict:
+        uptime = time.time() - self.started_at
+        workers = []
+        for slot, (process, cpu) in enumerate(zip(self.processes, self.worker_cpus)):
+            base = slot * STAT_FIELDS
+            requests = self.stats[base + STAT_REQUESTS]
+            workers.append({
+                "worker": slot,
+                "pid": process.pid,
+                "cpu": cpu,
+                "alive": process.is_alive(),
+                "requests": requests,
+                "active": self.stats[base + STAT_ACTIVE],
+                "errors": self.stats[base + STAT_ERRORS],
+                "requests_per_sec": round(requests / uptime, 2) if uptime > 0 else 0.0,
+                "cpu_seconds": read_cpu_seconds(process.pid),
+            })
+        return {
+            "uptime_seconds": round(uptime, 3),
+            "reuse_port": self.args.reuse_port,
+            "total_requests": sum(w["requests"] for w in workers),
+            "workers": workers,
+        }
+
+    def serve_stats(self, port: int) -> ThreadingHTTPServer:
+        launcher = self
+
+        class StatsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(launcher.snapshot()).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((self.args.host, port), StatsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def stop(self) -> None:
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            process.join(timeout=10)
+
+    def wait(self, stopping: threading.Event | None = None) -> dict:
+        """Run until SIGINT/SIGTERM (or `stopping`) or until every worker exits.
+
+        Returns the final snapshot, taken before the workers are stopped so it
+        still shows their liveness and CPU time.
+        """
+        if stopping is None:
+            stopping = threading.Event()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda *_: stopping.set())
+        while not stopping.is_set() and any(p.is_alive() for p in self.processes):
+            stopping.wait(0.5)
+        final = self.snapshot()
+        self.stop()
+        return final
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the simulation API on several pinned workers")
+    parser.add_argument("--app", default="app.main:app", help="ASGI app import string")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--cpus", default=os.getenv("WORKER_CPUS"),
+                        help="CPUs to pin workers to, e.g. '0-3' (default: current affinity)")
+    parser.add_argument("--no-pin", action="store_true", help="Do not pin workers to CPUs")
+    parser.add_argument("--reuse-port", action="store_true",
+                        help="Each worker binds its own SO_REUSEPORT socket")
+    parser.add_argument("--stats-port", type=int, default=None,
+                        help="Serve per-worker stats as JSON on this port")
+    parser.add_argument("--log-level", default=os.getenv("LOG_LEVEL", "warning"))
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be >= 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    launcher = Launcher(args)
+    launcher.start()
+    if args.stats_port:
+        launcher.serve_stats(args.stats_port)
+
+    mode = "SO_REUSEPORT" if args.reuse_port else "shared socket"
+    print(f"Started {args.workers} workers on {args.host}:{args.port} ({mode}), "
+          f"CPUs {launcher.worker_cpus}")
+    final = launcher.wait()
+    print(json.dumps(final, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,13 +1,2 @@
-from fastapi import FastAPI
-from app.routes import simulation_routes
-
-
-app = FastAPI()
-
-
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to fake API"}
-
-
-app.include_router(simulation_routes.router)
+# Entry point used by uvicorn (`uvicorn app.main:app`)
+from app.app import app, create_app  # noqa: F401
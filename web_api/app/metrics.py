@@ -0,0 +1,188 @@
+import os
+import time
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+UNMATCHED_ROUTE = "__unmatched__"
+# Unmatched requests are kept per method; anything else is counted as OTHER
+HTTP_METHODS = ("DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT")
+OTHER_METHOD = "OTHER"
+
+# Layout of one (method, route) row of int64 counters: latency buckets (+Inf
+# last), status classes (0 = unknown, 1xx .. 5xx), count, duration sum in ns,
+# request and response body bytes
+STATUS_AT = len(LATENCY_BUCKETS) + 1
+COUNT_AT = STATUS_AT + 6
+DURATION_NS_AT = COUNT_AT + 1
+BYTES_IN_AT = DURATION_NS_AT + 1
+BYTES_OUT_AT = BYTES_IN_AT + 1
+ROW_FIELDS = BYTES_OUT_AT + 1
+
+
+def route_keys(app) -> list[tuple[str, str]]:
+    """(method, path template) pairs served by `app`."""
+    return sorted(set(_walk_routes(app.routes)))
+
+
+def _walk_routes(routes, prefix: str = "") -> Iterator[tuple[str, str]]:
+    for route in routes:
+        methods = getattr(route, "methods", None)
+        if methods and getattr(route, "path", None) is not None:
+            yield from ((method, prefix + route.path) for method in methods)
+        # Recent FastAPI keeps include_router() routers as a single entry
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            context = getattr(route, "include_context", None)
+            yield from _walk_routes(included.routes, prefix + getattr(context, "prefix", ""))
+
+
+class MetricsRegistry:
+    """Request metrics over a fixed (method, route) table.
+
+    Counters live in a flat int64 buffer with one block of rows per worker. A
+    standalone process uses a private buffer; under app.launcher every worker
+    writes its own block of one shared array (see share()), so whichever
+    worker answers a scrape reports all of them. Each block is written only
+    by its worker's event loop thread (ASGI middleware runs on the loop), so
+    no lock is taken per request.
+    """
+
+    def __init__(self, keys: Iterable[tuple[str, str]] = ()):
+        # Sorted, so that every worker of the same app gets the same layout
+        unmatched = {(method, UNMATCHED_ROUTE) for method in HTTP_METHODS + (OTHER_METHOD,)}
+        self.keys = sorted(set(keys) | unmatched)
+        self.rows = {key: i * ROW_FIELDS for i, key in enumerate(self.keys)}
+        self.block_size = len(self.keys) * ROW_FIELDS
+        self.values = memoryview(array("q", bytes(8 * self.block_size)))
+        self.base = 0
+        self.worker_labels = [str(os.getpid())]
+
+    def share(self, values, slot: int, workers: int) -> None:
+        """Write into block `slot` of `values`, a shared int64 buffer of
+        `workers` blocks (e.g. multiprocessing Array("q", workers * block_size)).
+        """
+        view = memoryview(values).cast("B").cast("q")
+        if len(view) != workers * self.block_size:
+            raise ValueError(f"shared metrics buffer holds {len(view)} counters, "
+                             f"expected {workers} x {self.block_size}")
+        self.values = view
+        self.base = slot * self.block_size
+        self.worker_labels = [str(i) for i in range(workers)]
+
+    def _row(self, method: str, route: str) -> int:
+        row = self.rows.get((method, route))
+        if row is None:
+            # Not in the table (e.g. 405 on a known path): count it as unmatched
+            row = self.rows.get((method, UNMATCHED_ROUTE))
+            if row is None:
+                row = self.rows[(OTHER_METHOD, UNMATCHED_ROUTE)]
+        return row
+
+    def record(self, method: str, route: str, status: int, duration: float, bytes_in: int, bytes_out: int) -> None:
+        values = self.values
+        offset = self.base + self._row(method, route)
+        values[offset + bisect_left(LATENCY_BUCKETS, duration)] += 1
+        values[offset + STATUS_AT + (status // 100 if 100 <= status < 600 else 0)] += 1
+        values[offset + COUNT_AT] += 1
+        values[offset + DURATION_NS_AT] += int(duration * 1e9)
+        values[offset + BYTES_IN_AT] += bytes_in
+        values[offset + BYTES_OUT_AT] += bytes_out
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        duration = "optivolt_http_request_duration_seconds"
+        lines = [
+            f"# HELP {duration} Request latency per route.",
+            f"# TYPE {duration} histogram",
+        ]
+        requests, bytes_in, bytes_out = [], [], []
+        values = self.values
+        for slot, worker in enumerate(self.worker_labels):
+            for (method, route), row in self.rows.items():
+                offset = slot * self.block_size + row
+                count = values[offset + COUNT_AT]
+                if not count:
+                    continue
+                labels = f'worker="{worker}",method="{method}",route="{_escape(route)}"'
+                cumulative = 0
+                for i, bound in enumerate(LATENCY_BUCKETS):
+                    cumulative += values[offset + i]
+                    lines.append(f'{duration}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{duration}_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f"{duration}_sum{{{labels}}} {values[offset + DURATION_NS_AT] / 1e9}")
+                lines.append(f"{duration}_count{{{labels}}} {count}")
+                for i in range(6):
+                    n = values[offset + STATUS_AT + i]
+                    if n:
+                        code = f"{i}xx" if i else "unknown"
+                        requests.append(f'optivolt_http_requests_total{{{labels},status="{code}"}} {n}')
+                bytes_in.append(f"optivolt_http_request_bytes_total{{{labels}}} {values[offset + BYTES_IN_AT]}")
+                bytes_out.append(f"optivolt_http_response_bytes_total{{{labels}}} {values[offset + BYTES_OUT_AT]}")
+
+        for name, kind, help_text, samples in (
+            ("optivolt_http_requests_total", "counter", "Requests per route and status class.", requests),
+            ("optivolt_http_request_bytes_total", "counter", "Request body bytes received.", bytes_in),
+            ("optivolt_http_response_bytes_total", "counter", "Response body bytes sent.", bytes_out),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware feeding a MetricsRegistry.
+
+    Routes are labelled with their path template (scope["route"]), so
+    `/simulate/heavy?size_kb=...` stays a single series.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        bytes_in = bytes_out = 0
+        status = 0
+
+        async def receive_wrapper():
+            nonlocal bytes_in
+            message = await receive()
+            bytes_in += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal bytes_out, status
+            if message["type"] == "http.response.body":
+                bytes_out += len(message.get("body", b""))
+            elif message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.registry.record(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status or 500,
+                time.perf_counter() - start,
+                bytes_in,
+                bytes_out,
+            )
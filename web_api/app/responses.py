@@ -0,0 +1,89 @@
+import json
+import warnings
+from typing import Any, AsyncIterator, Iterable, Mapping, Sequence
+
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+try:
+    import orjson
+except ImportError:  # optional dependency, see pyproject [fast-json]
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (bytes output, no str round-trip)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
+
+def get_json_response_class(encoder: str) -> type[JSONResponse]:
+    """Resolve a config.JSON_ENCODER value to a response class."""
+    if encoder == "stdlib":
+        return JSONResponse
+    if orjson is None:
+        if encoder == "orjson":
+            warnings.warn("JSON_ENCODER=orjson but orjson is not installed, using stdlib json")
+        return JSONResponse
+    return FastJSONResponse
+
+
+class ChunkedJSONResponse(Response):
+    """JSON response made of already-serialized byte chunks.
+
+    Chunks are handed to the server one by one instead of being joined into a
+    single body, so large cached buffers are sent without being copied.
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        chunks: Sequence[bytes],
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        self.chunks = chunks
+        headers = {**(headers or {}), "content-length": str(sum(len(c) for c in chunks))}
+        super().__init__(None, status_code, headers, background=background)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        last = len(self.chunks) - 1
+        for i, chunk in enumerate(self.chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < last})
+        if last < 0:
+            await send({"type": "http.response.body", "body": b""})
+
+        if self.background is not None:
+            await self.background()
+
+
+def _splice_prefix(head: dict[str, Any], key: str, inner_key: str) -> bytes:
+    prefix = json.dumps(head, ensure_ascii=False, separators=(",", ":"))[:-1]
+    prefix += "," + json.dumps(key) + ":{" + json.dumps(inner_key) + ':"'
+    return prefix.encode()
+
+
+def spliced_json_response(head: dict[str, Any], key: str, inner_key: str, raw: bytes) -> ChunkedJSONResponse:
+    """Build `{**head, key: {inner_key: raw}}` without re-serializing `raw`.
+
+    `raw` must already be valid JSON string content (no quotes, backslashes
+    or control characters), which holds for the generated payloads.
+    """
+    return ChunkedJSONResponse([_splice_prefix(head, key, inner_key), raw, b'"}}'])
+
+
+def spliced_json_stream(
+    head: dict[str, Any], key: str, inner_key: str, raw_chunks: Iterable[bytes | memoryview]
+) -> StreamingResponse:
+    """Streaming variant of `spliced_json_response`, `raw` arrives in chunks."""
+    async def body() -> AsyncIterator[bytes | memoryview]:
+        yield _splice_prefix(head, key, inner_key)
+        for chunk in raw_chunks:
+            yield chunk
+        yield b'"}}'
+
+    return StreamingResponse(body(), media_type="application/json")
@@ -1,7 +1,27 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
-from app.helpers import generate_log, generate_big_string
+import asyncio
+import mmap
 import time
+from typing import Literal
+
+from fastapi import APIRouter, Query
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from app import config
+from app.helpers import (
+    churn_allocations,
+    crypto_chain,
+    current_rss_bytes,
+    generate_big_payload,
+    generate_big_string,
+    generate_log,
+    get_cpu_pool,
+    iter_big_payload,
+    minor_page_faults,
+    payload_size,
+    simulate_delay,
+    touch_pages,
+)
+from app.responses import spliced_json_response, spliced_json_stream
 
 router = APIRouter()
 
@@ -29,22 +49,113 @@ def get_normal():
 
 
 @router.get("/simulate/heavy")
-def get_heavy(size_kb: int = 500):
-    data = {"payload": generate_big_string(size_kb)}
+def get_heavy(
+    size_kb: int = 500,
+    stream: bool = False,
+    chunk_size: int = Query(config.STREAM_CHUNK_SIZE, ge=1, le=config.STREAM_CHUNK_MAX_SIZE),
+):
     log = generate_log({
         "type": "GET",
         "response_size_kb": size_kb
     })
+    if stream:
+        chunks = iter_big_payload(size_kb, chunk_size)
+        return spliced_json_stream(log, "response", "payload", chunks)
+    if config.PRESERIALIZED_RESPONSES:
+        return spliced_json_response(log, "response", "payload", generate_big_payload(size_kb))
+    data = {"payload": generate_big_string(size_kb)}
     return {**log, "response": data}
 
 
 @router.get("/simulate/delay")
-def get_delay(ms: int = 500):
-    time.sleep(ms / 1000)
+async def get_delay(ms: int = 500):
+    await simulate_delay(ms)
     log = generate_log({"type": "GET", "delay_ms": ms})
     return {**log, "response": f"Simulated delay of {ms} ms"}
 
 
+@router.get("/simulate/cpu")
+async def get_cpu(
+    iterations: int = Query(10000, ge=1, le=10_000_000),
+    parallelism: int = Query(1, ge=1, le=256),
+):
+    # Split the hash chain into `parallelism` tasks on the shared process pool
+    loop = asyncio.get_running_loop()
+    pool = get_cpu_pool()
+    share, extra = divmod(iterations, parallelism)
+    counts = [share + (1 if i < extra else 0) for i in range(parallelism)]
+
+    start = time.perf_counter()
+    digests = await asyncio.gather(*(
+        loop.run_in_executor(pool, crypto_chain, f"optivolt-{i}", n)
+        for i, n in enumerate(counts) if n > 0
+    ))
+    elapsed = time.perf_counter() - start
+
+    log = generate_log({
+        "type": "GET",
+        "iterations": iterations,
+        "parallelism": parallelism
+    })
+    return {
+        **log,
+        "response": {
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "iterations_per_sec": round(iterations / elapsed, 2) if elapsed > 0 else None,
+            "digests": digests
+        }
+    }
+
+
+@router.get("/simulate/memory")
+async def get_memory(
+    mode: Literal["hold", "churn", "touch"] = "hold",
+    size_mb: int = Query(64, ge=0, le=config.MEMORY_SIM_MAX_MB),
+    hold_ms: int = Query(100, ge=0),
+    allocations: int = Query(100_000, ge=0, le=10_000_000),
+    alloc_bytes: int = Query(256, ge=1, le=1024 * 1024),
+):
+    size = size_mb * 1024 * 1024
+    rss_before = current_rss_bytes()
+    faults_before = minor_page_faults()
+    start = time.perf_counter()
+
+    if mode == "hold":
+        # Allocate, back every page, keep it for hold_ms, then release
+        buffer = await run_in_threadpool(bytearray, size)
+        await run_in_threadpool(touch_pages, buffer)
+        rss_peak = current_rss_bytes()
+        await simulate_delay(hold_ms)
+        del buffer
+    elif mode == "churn":
+        await run_in_threadpool(churn_allocations, allocations, alloc_bytes)
+        rss_peak = current_rss_bytes()
+        size = allocations * alloc_bytes
+    else:
+        # Anonymous mapping: page-fault cost of first touch, then unmap
+        mapping = mmap.mmap(-1, max(size, mmap.PAGESIZE))
+        await run_in_threadpool(touch_pages, mapping)
+        rss_peak = current_rss_bytes()
+        mapping.close()
+
+    elapsed = time.perf_counter() - start
+    log = generate_log({
+        "type": "GET",
+        "mode": mode,
+        "allocated_bytes": size
+    })
+    return {
+        **log,
+        "response": {
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "rss_before_kb": rss_before // 1024,
+            "rss_peak_kb": rss_peak // 1024,
+            "rss_after_kb": current_rss_bytes() // 1024,
+            "minor_page_faults": minor_page_faults() - faults_before
+        }
+    }
+
+
 # 🔷 POST endpoints
 
 @router.post("/simulate/normal")
@@ -63,8 +174,7 @@ def post_normal(payload: Payload):
 
 @router.post("/simulate/heavy")
 def post_heavy(payload: HeavyPayload):
-    content = generate_big_string(payload.size_kb)
-    size = len(content.encode())
+    size = payload_size(payload.size_kb)
     log = generate_log({
         "type": "POST",
         "received_size_kb": size // 1024,
@@ -79,9 +189,9 @@ def post_heavy(payload: HeavyPayload):
 
 
 @router.post("/simulate/delay")
-def post_delay(payload: DelayPayload):
-    time.sleep(payload.delay_ms / 1000)
-    
+async def post_delay(payload: DelayPayload):
+    await simulate_delay(payload.delay_ms)
+
     log = generate_log({
         "type": "POST",
         "delay_ms": payload.delay_ms
@@ -103,12 +213,12 @@ def api_light():
 @router.get("/api/heavy")
 def api_heavy():
     """Heavy payload endpoint for performance testing"""
-    data = generate_big_string(500)  # 500 KB
-    return {"status": "ok", "message": "Heavy response", "size_kb": 500, "data": data[:100]}
+    data = generate_big_payload(500)  # 500 KB
+    return {"status": "ok", "message": "Heavy response", "size_kb": 500, "data": data[:100].decode("ascii")}
 
 
 @router.get("/api/slow")
-def api_slow():
+async def api_slow():
     """Endpoint with artificial delay for latency testing"""
-    time.sleep(1)  # 1 second delay
+    await simulate_delay(1000)  # 1 second delay
     return {"status": "ok", "message": "Slow response", "delay_ms": 1000}
@@ -0,0 +1,45 @@
+"""
+Benchmark: pre-serialized vs dict-based /simulate/heavy responses.
+
+Run from web_api/:  python tests/bench_heavy_response.py [requests] [size_kb]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from starlette.testclient import TestClient  # noqa: E402
+
+from app import config  # noqa: E402
+from app.app import app  # noqa: E402
+
+
+def measure(client: TestClient, url: str, requests: int) -> float:
+    client.get(url)  # warm the payload cache
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(url)
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> int:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    url = f"/simulate/heavy?size_kb={size_kb}"
+    client = TestClient(app)
+
+    results = {}
+    for mode in (False, True):
+        config.PRESERIALIZED_RESPONSES = mode
+        results[mode] = measure(client, url, requests)
+
+    print(f"GET {url} ({requests} requests)")
+    print(f"  dict + json.dumps : {results[False]:8.1f} req/s")
+    print(f"  pre-serialized    : {results[True]:8.1f} req/s")
+    print(f"  speedup           : {results[True] / results[False]:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Benchmark: stdlib json vs orjson as the app's default response class.
+
+Run from web_api/:  python tests/bench_json_encoders.py [requests]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from starlette.testclient import TestClient  # noqa: E402
+
+from app import config, responses  # noqa: E402
+from app.app import create_app  # noqa: E402
+
+ENDPOINTS = ["/api/light", "/simulate/normal", "/simulate/heavy?size_kb=100"]
+
+
+def measure(client: TestClient, url: str, requests: int) -> float:
+    client.get(url)
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(url)
+    return requests / (time.perf_counter() - start)
+
+
+def main() -> int:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    if responses.orjson is None:
+        print("orjson is not installed (pip install '.[fast-json]'), nothing to compare")
+        return 0
+
+    # Exercise the encoder on /simulate/heavy instead of the pre-serialized path
+    config.PRESERIALIZED_RESPONSES = False
+    clients = {enc: TestClient(create_app(enc)) for enc in ("stdlib", "orjson")}
+
+    print(f"{'endpoint':32s} {'stdlib req/s':>14s} {'orjson req/s':>14s} {'speedup':>8s}")
+    for url in ENDPOINTS:
+        n = requests if "heavy" not in url else max(requests // 10, 1)
+        rps = {enc: measure(client, url, n) for enc, client in clients.items()}
+        print(f"{url:32s} {rps['stdlib']:14.1f} {rps['orjson']:14.1f} {rps['orjson'] / rps['stdlib']:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
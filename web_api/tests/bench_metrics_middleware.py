@@ -0,0 +1,71 @@
+"""
+Benchmark: per-request overhead of MetricsMiddleware.
+
+Drives a no-op ASGI app directly (no HTTP, no routing) with and without the
+middleware and reports the difference per request. Target: < 5 us.
+
+Run from web_api/:  python tests/bench_metrics_middleware.py [requests]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.metrics import MetricsMiddleware, MetricsRegistry  # noqa: E402
+
+BUDGET_US = 5.0
+
+
+class FakeRoute:
+    path = "/api/light"
+
+
+START = {"type": "http.response.start", "status": 200, "headers": []}
+BODY = {"type": "http.response.body", "body": b'{"status":"ok"}'}
+
+
+async def endpoint(scope, receive, send):
+    scope["route"] = FakeRoute
+    await receive()
+    await send(START)
+    await send(BODY)
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+async def run(app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/light"}
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main_async(requests: int) -> float:
+    middleware = MetricsMiddleware(endpoint, MetricsRegistry([("GET", FakeRoute.path)]))
+    await run(middleware, 1000)
+    baseline = min([await run(endpoint, requests) for _ in range(5)])
+    wrapped = min([await run(middleware, requests) for _ in range(5)])
+    overhead = wrapped - baseline
+    print(f"no middleware   : {baseline:6.2f} us/request")
+    print(f"with middleware : {wrapped:6.2f} us/request")
+    print(f"overhead        : {overhead:6.2f} us/request (budget {BUDGET_US} us)")
+    return overhead
+
+
+def main() -> int:
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    overhead = asyncio.run(main_async(requests))
+    return 0 if overhead < BUDGET_US else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
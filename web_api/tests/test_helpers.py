@@ -0,0 +1,134 @@
+import pytest
+
+from app.helpers import (
+    CallIdCounter,
+    CallIdPool,
+    PAYLOAD_BASE,
+    PayloadCache,
+    generate_big_string,
+    generate_log,
+    iter_big_payload,
+    payload_size,
+)
+
+
+def test_generate_big_string_matches_repeated_base():
+    expected = PAYLOAD_BASE * ((100 * 1024) // len(PAYLOAD_BASE))
+    assert generate_big_string(100) == expected
+
+
+def test_payload_size_matches_encoded_length():
+    for size_kb in (0, 1, 100, 500):
+        assert payload_size(size_kb) == len(generate_big_string(size_kb).encode())
+    assert payload_size(-10) == 0
+
+
+def test_payload_cache_returns_shared_bytes():
+    cache = PayloadCache(max_bytes=1024 * 1024)
+    first = cache.get(10)
+    assert isinstance(first, bytes)
+    assert cache.get(10) is first
+    assert cache.current_bytes == len(first)
+
+
+def test_payload_cache_evicts_least_recently_used():
+    cache = PayloadCache(max_bytes=payload_size(10) * 2)
+    a = cache.get(10)
+    cache.get(5)
+    cache.get(10)      # 10 becomes most recently used
+    cache.get(8)       # evicts 5
+    assert cache.current_bytes <= cache.max_bytes
+    assert cache.get(10) is a
+    assert 5 not in cache._entries
+
+
+def test_payload_cache_skips_oversized_payloads():
+    cache = PayloadCache(max_bytes=1024)
+    payload = cache.get(100)
+    assert len(payload) == payload_size(100)
+    assert cache.current_bytes == 0
+
+
+def test_iter_big_payload_reuses_one_buffer():
+    chunks = list(iter_big_payload(200, 4096))
+    assert b"".join(chunks) == generate_big_string(200).encode()
+    assert all(c.obj is chunks[0].obj for c in chunks)
+    assert all(len(c) <= 4096 for c in chunks)
+
+
+def test_iter_big_payload_buffer_never_exceeds_the_payload():
+    chunks = list(iter_big_payload(1, 500_000_000))
+    assert b"".join(chunks) == generate_big_string(1).encode()
+    assert len(chunks[0].obj) <= payload_size(1)
+    assert list(iter_big_payload(0, 4096)) == []
+
+
+def test_json_response_class_selection(monkeypatch):
+    from starlette.responses import JSONResponse
+    from app import responses
+
+    assert responses.get_json_response_class("stdlib") is JSONResponse
+    if responses.orjson is not None:
+        assert responses.get_json_response_class("auto") is responses.FastJSONResponse
+
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.get_json_response_class("auto") is JSONResponse
+    with pytest.warns(UserWarning):
+        assert responses.get_json_response_class("orjson") is JSONResponse
+
+
+def test_create_app_encoders_produce_same_json():
+    from starlette.testclient import TestClient
+    from app.app import create_app
+
+    for path in ("/api/light", "/simulate/normal"):
+        bodies = [TestClient(create_app(enc)).get(path).json() for enc in ("stdlib", "orjson")]
+        bodies = [{k: v for k, v in b.items() if k not in ("call_id", "timestamp")} for b in bodies]
+        assert bodies[0] == bodies[1]
+
+
+def test_call_id_pool_produces_unique_uuid4():
+    from uuid import UUID
+    pool = CallIdPool(batch_size=64)
+    ids = [pool.next() for _ in range(200)]
+    assert len(set(ids)) == 200
+    for call_id in ids:
+        parsed = UUID(call_id)
+        assert parsed.version == 4
+        assert str(parsed) == call_id
+
+
+def test_call_id_counter_is_unique_and_monotonic():
+    counter = CallIdCounter()
+    ids = [counter.next() for _ in range(100)]
+    assert len(set(ids)) == 100
+    assert [int(i.rsplit("-", 1)[1], 16) for i in ids] == list(range(100))
+
+
+def test_cpu_pool_processes_leave_the_worker_cpu(monkeypatch):
+    import os
+    from app import config, helpers
+
+    cpus = sorted(os.sched_getaffinity(0))
+    monkeypatch.setattr(config, "CPU_POOL_WORKERS", 1)
+    monkeypatch.setattr(config, "CPU_POOL_CPUS", ",".join(map(str, cpus)))
+    helpers.shutdown_cpu_pool()
+    # Pinned like a launcher worker; the pool must not inherit that mask
+    os.sched_setaffinity(0, cpus[:1])
+    try:
+        pool = helpers.get_cpu_pool()
+        assert sorted(pool.submit(os.sched_getaffinity, 0).result(timeout=30)) == cpus
+    finally:
+        os.sched_setaffinity(0, cpus)
+        helpers.shutdown_cpu_pool()
+
+
+@pytest.mark.parametrize("mode", ["uuid", "pool", "counter"])
+def test_generate_log_keys_for_each_id_mode(monkeypatch, mode):
+    from datetime import datetime
+    from app import config
+    monkeypatch.setattr(config, "LOG_ID_MODE", mode)
+    log = generate_log({"type": "GET"})
+    assert list(log) == ["call_id", "timestamp", "type"]
+    assert datetime.fromisoformat(log["timestamp"]).tzinfo is not None
+    assert generate_log({})["call_id"] != log["call_id"]
@@ -0,0 +1,70 @@
+import threading
+import time
+from array import array
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.app import app
+from app.launcher import (
+    STAT_ACTIVE,
+    STAT_ERRORS,
+    STAT_FIELDS,
+    STAT_REQUESTS,
+    Launcher,
+    WorkerStatsMiddleware,
+    parse_args,
+    parse_cpus,
+)
+
+
+def test_parse_cpus():
+    assert parse_cpus("0-3,6, 8-9") == [0, 1, 2, 3, 6, 8, 9]
+    assert parse_cpus("2") == [2]
+    with pytest.raises(ValueError):
+        parse_cpus(",")
+
+
+def test_worker_stats_middleware_counts_requests_in_own_slot():
+    stats = array("q", [0] * (2 * STAT_FIELDS))
+    client = TestClient(WorkerStatsMiddleware(app, stats, slot=1))
+    for _ in range(3):
+        assert client.get("/api/light").status_code == 200
+    assert stats[STAT_FIELDS + STAT_REQUESTS] == 3
+    assert stats[STAT_FIELDS + STAT_ACTIVE] == 0
+    assert stats[STAT_FIELDS + STAT_ERRORS] == 0
+    assert list(stats[:STAT_FIELDS]) == [0, 0, 0]
+
+
+def test_pool_env_spreads_worker_pools_over_launcher_cpus(monkeypatch):
+    monkeypatch.delenv("CPU_POOL_WORKERS", raising=False)
+    monkeypatch.delenv("CPU_POOL_CPUS", raising=False)
+    launcher = Launcher(parse_args(["--workers", "2", "--cpus", "0-3", "--reuse-port"]))
+    assert launcher.pool_env() == {"CPU_POOL_WORKERS": "2", "CPU_POOL_CPUS": "0,1,2,3"}
+
+    monkeypatch.setenv("CPU_POOL_WORKERS", "8")
+    assert launcher.pool_env()["CPU_POOL_WORKERS"] == "8"
+
+    unpinned = Launcher(parse_args(["--workers", "8", "--cpus", "0-3", "--reuse-port", "--no-pin"]))
+    assert "CPU_POOL_CPUS" not in unpinned.pool_env()
+
+
+def test_final_snapshot_is_taken_before_workers_stop():
+    launcher = Launcher(parse_args(["--workers", "1", "--reuse-port"]))
+    worker = launcher.ctx.Process(target=time.sleep, args=(30,))
+    worker.start()
+    launcher.processes.append(worker)
+    launcher.worker_cpus.append(None)
+    stopping = threading.Event()
+    stopping.set()
+
+    final = launcher.wait(stopping)
+    assert final["workers"][0]["alive"] is True
+    assert final["workers"][0]["cpu_seconds"] is not None
+    assert not worker.is_alive()
+
+
+def test_launcher_allocates_shared_metrics_for_every_worker():
+    launcher = Launcher(parse_args(["--workers", "3", "--reuse-port"]))
+    registry = app.state.metrics
+    assert len(launcher.metrics) == 3 * registry.block_size
@@ -0,0 +1,74 @@
+import multiprocessing
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.app import create_app
+from app.metrics import LATENCY_BUCKETS, OTHER_METHOD, UNMATCHED_ROUTE, MetricsRegistry
+
+
+def test_registry_buckets_are_cumulative_in_output():
+    registry = MetricsRegistry([("GET", "/api/light")])
+    registry.record("GET", "/api/light", 200, 0.0003, 0, 10)
+    registry.record("GET", "/api/light", 200, 0.02, 0, 10)
+    registry.record("GET", "/api/light", 503, 20.0, 0, 5)
+    text = registry.render_prometheus()
+    labels = f'worker="{registry.worker_labels[0]}",method="GET",route="/api/light"'
+    assert f'optivolt_http_request_duration_seconds_bucket{{{labels},le="{LATENCY_BUCKETS[0]}"}} 1' in text
+    assert f'optivolt_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 2' in text
+    assert f'optivolt_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f'optivolt_http_requests_total{{{labels},status="5xx"}} 1' in text
+    assert f"optivolt_http_response_bytes_total{{{labels}}} 25" in text
+
+
+def test_metrics_endpoint_reports_route_templates_and_bytes():
+    client = TestClient(create_app())
+    client.get("/simulate/heavy?size_kb=1")
+    client.get("/simulate/heavy?size_kb=2")
+    client.post("/simulate/normal", json={"content": "abc"})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'route="/simulate/heavy"} 2' in text  # one series for both query strings
+    assert 'optivolt_http_request_bytes_total{' in text
+    assert 'method="POST",route="/simulate/normal"} 17' in text
+
+
+def test_unknown_route_or_method_is_counted_as_unmatched():
+    registry = MetricsRegistry([("GET", "/api/light")])
+    registry.record("POST", "/api/light", 405, 0.001, 0, 0)
+    registry.record("BREW", "/coffee", 418, 0.001, 0, 0)
+    text = registry.render_prometheus()
+    assert f'method="POST",route="{UNMATCHED_ROUTE}",status="4xx"}} 1' in text
+    assert f'method="{OTHER_METHOD}",route="{UNMATCHED_ROUTE}",status="4xx"}} 1' in text
+
+
+def _record_in_worker(values, slot, workers):
+    registry = create_app().state.metrics
+    registry.share(values, slot, workers)
+    registry.record("GET", "/api/light", 200, 0.002, 0, 15)
+
+
+def test_every_worker_reports_all_workers_through_shared_counters():
+    ctx = multiprocessing.get_context("spawn")
+    app = create_app()
+    registry = app.state.metrics
+    values = ctx.Array("q", 2 * registry.block_size, lock=False)
+    registry.share(values, 0, 2)
+    worker = ctx.Process(target=_record_in_worker, args=(values, 1, 2))
+    worker.start()
+    worker.join()
+    assert worker.exitcode == 0
+
+    client = TestClient(app)
+    client.get("/metrics")
+    text = client.get("/metrics").text
+    for slot in ("0", "1"):
+        # Slot 1 only served /api/light; slot 0 served the first scrape
+        assert f'worker="{slot}",method="GET"' in text
+    assert 'optivolt_http_request_duration_seconds_count{worker="1",method="GET",route="/api/light"} 1' in text
+    assert 'optivolt_http_response_bytes_total{worker="1",method="GET",route="/api/light"} 15' in text
+
+    with pytest.raises(ValueError):
+        MetricsRegistry().share(values, 0, 2)
@@ -1,5 +1,12 @@
+import asyncio
+import time
+
+import httpx
+import pytest
 from starlette.testclient import TestClient
+from app import config
 from app.app import app
+from app.helpers import payload_size
 
 client = TestClient(app)
 
@@ -87,3 +94,99 @@ def test_post_simulate_delay_custom():
     json_data = response.json()
     assert json_data["delay_ms"] == 150
     assert json_data["received_preview"].startswith("custom")
+
+
+
+def test_get_simulate_delay_async_mode(monkeypatch):
+    monkeypatch.setattr(config, "DELAY_MODE", "async")
+    monkeypatch.setattr(time, "sleep", lambda s: pytest.fail("time.sleep called in async mode"))
+    response = client.get("/simulate/delay?ms=10")
+    assert response.status_code == 200
+    assert response.json()["delay_ms"] == 10
+
+
+def test_simulate_delay_async_mode_concurrency(monkeypatch):
+    monkeypatch.setattr(config, "DELAY_MODE", "async")
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(*(ac.get("/simulate/delay?ms=200") for _ in range(100)))
+
+    start = time.perf_counter()
+    responses = asyncio.run(burst())
+    elapsed = time.perf_counter() - start
+    assert all(r.status_code == 200 for r in responses)
+    # 100 concurrent delays finish together instead of in thread-pool waves
+    assert elapsed < 2
+
+
+def test_get_simulate_heavy_preserialized_matches_dict_response(monkeypatch):
+    monkeypatch.setattr(config, "PRESERIALIZED_RESPONSES", True)
+    fast = client.get("/simulate/heavy?size_kb=50")
+    monkeypatch.setattr(config, "PRESERIALIZED_RESPONSES", False)
+    slow = client.get("/simulate/heavy?size_kb=50")
+    assert fast.status_code == slow.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert int(fast.headers["content-length"]) == len(fast.content)
+    fast_json, slow_json = fast.json(), slow.json()
+    assert list(fast_json) == list(slow_json)
+    assert fast_json["response"] == slow_json["response"]
+    assert fast_json["response_size_kb"] == 50
+
+
+def test_get_simulate_heavy_stream_matches_buffered():
+    buffered = client.get("/simulate/heavy?size_kb=300").json()
+    streamed = client.get("/simulate/heavy?size_kb=300&stream=true&chunk_size=1000")
+    assert streamed.status_code == 200
+    assert "content-length" not in streamed.headers
+    assert streamed.json()["response"] == buffered["response"]
+
+
+def test_get_simulate_heavy_stream_invalid_chunk_size():
+    response = client.get("/simulate/heavy?stream=true&chunk_size=0")
+    assert response.status_code == 422
+
+
+def test_get_simulate_heavy_stream_oversized_chunk_size():
+    too_big = config.STREAM_CHUNK_MAX_SIZE + 1
+    response = client.get(f"/simulate/heavy?size_kb=1&stream=true&chunk_size={too_big}")
+    assert response.status_code == 422
+    largest = client.get(f"/simulate/heavy?size_kb=1&stream=true&chunk_size={config.STREAM_CHUNK_MAX_SIZE}")
+    assert largest.status_code == 200
+    assert len(largest.json()["response"]["payload"]) == payload_size(1)
+
+
+def test_get_simulate_cpu_parallel():
+    from app.helpers import crypto_chain
+    response = client.get("/simulate/cpu?iterations=101&parallelism=4")
+    assert response.status_code == 200
+    json_data = response.json()
+    assert json_data["iterations"] == 101
+    assert json_data["parallelism"] == 4
+    assert json_data["response"]["digests"][0] == crypto_chain("optivolt-0", 26)
+    assert len(json_data["response"]["digests"]) == 4
+    assert json_data["response"]["iterations_per_sec"] > 0
+
+
+def test_get_simulate_cpu_invalid_parallelism():
+    response = client.get("/simulate/cpu?parallelism=0")
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("mode", ["hold", "churn", "touch"])
+def test_get_simulate_memory_modes(mode):
+    response = client.get(f"/simulate/memory?mode={mode}&size_mb=8&hold_ms=0&allocations=1000")
+    assert response.status_code == 200
+    json_data = response.json()
+    assert json_data["mode"] == mode
+    result = json_data["response"]
+    for key in ("rss_before_kb", "rss_peak_kb", "rss_after_kb", "minor_page_faults", "elapsed_ms"):
+        assert result[key] >= 0
+    if mode != "churn":
+        assert result["minor_page_faults"] > 0
+
+
+def test_get_simulate_memory_rejects_oversized_allocation():
+    response = client.get("/simulate/memory?size_mb=1000000")
+    assert response.status_code == 422